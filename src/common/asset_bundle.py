@@ -0,0 +1,275 @@
+import io
+import json
+import logging
+import time
+import urllib.request
+import uuid
+import zipfile
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+ENGINE_API = 'api'
+ENGINE_ASSET_BUNDLE = 'asset_bundle'
+ENGINES = (ENGINE_API, ENGINE_ASSET_BUNDLE)
+
+JOB_SUCCESSFUL = 'SUCCESSFUL'
+JOB_FAILED_STATUSES = ('FAILED', 'FAILED_ROLLBACK_COMPLETED', 'FAILED_ROLLBACK_ERROR')
+
+DASHBOARD_FOLDER = 'dashboard'
+# start_asset_bundle_import_job accepts an inline body of at most 20 MB
+MAX_IMPORT_BYTES = 20 * 1024 * 1024
+
+
+def validate_engine(engine: str) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f'Unsupported engine: {engine}')
+    return engine
+
+
+def pack_dashboards(dashboards: Dict[str, Dict]) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for dashboard_id, definition in dashboards.items():
+            asset = {
+                'dashboardId': dashboard_id,
+                'name': definition.get('Name', dashboard_id),
+                'definition': definition
+            }
+            archive.writestr(f'{DASHBOARD_FOLDER}/{dashboard_id}.json', json.dumps(asset, ensure_ascii=False))
+    return buffer.getvalue()
+
+
+def unpack_dashboards(content: bytes) -> Dict[str, Dict]:
+    dashboards = {}
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        for name in archive.namelist():
+            folder, _, filename = name.rpartition('/')
+            if folder.rsplit('/', 1)[-1] != DASHBOARD_FOLDER or not filename.endswith('.json'):
+                continue
+                
+            asset = json.loads(archive.read(name))
+            dashboard_id = asset.get('dashboardId') or asset.get('DashboardId') or filename[:-len('.json')]
+            dashboards[dashboard_id] = {
+                'DashboardId': dashboard_id,
+                'Name': asset.get('name') or asset.get('Name'),
+                'Definition': asset.get('definition') or asset.get('Definition'),
+                'ThemeArn': asset.get('themeArn') or asset.get('ThemeArn')
+            }
+    return dashboards
+
+
+def download_url(url: str) -> bytes:
+    with urllib.request.urlopen(url) as response:
+        return response.read()
+
+
+class AssetBundleJobRunner:
+    def __init__(self, quicksight, account_id: str, batch_size: int = 50, max_concurrent_jobs: int = 5,
+                 poll_interval: float = 2.0, max_poll_interval: float = 30.0, timeout: float = 3600,
+                 logger: Optional[logging.Logger] = None, download: Callable[[str], bytes] = download_url,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.quicksight = quicksight
+        self.account_id = account_id
+        self.batch_size = max(1, int(batch_size))
+        self.max_concurrent_jobs = max(1, int(max_concurrent_jobs))
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(poll_interval, max_poll_interval)
+        self.timeout = timeout
+        self.logger = logger
+        self.download = download
+        self.clock = clock
+        self.sleep = sleep
+        
+    @classmethod
+    def from_config(cls, quicksight, account_id: str, config,
+                    logger: Optional[logging.Logger] = None) -> 'AssetBundleJobRunner':
+        return cls(
+            quicksight,
+            account_id,
+            batch_size=int(config.get('ASSET_BUNDLE_BATCH_SIZE', '50')),
+            max_concurrent_jobs=int(config.get('ASSET_BUNDLE_MAX_CONCURRENT_JOBS', '5')),
+            poll_interval=float(config.get('ASSET_BUNDLE_POLL_INTERVAL_SECONDS', '2')),
+            max_poll_interval=float(config.get('ASSET_BUNDLE_MAX_POLL_INTERVAL_SECONDS', '30')),
+            timeout=float(config.get('ASSET_BUNDLE_JOB_TIMEOUT_SECONDS', '3600')),
+            logger=logger
+        )
+        
+    def export_dashboards(self, dashboard_arns: Dict[str, str]) -> Tuple[Dict[str, Dict], Dict[str, Exception]]:
+        def start(job_id: str, batch: List[str]):
+            self.quicksight.start_asset_bundle_export_job(
+                AwsAccountId=self.account_id,
+                AssetBundleExportJobId=job_id,
+                ResourceArns=[dashboard_arns[dashboard_id] for dashboard_id in batch],
+                IncludeAllDependencies=False,
+                ExportFormat='QUICKSIGHT_JSON'
+            )
+            
+        def describe(job_id: str) -> Dict:
+            return self.quicksight.describe_asset_bundle_export_job(
+                AwsAccountId=self.account_id,
+                AssetBundleExportJobId=job_id
+            )
+            
+        def finish(job_id: str, batch: List[str], response: Dict, elapsed: float):
+            # The download URL is only valid for a few minutes, so fetch it as soon as the job is done
+            dashboards = unpack_dashboards(self.download(response['DownloadUrl']))
+            results = {dashboard_id: dashboards[dashboard_id] for dashboard_id in batch if dashboard_id in dashboards}
+            errors = {
+                dashboard_id: RuntimeError(f'Dashboard {dashboard_id} is missing from export job {job_id}')
+                for dashboard_id in batch if dashboard_id not in dashboards
+            }
+            return results, errors
+            
+        return self._run_jobs(self._batches(list(dashboard_arns)), start, describe, finish, 'export')
+        
+    def import_dashboards(self, dashboards: Dict[str, Dict], tags: Optional[Dict[str, List[Dict]]] = None,
+                          fail_fast: bool = False) -> Tuple[Dict[str, float], Dict[str, Exception]]:
+        def start(job_id: str, batch: List[str]):
+            params = {
+                'AwsAccountId': self.account_id,
+                'AssetBundleImportJobId': job_id,
+                'AssetBundleImportSource': {
+                    'Body': pack_dashboards({dashboard_id: dashboards[dashboard_id] for dashboard_id in batch})
+                },
+                # A failed batch is rolled back as a whole, so no dashboard is left half-imported
+                'FailureAction': 'ROLLBACK'
+            }
+            tagged = [dashboard_id for dashboard_id in batch if tags and tags.get(dashboard_id)]
+            if tagged:
+                params['OverrideTags'] = {
+                    'Dashboards': [
+                        {'DashboardIds': [dashboard_id], 'Tags': tags[dashboard_id]} for dashboard_id in tagged
+                    ]
+                }
+            self.quicksight.start_asset_bundle_import_job(**params)
+            
+        def describe(job_id: str) -> Dict:
+            return self.quicksight.describe_asset_bundle_import_job(
+                AwsAccountId=self.account_id,
+                AssetBundleImportJobId=job_id
+            )
+            
+        def finish(job_id: str, batch: List[str], response: Dict, elapsed: float):
+            return {dashboard_id: round(elapsed, 3) for dashboard_id in batch}, {}
+            
+        sizes = {dashboard_id: len(json.dumps(definition)) for dashboard_id, definition in dashboards.items()}
+        return self._run_jobs(
+            self._batches(list(dashboards), sizes, MAX_IMPORT_BYTES), start, describe, finish, 'import', fail_fast
+        )
+        
+    def _batches(self, items: List[str], sizes: Optional[Dict[str, int]] = None,
+                 max_bytes: Optional[int] = None) -> List[List[str]]:
+        batches = []
+        batch = []
+        batch_bytes = 0
+        for item in items:
+            size = sizes[item] if sizes else 0
+            if batch and (len(batch) >= self.batch_size or (max_bytes and batch_bytes + size > max_bytes)):
+                batches.append(batch)
+                batch = []
+                batch_bytes = 0
+            batch.append(item)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+        
+    def _run_jobs(self, batches: List[List[str]], start: Callable, describe: Callable, finish: Callable,
+                  label: str, fail_fast: bool = False) -> Tuple[Dict[str, object], Dict[str, Exception]]:
+        results = {}
+        errors = {}
+        pending = list(batches)
+        in_flight = {}
+        interval = self.poll_interval
+        deadline = self.clock() + self.timeout
+        
+        while pending or in_flight:
+            while pending and len(in_flight) < self.max_concurrent_jobs:
+                batch = pending.pop(0)
+                job_id = f'{label}-{uuid.uuid4().hex}'
+                try:
+                    start(job_id, batch)
+                except Exception as e:
+                    self._fail(batch, e, errors)
+                    if fail_fast:
+                        pending = []
+                    continue
+                in_flight[job_id] = (batch, self.clock())
+                # Fresh jobs are polled at the base rate again
+                interval = self.poll_interval
+                if self.logger:
+                    self.logger.info(f'Started asset bundle {label} job {job_id} for {len(batch)} dashboards')
+                    
+            if not in_flight:
+                break
+                
+            if self.clock() >= deadline:
+                for job_id, (batch, _) in in_flight.items():
+                    self._fail(batch, TimeoutError(f'Asset bundle {label} job {job_id} did not finish in time'), errors)
+                # Batches still queued never got a job, they are reported rather than silently dropped
+                for batch in pending:
+                    self._fail(batch, TimeoutError(f'Asset bundle {label} batch was not started in time'), errors)
+                break
+                
+            self.sleep(interval)
+            finished = False
+            
+            # One describe call per job in flight, however many dashboards each job carries
+            for job_id in list(in_flight):
+                try:
+                    response = describe(job_id)
+                except Exception as e:
+                    # A job that cannot be described fails its own batch, the other jobs keep running
+                    batch, _ = in_flight.pop(job_id)
+                    finished = True
+                    self._fail(batch, e, errors)
+                    if fail_fast:
+                        pending = []
+                    continue
+                status = response.get('JobStatus')
+                if status != JOB_SUCCESSFUL and status not in JOB_FAILED_STATUSES:
+                    continue
+                    
+                batch, started = in_flight.pop(job_id)
+                finished = True
+                if status == JOB_SUCCESSFUL:
+                    try:
+                        batch_results, batch_errors = finish(job_id, batch, response, self.clock() - started)
+                    except Exception as e:
+                        batch_results, batch_errors = {}, {dashboard_id: e for dashboard_id in batch}
+                else:
+                    batch_results, batch_errors = {}, self._job_errors(job_id, batch, status, response)
+                    
+                results.update(batch_results)
+                errors.update(batch_errors)
+                if batch_errors and fail_fast:
+                    pending = []
+                if self.logger:
+                    self.logger.info(
+                        f'Asset bundle {label} job {job_id} {status.lower()}: '
+                        f'{len(results) + len(errors)}/{sum(len(batch) for batch in batches)} dashboards done'
+                    )
+                    
+            if not finished:
+                interval = min(interval * 2, self.max_poll_interval)
+                
+        return results, errors
+        
+    def _job_errors(self, job_id: str, batch: List[str], status: str, response: Dict) -> Dict[str, Exception]:
+        messages = {}
+        for error in response.get('Errors', []):
+            dashboard_id = (error.get('Arn') or '').split('/')[-1]
+            messages.setdefault(dashboard_id, []).append(f"{error.get('Type')}: {error.get('Message')}")
+            
+        job_message = '; '.join(message for values in messages.values() for message in values)
+        errors = {}
+        for dashboard_id in batch:
+            detail = '; '.join(messages.get(dashboard_id, [])) or job_message or 'no error details'
+            errors[dashboard_id] = RuntimeError(f'Asset bundle job {job_id} ended with {status}: {detail}')
+        return errors
+        
+    def _fail(self, batch: List[str], error: Exception, errors: Dict[str, Exception]):
+        if self.logger:
+            self.logger.error(f'Asset bundle job for {len(batch)} dashboards failed: {str(error)}')
+        for dashboard_id in batch:
+            errors[dashboard_id] = error
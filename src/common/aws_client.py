@@ -1,33 +1,160 @@
+import threading
 import boto3
+from botocore.config import Config as BotoConfig
+from botocore.credentials import RefreshableCredentials
+from botocore.session import get_session as get_botocore_session
 from typing import Dict, Optional
+from src.common.rate_limiter import AdaptiveRateLimiter
+
+
+DEFAULT_ROLE_NAME = 'QuickSightDeployRole'
+
+RATE_LIMITED_SERVICES = ('quicksight',)
+
+DEFAULT_CLIENT_SETTINGS = {
+    'max_pool_connections': 10,
+    'retry_mode': 'standard',
+    'max_attempts': None,
+    'rate_limit': 10.0,
+    'max_rate_limit': 100.0
+}
 
 
 class AWSClientManager:
-    def __init__(self, region: str = 'ap-northeast-1'):
+    _session = None
+    _role_sessions = {}
+    _clients = {}
+    _rate_limiters = {}
+    _lock = threading.RLock()
+    _settings = dict(DEFAULT_CLIENT_SETTINGS)
+    
+    def __init__(self, region: str = 'ap-northeast-1', max_pool_connections: Optional[int] = None):
         self.region = region
-        
-    def get_quicksight_client(self, account_id: Optional[str] = None):
+        if max_pool_connections and max_pool_connections > self._settings['max_pool_connections']:
+            self.configure(max_pool_connections=max_pool_connections)
+            
+    @classmethod
+    def configure(cls, max_pool_connections: Optional[int] = None, retry_mode: Optional[str] = None,
+                  max_attempts: Optional[int] = None, rate_limit: Optional[float] = None,
+                  max_rate_limit: Optional[float] = None):
+        with cls._lock:
+            settings = dict(cls._settings)
+            if max_pool_connections:
+                settings['max_pool_connections'] = int(max_pool_connections)
+            if retry_mode:
+                settings['retry_mode'] = retry_mode
+            if max_attempts:
+                settings['max_attempts'] = int(max_attempts)
+            if rate_limit is not None:
+                settings['rate_limit'] = float(rate_limit)
+            if max_rate_limit is not None:
+                settings['max_rate_limit'] = float(max_rate_limit)
+                
+            if settings != cls._settings:
+                # Clients keep the config they were built with, so rebuild them on the next request
+                cls._settings = settings
+                cls._clients = {}
+                cls._rate_limiters = {}
+                
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._session = None
+            cls._role_sessions = {}
+            cls._clients = {}
+            cls._rate_limiters = {}
+            cls._settings = dict(DEFAULT_CLIENT_SETTINGS)
+            
+    def get_quicksight_client(self, account_id: Optional[str] = None, role_name: Optional[str] = None):
         if account_id:
-            credentials = self.assume_role(account_id, 'QuickSightDeployRole')
-            return boto3.client(
-                'quicksight',
-                region_name=self.region,
-                aws_access_key_id=credentials['AccessKeyId'],
-                aws_secret_access_key=credentials['SecretAccessKey'],
-                aws_session_token=credentials['SessionToken']
-            )
-        return boto3.client('quicksight', region_name=self.region)
+            return self._get_client('quicksight', (account_id, role_name or DEFAULT_ROLE_NAME))
+        return self._get_client('quicksight')
         
     def get_s3_client(self):
-        return boto3.client('s3', region_name=self.region)
+        return self._get_client('s3')
         
     def get_dynamodb_client(self):
-        return boto3.client('dynamodb', region_name=self.region)
+        return self._get_client('dynamodb')
         
     def assume_role(self, account_id: str, role_name: str) -> Dict:
-        sts_client = boto3.client('sts', region_name=self.region)
+        sts_client = self._get_client('sts')
         response = sts_client.assume_role(
             RoleArn=f'arn:aws:iam::{account_id}:role/{role_name}',
             RoleSessionName='QuickSightManagementTools'
         )
-        return response['Credentials']
\ No newline at end of file
+        return response['Credentials']
+        
+    def get_rate_limiter(self, service: str = 'quicksight',
+                         account_id: Optional[str] = None) -> Optional[AdaptiveRateLimiter]:
+        if service not in RATE_LIMITED_SERVICES or not self._settings['rate_limit']:
+            return None
+            
+        # Quotas are per account and region, so every client for the same target shares one set of buckets
+        key = (service, self.region, account_id)
+        with self._lock:
+            rate_limiter = self._rate_limiters.get(key)
+            if rate_limiter is None:
+                rate_limiter = AdaptiveRateLimiter(
+                    initial_rate=self._settings['rate_limit'],
+                    max_rate=self._settings['max_rate_limit']
+                )
+                self._rate_limiters[key] = rate_limiter
+            return rate_limiter
+            
+    def _get_client(self, service: str, role: Optional[tuple] = None):
+        key = (service, self.region, role)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                session = self._get_role_session(*role) if role else self._get_session()
+                # boto3 sessions are not thread-safe, so clients are only ever created under the lock
+                client = session.client(service, region_name=self.region, config=self._build_config())
+                rate_limiter = self.get_rate_limiter(service, role[0] if role else None)
+                if rate_limiter:
+                    rate_limiter.attach(client)
+                self._clients[key] = client
+            return client
+            
+    def _get_session(self) -> boto3.session.Session:
+        if AWSClientManager._session is None:
+            AWSClientManager._session = boto3.session.Session()
+        return AWSClientManager._session
+        
+    def _get_role_session(self, account_id: str, role_name: str) -> boto3.session.Session:
+        key = (account_id, role_name)
+        session = self._role_sessions.get(key)
+        if session is None:
+            def refresh() -> Dict:
+                return self._fetch_role_credentials(account_id, role_name)
+                
+            # botocore re-assumes the role inside its advisory window before the credentials expire,
+            # and every client built from this session shares the same refreshed credentials
+            credentials = RefreshableCredentials.create_from_metadata(
+                metadata=refresh(),
+                refresh_using=refresh,
+                method='sts-assume-role'
+            )
+            botocore_session = get_botocore_session()
+            botocore_session._credentials = credentials
+            session = boto3.session.Session(botocore_session=botocore_session)
+            self._role_sessions[key] = session
+        return session
+        
+    def _fetch_role_credentials(self, account_id: str, role_name: str) -> Dict:
+        credentials = self.assume_role(account_id, role_name)
+        expiration = credentials['Expiration']
+        return {
+            'access_key': credentials['AccessKeyId'],
+            'secret_key': credentials['SecretAccessKey'],
+            'token': credentials['SessionToken'],
+            'expiry_time': expiration.isoformat() if hasattr(expiration, 'isoformat') else expiration
+        }
+        
+    def _build_config(self) -> BotoConfig:
+        retries = {'mode': self._settings['retry_mode']}
+        if self._settings['max_attempts']:
+            retries['max_attempts'] = self._settings['max_attempts']
+        return BotoConfig(
+            max_pool_connections=self._settings['max_pool_connections'],
+            retries=retries
+        )
@@ -0,0 +1,65 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+_SKIPPED = object()
+
+
+class WorkerPool:
+    def __init__(self, max_workers: int = 1, logger: Optional[logging.Logger] = None):
+        self.max_workers = max(1, int(max_workers))
+        self.logger = logger
+        
+    def run(self, func: Callable[[str], Any], items: List[str], label: str = 'items',
+            fail_fast: bool = False) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+        results = {}
+        errors = {}
+        total = len(items)
+        if not total:
+            return results, errors
+            
+        progress_interval = max(1, total // 10)
+        stop_event = threading.Event()
+        
+        def call(item):
+            if stop_event.is_set():
+                return _SKIPPED
+            try:
+                return func(item)
+            except Exception:
+                # Set from the worker itself so no queued task can start after the failure
+                if fail_fast:
+                    stop_event.set()
+                raise
+                
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, total)) as executor:
+            futures = {executor.submit(call, item): item for item in items}
+            
+            for future in as_completed(futures):
+                item = futures[future]
+                if future.cancelled():
+                    continue
+                    
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors[item] = e
+                    if self.logger:
+                        self.logger.error(f'Failed to process {item}: {str(e)}')
+                    if fail_fast:
+                        for pending in futures:
+                            pending.cancel()
+                else:
+                    if result is _SKIPPED:
+                        continue
+                    results[item] = result
+                    
+                done = len(results) + len(errors)
+                if self.logger and (done % progress_interval == 0 or done == total):
+                    self.logger.info(
+                        f'Progress: {done}/{total} {label} processed ({len(errors)} failed)'
+                    )
+                    
+        return results, errors
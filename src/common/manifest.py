@@ -0,0 +1,110 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def content_hash(value: Any) -> str:
+    return hashlib.sha256(canonical_json(value).encode('utf-8')).hexdigest()
+
+
+def bytes_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class SnapshotManifest:
+    def __init__(self, timestamp: str, dashboards: Optional[Dict[str, Dict]] = None,
+                 files: Optional[Dict[str, Dict]] = None, bundle: Optional[Dict] = None,
+                 dependencies: Optional[Dict] = None, dashboard_filter: Optional[str] = None):
+        self.timestamp = timestamp
+        self.dashboards = dashboards or {}
+        self.files = files or {}
+        self.bundle = bundle
+        self.dependencies = dependencies
+        # Set for exports narrowed by EXPORT_FILTER_*, which hold only part of the release
+        self.dashboard_filter = dashboard_filter
+        
+    def add_dashboard(self, entry: Dict):
+        self.dashboards[entry['DashboardId']] = entry
+        
+    def get_dashboard(self, dashboard_id: str) -> Optional[Dict]:
+        return self.dashboards.get(dashboard_id)
+        
+    def add_file(self, filename: str, content: bytes):
+        self.files[filename] = {
+            'Sha256': bytes_hash(content),
+            'Size': len(content)
+        }
+        
+    def verify_file(self, filename: str, content: bytes) -> bool:
+        entry = self.files.get(filename)
+        if not entry:
+            return True
+        return entry['Sha256'] == bytes_hash(content)
+        
+    def verify_dashboard(self, dashboard_id: str, definition: Dict) -> bool:
+        entry = self.dashboards.get(dashboard_id)
+        if not entry or not entry.get('Sha256'):
+            return True
+        return entry['Sha256'] == content_hash(definition)
+        
+    @staticmethod
+    def build_entry(summary: Dict, exported_at: str, sha256: Optional[str] = None,
+                    size: Optional[int] = None) -> Dict:
+        entry = {
+            'DashboardId': summary['DashboardId'],
+            'Name': summary.get('Name', ''),
+            'Sha256': sha256,
+            'Size': size,
+            'LastUpdatedTime': _format_time(summary.get('LastUpdatedTime')),
+            'VersionNumber': summary.get('PublishedVersionNumber'),
+            'ExportedAt': exported_at
+        }
+        if summary.get('FolderPath'):
+            entry['FolderPath'] = summary['FolderPath']
+        return entry
+        
+    @staticmethod
+    def is_unchanged(entry: Dict, summary: Dict) -> bool:
+        last_updated = _format_time(summary.get('LastUpdatedTime'))
+        version = summary.get('PublishedVersionNumber')
+        if last_updated is None or version is None:
+            return False
+        return entry.get('LastUpdatedTime') == last_updated and entry.get('VersionNumber') == version
+        
+    def to_json(self) -> str:
+        data = {
+            'Timestamp': self.timestamp,
+            'Dashboards': [self.dashboards[key] for key in sorted(self.dashboards)],
+            'Files': self.files
+        }
+        if self.bundle:
+            data['Bundle'] = self.bundle
+        if self.dependencies:
+            data['Dependencies'] = self.dependencies
+        if self.dashboard_filter:
+            data['Filter'] = self.dashboard_filter
+        return json.dumps(data, indent=2)
+        
+    @classmethod
+    def from_json(cls, content: str) -> 'SnapshotManifest':
+        data = json.loads(content)
+        dashboards = {entry['DashboardId']: entry for entry in data.get('Dashboards', [])}
+        return cls(
+            data['Timestamp'], dashboards, data.get('Files', {}), data.get('Bundle'), data.get('Dependencies'),
+            data.get('Filter')
+        )
+
+
+def _format_time(value) -> Optional[str]:
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
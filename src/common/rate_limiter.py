@@ -0,0 +1,115 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+THROTTLING_ERROR_CODES = ('ThrottlingException', 'Throttling', 'TooManyRequestsException')
+
+
+class TokenBucket:
+    def __init__(self, rate: float, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+        
+    def acquire(self):
+        with self._lock:
+            self._refill()
+            # Reserve the token up front so concurrent callers queue behind each other instead of racing
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+            
+        if wait > 0:
+            self.sleep(wait)
+            
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill()
+            self.rate = rate
+            self.capacity = max(1.0, rate)
+            self.tokens = min(self.tokens, self.capacity)
+            
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+
+class AdaptiveRateLimiter:
+    def __init__(self, initial_rate: float = 10.0, max_rate: float = 100.0, min_rate: float = 0.5,
+                 decrease_factor: float = 0.5, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.initial_rate = initial_rate
+        self.max_rate = max(max_rate, initial_rate)
+        self.min_rate = min(min_rate, initial_rate)
+        self.decrease_factor = decrease_factor
+        self.clock = clock
+        self.sleep = sleep
+        self._buckets = {}
+        self._last_decrease = {}
+        self._lock = threading.Lock()
+        
+    def attach(self, client):
+        service = client.meta.service_model.service_id.hyphenize()
+        client.meta.events.register(f'before-send.{service}', self._before_send)
+        client.meta.events.register(f'needs-retry.{service}', self._after_attempt)
+        
+    def acquire(self, operation: str):
+        self._get_bucket(operation).acquire()
+        
+    def get_rate(self, operation: str) -> float:
+        return self._get_bucket(operation).rate
+        
+    def get_rates(self) -> Dict[str, float]:
+        with self._lock:
+            return {operation: bucket.rate for operation, bucket in self._buckets.items()}
+            
+    def on_success(self, operation: str):
+        bucket = self._get_bucket(operation)
+        if bucket.rate < self.max_rate:
+            # Additive increase of roughly one request per second for every second of clean traffic
+            bucket.set_rate(min(self.max_rate, bucket.rate + 1.0 / bucket.rate))
+            
+    def on_throttle(self, operation: str):
+        bucket = self._get_bucket(operation)
+        now = self.clock()
+        with self._lock:
+            # Concurrent workers see the same burst of throttles; back off once per burst, not once per worker
+            if now - self._last_decrease.get(operation, float('-inf')) < 1.0:
+                return
+            self._last_decrease[operation] = now
+        bucket.set_rate(max(self.min_rate, bucket.rate * self.decrease_factor))
+        
+    def _get_bucket(self, operation: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(operation)
+            if bucket is None:
+                bucket = TokenBucket(self.initial_rate, self.clock, self.sleep)
+                self._buckets[operation] = bucket
+            return bucket
+            
+    def _before_send(self, event_name: str, **kwargs):
+        self.acquire(self._operation_name(event_name))
+        
+    def _after_attempt(self, event_name: str, response: Optional[tuple] = None, **kwargs):
+        operation = self._operation_name(event_name)
+        if self._is_throttled(response):
+            self.on_throttle(operation)
+        elif response is not None:
+            self.on_success(operation)
+            
+    def _operation_name(self, event_name: str) -> str:
+        return event_name.rsplit('.', 1)[-1]
+        
+    def _is_throttled(self, response: Optional[tuple]) -> bool:
+        if not response:
+            return False
+        http_response, parsed = response
+        if getattr(http_response, 'status_code', None) == 429:
+            return True
+        return parsed.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
@@ -0,0 +1,38 @@
+import hashlib
+
+
+SHARD_FOLDER = 'shards'
+
+
+class Shard:
+    def __init__(self, index: int, count: int):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f'Invalid shard {index}/{count}')
+        self.index = index
+        self.count = count
+        
+    @classmethod
+    def parse(cls, value: str) -> 'Shard':
+        try:
+            index, count = (int(part) for part in value.split('/'))
+        except ValueError:
+            raise ValueError(f'Invalid shard "{value}", expected INDEX/COUNT such as 1/4') from None
+        return cls(index, count)
+        
+    def contains(self, item_id: str) -> bool:
+        return shard_index(item_id, self.count) == self.index
+        
+    def filename(self, name: str) -> str:
+        stem, dot, extension = name.rpartition('.')
+        if not dot:
+            return f'{SHARD_FOLDER}/{name}-{self.index}-of-{self.count}'
+        return f'{SHARD_FOLDER}/{stem}-{self.index}-of-{self.count}.{extension}'
+        
+    def __str__(self) -> str:
+        return f'{self.index}/{self.count}'
+
+
+def shard_index(item_id: str, count: int) -> int:
+    # hash() is salted per process, and every worker has to agree on the split
+    digest = hashlib.sha256(item_id.encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
@@ -0,0 +1,163 @@
+import io
+import tarfile
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+
+BUNDLE_FILENAME = 'bundle.tar'
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 8 * 1024 * 1024
+
+
+class MultipartUploadWriter:
+    def __init__(self, s3_client, bucket: str, key: str, part_size: int = DEFAULT_PART_SIZE,
+                 content_type: str = 'application/x-tar'):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = max(MIN_PART_SIZE, int(part_size))
+        self.content_type = content_type
+        self.size = 0
+        self._buffer = bytearray()
+        self._parts = []
+        self._upload_id = None
+        
+    def write(self, data: bytes) -> int:
+        self._buffer.extend(data)
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[:self.part_size]))
+            del self._buffer[:self.part_size]
+        return len(data)
+        
+    def close(self):
+        if self._upload_id is None:
+            # Everything fit in one part, so a plain PUT is one request instead of three
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Body=bytes(self._buffer),
+                ContentType=self.content_type
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}
+            )
+        self._buffer = bytearray()
+        
+    def abort(self):
+        if self._upload_id is not None:
+            self.s3_client.abort_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id
+            )
+            self._upload_id = None
+        self._buffer = bytearray()
+        
+    def _upload_part(self, data: bytes):
+        if self._upload_id is None:
+            response = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                ContentType=self.content_type
+            )
+            self._upload_id = response['UploadId']
+            
+        part_number = len(self._parts) + 1
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=data
+        )
+        self._parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+
+
+class BundleWriter:
+    def __init__(self, s3_client, bucket: str, key: str, part_size: int = DEFAULT_PART_SIZE):
+        self.key = key
+        self._upload = MultipartUploadWriter(s3_client, bucket, key, part_size)
+        self._tar = tarfile.open(fileobj=self._upload, mode='w|')
+        self._members = {}
+        self._lock = threading.Lock()
+        
+    def add(self, name: str, content: bytes, content_encoding: Optional[str] = None) -> Dict:
+        info = tarfile.TarInfo(name)
+        info.size = len(content)
+        info.mtime = int(time.time())
+        
+        with self._lock:
+            self._tar.addfile(info, io.BytesIO(content))
+            # The data sits right before the padding that closes the member, whatever the header length was
+            entry = {
+                'Offset': self._tar.offset - _padded_size(len(content)),
+                'Size': len(content)
+            }
+            if content_encoding:
+                entry['ContentEncoding'] = content_encoding
+            self._members[name] = entry
+        return entry
+        
+    def close(self) -> Dict[str, Dict]:
+        with self._lock:
+            self._tar.close()
+            self._upload.close()
+            return dict(self._members)
+            
+    def abort(self):
+        with self._lock:
+            self._upload.abort()
+
+
+class BundleReader:
+    def __init__(self, s3_client, bucket: str, key: str, members: Optional[Dict[str, Dict]] = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.members = members or {}
+        
+    def read(self, name: str) -> Tuple[bytes, Optional[str]]:
+        entry = self.members.get(name)
+        if entry is None:
+            return self._scan(name), None
+            
+        if not entry['Size']:
+            return b'', entry.get('ContentEncoding')
+            
+        start = entry['Offset']
+        end = start + entry['Size'] - 1
+        response = self.s3_client.get_object(
+            Bucket=self.bucket,
+            Key=self.key,
+            Range=f'bytes={start}-{end}'
+        )
+        return response['Body'].read(), entry.get('ContentEncoding')
+        
+    def iter_members(self) -> Iterator[Tuple[str, bytes]]:
+        response = self.s3_client.get_object(
+            Bucket=self.bucket,
+            Key=self.key
+        )
+        with tarfile.open(fileobj=response['Body'], mode='r|') as tar:
+            for info in tar:
+                if info.isfile():
+                    yield info.name, tar.extractfile(info).read()
+                    
+    def _scan(self, name: str) -> bytes:
+        for member_name, content in self.iter_members():
+            if member_name == name:
+                return content
+        raise KeyError(f'{name} not found in bundle {self.key}')
+
+
+def _padded_size(size: int) -> int:
+    blocks, remainder = divmod(size, tarfile.BLOCKSIZE)
+    return (blocks + (1 if remainder else 0)) * tarfile.BLOCKSIZE
@@ -0,0 +1,68 @@
+import gzip
+import io
+import json
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+from src.common.manifest import canonical_json
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+SNAPSHOT_FORMAT_PRETTY = 'pretty'
+SNAPSHOT_FORMAT_GZIP = 'gzip'
+SNAPSHOT_FORMAT_ZSTD = 'zstd'
+SNAPSHOT_FORMATS = (SNAPSHOT_FORMAT_PRETTY, SNAPSHOT_FORMAT_GZIP, SNAPSHOT_FORMAT_ZSTD)
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def validate_format(snapshot_format: str) -> str:
+    if snapshot_format not in SNAPSHOT_FORMATS:
+        raise ValueError(f'Unsupported snapshot format: {snapshot_format}')
+    if snapshot_format == SNAPSHOT_FORMAT_ZSTD and zstandard is None:
+        raise ValueError('Snapshot format "zstd" requires the zstandard package')
+    return snapshot_format
+
+
+def encode_definition(definition: Dict, snapshot_format: str = SNAPSHOT_FORMAT_PRETTY) -> Tuple[bytes, Optional[str]]:
+    validate_format(snapshot_format)
+    if snapshot_format == SNAPSHOT_FORMAT_PRETTY:
+        return json.dumps(definition, indent=2).encode('utf-8'), None
+
+    content = canonical_json(definition).encode('utf-8')
+    if snapshot_format == SNAPSHOT_FORMAT_GZIP:
+        # A fixed mtime keeps the compressed bytes identical for identical definitions
+        return gzip.compress(content, mtime=0), 'gzip'
+    return zstandard.ZstdCompressor().compress(content), 'zstd'
+
+
+def load_definition(body: Union[BinaryIO, bytes], content_encoding: Optional[str] = None) -> Dict:
+    if isinstance(body, bytes) and content_encoding in ('gzip', 'zstd'):
+        # Bundle members arrive as bytes, the stream readers below need a file object
+        body = io.BytesIO(body)
+        
+    if content_encoding == 'gzip':
+        with gzip.GzipFile(fileobj=body) as stream:
+            return json.load(stream)
+
+    if content_encoding == 'zstd':
+        if zstandard is None:
+            raise ValueError('Cannot decode a zstd snapshot without the zstandard package')
+        with zstandard.ZstdDecompressor().stream_reader(body) as stream:
+            return json.load(stream)
+
+    if content_encoding not in (None, '', 'identity'):
+        raise ValueError(f'Unsupported content encoding: {content_encoding}')
+
+    content = body if isinstance(body, bytes) else body.read()
+    # Objects copied or re-uploaded without their metadata are still recognised by their magic bytes
+    if content.startswith(GZIP_MAGIC):
+        content = gzip.decompress(content)
+    elif content.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError('Cannot decode a zstd snapshot without the zstandard package')
+        content = zstandard.ZstdDecompressor().decompress(content)
+    return json.loads(content.decode('utf-8'))
@@ -0,0 +1,220 @@
+import json
+from typing import Dict, List, Optional, Tuple
+from botocore.exceptions import ClientError
+
+from src.common.manifest import MANIFEST_FILENAME, SnapshotManifest
+from src.common.snapshot_bundle import BUNDLE_FILENAME, DEFAULT_PART_SIZE, BundleReader, BundleWriter
+
+
+LATEST_POINTER = 'LATEST'
+DEPLOYED_POINTER_PREFIX = 'DEPLOYED_'
+DEPLOY_STATE_PREFIX = 'DEPLOY_STATE_'
+DEPLOY_JOURNAL_NAME = 'DEPLOY_JOURNAL'
+CHECKPOINT_FILENAME = 'checkpoint.json'
+COMPLETE_MARKER = '_COMPLETE'
+
+
+class SnapshotStore:
+    def __init__(self, s3_client, bucket: str, prefix: str):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        
+    def get_key(self, timestamp: str, filename: str) -> str:
+        return f'{self.prefix}{timestamp}/{filename}'
+        
+    def list_snapshots(self) -> List[str]:
+        snapshots = []
+        next_token = None
+        
+        while True:
+            params = {
+                'Bucket': self.bucket,
+                'Prefix': self.prefix,
+                'Delimiter': '/'
+            }
+            
+            if next_token:
+                params['ContinuationToken'] = next_token
+                
+            response = self.s3_client.list_objects_v2(**params)
+            for common_prefix in response.get('CommonPrefixes', []):
+                name = common_prefix['Prefix'][len(self.prefix):].rstrip('/')
+                if name:
+                    snapshots.append(name)
+                    
+            next_token = response.get('NextContinuationToken')
+            if not next_token:
+                break
+                
+        return sorted(snapshots)
+        
+    def get_latest_snapshot(self) -> Optional[str]:
+        latest = self._read_pointer(LATEST_POINTER)
+        if latest:
+            return latest
+            
+        for timestamp in reversed(self.list_snapshots()):
+            if self.is_complete(timestamp) and not self._is_filtered(timestamp):
+                return timestamp
+        return None
+        
+    def update_latest_pointer(self, timestamp: str) -> bool:
+        current = self._read_pointer(LATEST_POINTER)
+        # A resumed or late merged export may finish after a newer one, LATEST only ever moves forward
+        if current and current > timestamp:
+            return False
+        self._write_pointer(LATEST_POINTER, timestamp)
+        return True
+        
+    def get_deployed_snapshot(self, environment: str) -> Optional[str]:
+        return self._read_pointer(f'{DEPLOYED_POINTER_PREFIX}{environment}')
+        
+    def update_deployed_pointer(self, environment: str, timestamp: str):
+        self._write_pointer(f'{DEPLOYED_POINTER_PREFIX}{environment}', timestamp)
+        
+    def load_deploy_state(self, environment: str) -> Optional[Dict]:
+        content = self._get_object(f'{self.prefix}{DEPLOY_STATE_PREFIX}{environment}.json')
+        if content is None:
+            return None
+        return json.loads(content.decode('utf-8'))
+        
+    def save_deploy_state(self, environment: str, state: Dict):
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=f'{self.prefix}{DEPLOY_STATE_PREFIX}{environment}.json',
+            Body=json.dumps(state, indent=2)
+        )
+        
+    def load_run_journal(self, environment: Optional[str]) -> Optional[Dict]:
+        content = self._get_object(self._journal_key(environment))
+        if content is None:
+            return None
+        return json.loads(content.decode('utf-8'))
+        
+    def save_run_journal(self, environment: Optional[str], journal: Dict):
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self._journal_key(environment),
+            Body=json.dumps(journal, indent=2)
+        )
+        
+    def _journal_key(self, environment: Optional[str]) -> str:
+        suffix = f'_{environment}' if environment else ''
+        return f'{self.prefix}{DEPLOY_JOURNAL_NAME}{suffix}.json'
+        
+    def _read_pointer(self, name: str) -> Optional[str]:
+        content = self._get_object(f'{self.prefix}{name}')
+        if content is None:
+            return None
+        return content.decode('utf-8').strip() or None
+        
+    def _write_pointer(self, name: str, timestamp: str):
+        # A single PUT replaces the pointer atomically, readers never see a partial value
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=f'{self.prefix}{name}',
+            Body=timestamp
+        )
+        
+    def read_file(self, timestamp: str, filename: str) -> Optional[bytes]:
+        return self._get_object(self.get_key(timestamp, filename))
+        
+    def write_file(self, timestamp: str, filename: str, content):
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self.get_key(timestamp, filename),
+            Body=content
+        )
+        
+    def delete_file(self, timestamp: str, filename: str):
+        self.s3_client.delete_object(
+            Bucket=self.bucket,
+            Key=self.get_key(timestamp, filename)
+        )
+        
+    def mark_complete(self, timestamp: str):
+        self.write_file(timestamp, COMPLETE_MARKER, timestamp)
+        
+    def is_complete(self, timestamp: str) -> bool:
+        if self.read_file(timestamp, COMPLETE_MARKER) is not None:
+            return True
+        # Snapshots written before checkpointing have neither object and are complete by definition
+        return self.read_file(timestamp, CHECKPOINT_FILENAME) is None
+        
+    def _is_filtered(self, timestamp: str) -> bool:
+        manifest = self.load_manifest(timestamp)
+        return bool(manifest and manifest.dashboard_filter)
+        
+    def load_checkpoint(self, timestamp: str, filename: str = CHECKPOINT_FILENAME) -> Optional[SnapshotManifest]:
+        content = self.read_file(timestamp, filename)
+        if content is None:
+            return None
+        return SnapshotManifest.from_json(content.decode('utf-8'))
+        
+    def _get_object(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket,
+                Key=key
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            raise
+        return response['Body'].read()
+        
+    def read_snapshot_file(self, manifest: SnapshotManifest, filename: str) -> Tuple[bytes, Optional[str]]:
+        bundle = self.open_bundle(manifest)
+        if bundle:
+            return bundle.read(filename)
+            
+        response = self.s3_client.get_object(
+            Bucket=self.bucket,
+            Key=self.get_key(manifest.timestamp, filename)
+        )
+        return response['Body'].read(), response.get('ContentEncoding')
+        
+    def create_bundle(self, timestamp: str, part_size: int = DEFAULT_PART_SIZE) -> BundleWriter:
+        return BundleWriter(self.s3_client, self.bucket, self.get_key(timestamp, BUNDLE_FILENAME), part_size)
+        
+    def open_bundle(self, manifest: Optional[SnapshotManifest]) -> Optional[BundleReader]:
+        if not manifest or not manifest.bundle:
+            return None
+        return BundleReader(
+            self.s3_client,
+            self.bucket,
+            self.get_key(manifest.timestamp, manifest.bundle.get('Filename', BUNDLE_FILENAME)),
+            manifest.bundle.get('Members')
+        )
+        
+    def copy_file(self, source_timestamp: str, target_timestamp: str, filename: str):
+        self.s3_client.copy_object(
+            Bucket=self.bucket,
+            Key=self.get_key(target_timestamp, filename),
+            CopySource={
+                'Bucket': self.bucket,
+                'Key': self.get_key(source_timestamp, filename)
+            }
+        )
+        
+    def load_manifest(self, timestamp: str) -> Optional[SnapshotManifest]:
+        content = self.read_file(timestamp, MANIFEST_FILENAME)
+        if content is None:
+            return None
+        return SnapshotManifest.from_json(content.decode('utf-8'))
+        
+    def find_previous_manifest(self, before: str) -> Optional[SnapshotManifest]:
+        latest = self._read_pointer(LATEST_POINTER)
+        if latest and latest < before:
+            manifest = self.load_manifest(latest)
+            if manifest:
+                return manifest
+                
+        for timestamp in reversed(self.list_snapshots()):
+            if timestamp >= before:
+                continue
+            manifest = self.load_manifest(timestamp)
+            if manifest and not manifest.dashboard_filter and self.is_complete(timestamp):
+                return manifest
+        return None
@@ -1,55 +1,146 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple
+from botocore.exceptions import ClientError
 from src.common.aws_client import AWSClientManager
 from src.common.logger import setup_logger
+from src.common.manifest import content_hash
+from src.dashboard_deploy.dashboard_index import DashboardIndex
+from src.dashboard_deploy.status_tracker import version_number
+
+
+DEPLOY_CREATED = 'created'
+DEPLOY_UPDATED = 'updated'
+DEPLOY_UNCHANGED = 'unchanged'
+DEPLOY_DELETED = 'deleted'
+DEPLOY_ROLLED_BACK = 'rolled_back'
+DEPLOY_FAILED = 'failed'
+
+DEFINITION_HASH_TAG = 'DefinitionSha256'
+CHANGE_DETECTION_MODES = ('off', 'tag', 'definition')
 
 
 class DashboardDeployer:
-    def __init__(self, account_id: str, namespace: str, region: str):
+    def __init__(self, account_id: str, namespace: str, region: str, change_detection: str = 'off',
+                 role_name: Optional[str] = None):
         self.logger = setup_logger('DashboardDeployer')
         self.account_id = account_id
         self.namespace = namespace
         self.region = region
+        if change_detection not in CHANGE_DETECTION_MODES:
+            raise ValueError(f'Unsupported change detection mode: {change_detection}')
+        self.change_detection = change_detection
         self.aws_manager = AWSClientManager(region)
-        self.quicksight = self.aws_manager.get_quicksight_client()
+        if role_name:
+            self.quicksight = self.aws_manager.get_quicksight_client(account_id=account_id, role_name=role_name)
+        else:
+            self.quicksight = self.aws_manager.get_quicksight_client()
+        self.dashboard_index = None
+        self.status_tracker = None
+        # Version created by the last write of each dashboard, update_dashboard leaves it unpublished
+        self.submitted_versions = {}
+        # When set, an update's hash is only tagged through tag_submitted_hash once the new version is live
+        self.defer_hash_tags = False
+        self.submitted_hashes = {}
+        
+    def load_dashboard_index(self) -> DashboardIndex:
+        self.dashboard_index = DashboardIndex(self.quicksight, self.account_id).load()
+        self.logger.info(f'Indexed {len(self.dashboard_index)} dashboards in account {self.account_id}')
+        return self.dashboard_index
         
     def deploy_dashboard(self, definition: Dict, dashboard_id: str) -> bool:
+        return self.deploy(definition, dashboard_id) != DEPLOY_FAILED
+        
+    def deploy(self, definition: Dict, dashboard_id: str, definition_hash: Optional[str] = None) -> str:
         self.logger.info(f'Deploying dashboard: {dashboard_id}')
         
+        status, definition_hash = self.plan(definition, dashboard_id, definition_hash)
+        if status == DEPLOY_UNCHANGED:
+            return DEPLOY_UNCHANGED
+            
+        if status == DEPLOY_UPDATED:
+            if self.update_dashboard(definition, dashboard_id, definition_hash):
+                return DEPLOY_UPDATED
+        elif self.create_dashboard(definition, dashboard_id, definition_hash):
+            return DEPLOY_CREATED
+            
+        return DEPLOY_FAILED
+        
+    def plan(self, definition: Dict, dashboard_id: str,
+             definition_hash: Optional[str] = None) -> Tuple[str, Optional[str]]:
+        if self.change_detection != 'off' and not definition_hash:
+            definition_hash = content_hash(definition)
+            
         if self.check_existing_dashboard(dashboard_id):
+            # 'off' still tags the hash it is given, so switching modes later never trusts a stale tag
+            if (self.change_detection != 'off' and definition_hash and
+                    definition_hash == self.get_deployed_hash(dashboard_id)):
+                self.logger.info(f'Dashboard {dashboard_id} is unchanged, skipping update')
+                return DEPLOY_UNCHANGED, definition_hash
+                
             self.logger.info(f'Dashboard {dashboard_id} exists, updating...')
-            return self.update_dashboard(definition, dashboard_id)
-        else:
-            self.logger.info(f'Dashboard {dashboard_id} does not exist, creating...')
-            return self.create_dashboard(definition, dashboard_id)
+            return DEPLOY_UPDATED, definition_hash
             
+        self.logger.info(f'Dashboard {dashboard_id} does not exist, creating...')
+        return DEPLOY_CREATED, definition_hash
+        
     def check_existing_dashboard(self, dashboard_id: str) -> bool:
+        if self.dashboard_index is not None:
+            return self.dashboard_index.contains(dashboard_id)
+            
         try:
             self.quicksight.describe_dashboard(
                 AwsAccountId=self.account_id,
                 DashboardId=dashboard_id
             )
             return True
-        except Exception as e:
-            if 'ResourceNotFoundException' in str(e):
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ResourceNotFoundException':
                 return False
             raise
             
-    def create_dashboard(self, definition: Dict, dashboard_id: str) -> bool:
-        try:
-            response = self.quicksight.create_dashboard(
+    def get_deployed_hash(self, dashboard_id: str) -> Optional[str]:
+        response = self.quicksight.list_tags_for_resource(
+            ResourceArn=self._get_dashboard_arn(dashboard_id)
+        )
+        for tag in response.get('Tags', []):
+            if tag['Key'] == DEFINITION_HASH_TAG:
+                return tag['Value']
+                
+        if self.change_detection == 'definition':
+            response = self.quicksight.describe_dashboard_definition(
                 AwsAccountId=self.account_id,
-                DashboardId=dashboard_id,
-                Name=definition.get('Name', dashboard_id),
-                Definition=definition
+                DashboardId=dashboard_id
             )
+            return content_hash(response['Definition'])
             
+        return None
+        
+    def create_dashboard(self, definition: Dict, dashboard_id: str, definition_hash: Optional[str] = None) -> bool:
+        try:
+            params = {
+                'AwsAccountId': self.account_id,
+                'DashboardId': dashboard_id,
+                'Name': definition.get('Name', dashboard_id),
+                'Definition': definition
+            }
+            if definition_hash:
+                params['Tags'] = [{'Key': DEFINITION_HASH_TAG, 'Value': definition_hash}]
+                
+            response = self.quicksight.create_dashboard(**params)
+            self._submitted(dashboard_id, response)
+            if self.dashboard_index is not None:
+                self.dashboard_index.put(dashboard_id, {
+                    'Arn': response.get('Arn'),
+                    'VersionNumber': None,
+                    'LastUpdatedTime': None
+                })
+                
             self.logger.info(f'Dashboard {dashboard_id} created successfully')
             return True
         except Exception as e:
             self.logger.error(f'Failed to create dashboard {dashboard_id}: {str(e)}')
             return False
             
-    def update_dashboard(self, definition: Dict, dashboard_id: str) -> bool:
+    def update_dashboard(self, definition: Dict, dashboard_id: str, definition_hash: Optional[str] = None) -> bool:
         try:
             response = self.quicksight.update_dashboard(
                 AwsAccountId=self.account_id,
@@ -57,9 +148,89 @@ class DashboardDeployer:
                 Name=definition.get('Name', dashboard_id),
                 Definition=definition
             )
+            self._submitted(dashboard_id, response)
             
             self.logger.info(f'Dashboard {dashboard_id} updated successfully')
-            return True
         except Exception as e:
             self.logger.error(f'Failed to update dashboard {dashboard_id}: {str(e)}')
-            return False
\ No newline at end of file
+            return False
+            
+        if definition_hash and self.defer_hash_tags:
+            self.submitted_hashes[dashboard_id] = definition_hash
+        elif definition_hash:
+            self._tag_definition_hash(dashboard_id, definition_hash)
+        return True
+        
+    def delete_dashboard(self, dashboard_id: str) -> bool:
+        try:
+            self.quicksight.delete_dashboard(
+                AwsAccountId=self.account_id,
+                DashboardId=dashboard_id
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ResourceNotFoundException':
+                self.logger.error(f'Failed to delete dashboard {dashboard_id}: {str(e)}')
+                return False
+            self.logger.info(f'Dashboard {dashboard_id} is already gone')
+        except Exception as e:
+            self.logger.error(f'Failed to delete dashboard {dashboard_id}: {str(e)}')
+            return False
+            
+        if self.dashboard_index is not None:
+            self.dashboard_index.remove(dashboard_id)
+        self.logger.info(f'Dashboard {dashboard_id} deleted successfully')
+        return True
+        
+    def publish_version(self, dashboard_id: str, version_number: int) -> bool:
+        try:
+            self.quicksight.update_dashboard_published_version(
+                AwsAccountId=self.account_id,
+                DashboardId=dashboard_id,
+                VersionNumber=version_number
+            )
+            self.logger.info(f'Dashboard {dashboard_id} published at version {version_number}')
+            return True
+        except Exception as e:
+            self.logger.error(f'Failed to publish version {version_number} of dashboard {dashboard_id}: {str(e)}')
+            return False
+            
+    def get_published_version(self, dashboard_id: str) -> Optional[int]:
+        entry = self.dashboard_index.get(dashboard_id) if self.dashboard_index is not None else None
+        return entry.get('VersionNumber') if entry else None
+        
+    def tag_submitted_hash(self, dashboard_id: str):
+        definition_hash = self.submitted_hashes.pop(dashboard_id, None)
+        if definition_hash:
+            self._tag_definition_hash(dashboard_id, definition_hash)
+            
+    def clear_definition_hash(self, dashboard_id: str):
+        try:
+            self.quicksight.untag_resource(
+                ResourceArn=self._get_dashboard_arn(dashboard_id),
+                TagKeys=[DEFINITION_HASH_TAG]
+            )
+        except Exception as e:
+            self.logger.warning(f'Failed to remove the definition hash tag from dashboard {dashboard_id}: {str(e)}')
+            
+    def _submitted(self, dashboard_id: str, response: Dict):
+        version = version_number(response.get('VersionArn'))
+        self.submitted_versions[dashboard_id] = version
+        # The API accepts the definition before QuickSight has built it, the tracker follows it to a final status
+        if self.status_tracker is not None:
+            self.status_tracker.track(dashboard_id, version)
+            
+    def _tag_definition_hash(self, dashboard_id: str, definition_hash: str):
+        try:
+            self.quicksight.tag_resource(
+                ResourceArn=self._get_dashboard_arn(dashboard_id),
+                Tags=[{'Key': DEFINITION_HASH_TAG, 'Value': definition_hash}]
+            )
+        except Exception as e:
+            # The update itself succeeded; the next run just won't be able to skip this dashboard
+            self.logger.warning(f'Failed to tag dashboard {dashboard_id} with its definition hash: {str(e)}')
+            
+    def _get_dashboard_arn(self, dashboard_id: str) -> str:
+        entry = self.dashboard_index.get(dashboard_id) if self.dashboard_index is not None else None
+        if entry and entry.get('Arn'):
+            return entry['Arn']
+        return f'arn:aws:quicksight:{self.region}:{self.account_id}:dashboard/{dashboard_id}'
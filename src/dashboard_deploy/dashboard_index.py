@@ -0,0 +1,59 @@
+import threading
+from typing import Dict, Optional
+
+
+class DashboardIndex:
+    def __init__(self, quicksight, account_id: str):
+        self.quicksight = quicksight
+        self.account_id = account_id
+        self._entries = {}
+        self._lock = threading.Lock()
+        
+    def load(self) -> 'DashboardIndex':
+        entries = {}
+        next_token = None
+        
+        while True:
+            params = {
+                'AwsAccountId': self.account_id,
+                'MaxResults': 100
+            }
+            
+            if next_token:
+                params['NextToken'] = next_token
+                
+            response = self.quicksight.list_dashboards(**params)
+            for summary in response.get('DashboardSummaryList', []):
+                entries[summary['DashboardId']] = {
+                    'Arn': summary.get('Arn'),
+                    'VersionNumber': summary.get('PublishedVersionNumber'),
+                    'LastUpdatedTime': summary.get('LastUpdatedTime')
+                }
+                
+            next_token = response.get('NextToken')
+            if not next_token:
+                break
+                
+        with self._lock:
+            self._entries = entries
+        return self
+        
+    def contains(self, dashboard_id: str) -> bool:
+        with self._lock:
+            return dashboard_id in self._entries
+            
+    def get(self, dashboard_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self._entries.get(dashboard_id)
+            
+    def put(self, dashboard_id: str, entry: Dict):
+        with self._lock:
+            self._entries[dashboard_id] = entry
+            
+    def remove(self, dashboard_id: str):
+        with self._lock:
+            self._entries.pop(dashboard_id, None)
+            
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Callable
+from botocore.exceptions import ClientError
+
+
+class DataSetCache:
+    def __init__(self, quicksight, account_id: str, ttl_seconds: float = 900,
+                 clock: Callable[[], float] = time.monotonic):
+        self.quicksight = quicksight
+        self.account_id = account_id
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = {}
+        self._index_loaded_at = None
+        self._lock = threading.Lock()
+        
+    def exists(self, dataset_id: str) -> bool:
+        with self._lock:
+            if self._is_expired(self._index_loaded_at):
+                self._load_index()
+                
+            cached = self._entries.get(dataset_id)
+            if cached and not self._is_expired(cached[1]):
+                return cached[0]
+                
+        exists = self._describe(dataset_id)
+        with self._lock:
+            self._entries[dataset_id] = (exists, self.clock())
+        return exists
+        
+    def _is_expired(self, cached_at) -> bool:
+        return cached_at is None or self.clock() - cached_at >= self.ttl_seconds
+        
+    def _load_index(self):
+        loaded_at = self.clock()
+        entries = {}
+        next_token = None
+        
+        while True:
+            params = {
+                'AwsAccountId': self.account_id,
+                'MaxResults': 100
+            }
+            
+            if next_token:
+                params['NextToken'] = next_token
+                
+            response = self.quicksight.list_data_sets(**params)
+            for summary in response.get('DataSetSummaries', []):
+                entries[summary['DataSetId']] = (True, loaded_at)
+                
+            next_token = response.get('NextToken')
+            if not next_token:
+                break
+                
+        self._entries = entries
+        self._index_loaded_at = loaded_at
+        
+    def _describe(self, dataset_id: str) -> bool:
+        try:
+            self.quicksight.describe_data_set(
+                AwsAccountId=self.account_id,
+                DataSetId=dataset_id
+            )
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ResourceNotFoundException':
+                return False
+            raise
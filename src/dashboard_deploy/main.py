@@ -1,16 +1,32 @@
+import argparse
 import json
 import sys
-from typing import Dict, List
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
+from src.common.asset_bundle import ENGINE_ASSET_BUNDLE, AssetBundleJobRunner, validate_engine
 from src.common.aws_client import AWSClientManager
+from src.common.concurrency import WorkerPool
 from src.common.config import Config
 from src.common.logger import setup_logger
-from src.dashboard_deploy.dashboard_deployer import DashboardDeployer
+from src.common.sharding import Shard
+from src.common.snapshot_format import load_definition
+from src.common.snapshot_store import SnapshotStore
+from src.dashboard_deploy.dashboard_deployer import (
+    DEFINITION_HASH_TAG, DEPLOY_DELETED, DEPLOY_FAILED, DEPLOY_ROLLED_BACK, DEPLOY_UNCHANGED, DEPLOY_UPDATED,
+    DashboardDeployer
+)
+from src.dashboard_deploy.status_tracker import CreationStatusTracker
 from src.dashboard_deploy.validator import Validator
 
 
+DEPLOY_REPORT_FILENAME = 'deploy_report.json'
+DEPLOY_JOURNAL_FILENAME = 'deploy_journal.json'
+
+
 class DashboardDeployRunner:
-    def __init__(self):
+    def __init__(self, shard: Optional[Shard] = None):
         self.config = Config('.env.intg')
         self.logger = setup_logger('DashboardDeployRunner')
         
@@ -20,69 +36,680 @@ class DashboardDeployRunner:
         self.s3_bucket = self.config.get_required('DEPLOY_SOURCE_S3_BUCKET')
         self.s3_prefix = self.config.get_required('DEPLOY_SOURCE_S3_PREFIX')
         self.role_name = self.config.get_required('CROSS_ACCOUNT_ROLE_NAME')
-        
-        self.aws_manager = AWSClientManager(self.region)
+        self.environment = self.config.get('DEPLOY_ENVIRONMENT')
+        self.max_workers = int(self.config.get('DEPLOY_MAX_WORKERS', '1'))
+        self.fail_fast = self.config.get('DEPLOY_FAIL_FAST', 'true').lower() == 'true'
+        self.change_detection = self.config.get('DEPLOY_CHANGE_DETECTION', 'tag')
+        self.dataset_cache_ttl = float(self.config.get('DATASET_CACHE_TTL_SECONDS', '900'))
+        self.engine = validate_engine(self.config.get('DEPLOY_ENGINE', 'api'))
+        self.shard = shard
+        self.delta = self.config.get('DEPLOY_DELTA', 'false').lower() == 'true'
+        self.delete_removed = self.config.get('DEPLOY_DELETE_REMOVED', 'false').lower() == 'true'
+        self.delete_max = int(self.config.get('DEPLOY_DELETE_MAX', '10'))
+        self.track_status = self.config.get('DEPLOY_TRACK_STATUS', 'true').lower() == 'true'
+        self.publish = self.config.get('DEPLOY_PUBLISH', 'true').lower() == 'true'
+        self.rollback_workers = int(self.config.get('DEPLOY_ROLLBACK_MAX_WORKERS', '10'))
+        self.validate_first = self.config.get('DEPLOY_VALIDATE_FIRST', 'true').lower() == 'true'
+        self.require_all_valid = self.config.get('DEPLOY_REQUIRE_ALL_VALID', 'true').lower() == 'true'
+        if (self.delta or self.delete_removed) and not self.environment:
+            raise ValueError('DEPLOY_DELTA and DEPLOY_DELETE_REMOVED need DEPLOY_ENVIRONMENT to track deployed dashboards')
+            
+        AWSClientManager.configure(
+            retry_mode=self.config.get('AWS_RETRY_MODE', 'standard'),
+            max_attempts=self.config.get('AWS_MAX_ATTEMPTS'),
+            rate_limit=self.config.get('QUICKSIGHT_RATE_LIMIT'),
+            max_rate_limit=self.config.get('QUICKSIGHT_MAX_RATE_LIMIT')
+        )
+        self.aws_manager = AWSClientManager(self.region, self.max_workers)
         self.s3_client = self.aws_manager.get_s3_client()
-        self.validator = Validator(self.account_id, self.region)
-        self.deployer = DashboardDeployer(self.account_id, self.namespace, self.region)
+        self.snapshot_store = SnapshotStore(self.s3_client, self.s3_bucket, self.s3_prefix)
+        self.manifest = None
+        self.bundle_reader = None
+        self.validator = Validator(self.account_id, self.region, self.dataset_cache_ttl, self.role_name)
+        self.deployer = DashboardDeployer(
+            self.account_id, self.namespace, self.region, self.change_detection, self.role_name
+        )
+        self.deployer.defer_hash_tags = True
+        self.worker_pool = WorkerPool(self.max_workers, self.logger)
+        self.deploy_report = None
+        self.delta_summary = None
+        self.validation_summary = None
+        self.validated_ids = set()
         
-    def deploy_dashboards(self) -> bool:
+    def deploy_dashboards(self, snapshot: Optional[str] = None) -> bool:
         self.logger.info('Starting dashboard deployment')
         
-        latest_folder = self._get_latest_s3_folder()
-        if not latest_folder:
-            self.logger.error('No dashboard folders found in S3')
+        latest_folder, dashboard_ids = self._open_snapshot(snapshot)
+        if not dashboard_ids:
+            return False
+            
+        if self.shard:
+            dashboard_ids = [dashboard_id for dashboard_id in dashboard_ids if self.shard.contains(dashboard_id)]
+            self.logger.info(f'Shard {self.shard} deploys {len(dashboard_ids)} of them')
+            
+        removed_ids = []
+        if self.delta or self.delete_removed:
+            dashboard_ids, removed_ids = self._select_delta(dashboard_ids)
+            
+        started = time.monotonic()
+        planned_ids = dashboard_ids + removed_ids
+        validation_errors = {}
+        if self.validate_first and dashboard_ids:
+            validation_errors = self._validate_all(dashboard_ids, latest_folder)
+            if validation_errors and self.require_all_valid:
+                self.logger.error(
+                    f'{len(validation_errors)} of {len(dashboard_ids)} dashboards failed validation, '
+                    f'nothing will be written'
+                )
+                self.validated_ids = set()
+                dashboard_ids, removed_ids = [], []
+            else:
+                dashboard_ids = [
+                    dashboard_id for dashboard_id in dashboard_ids if dashboard_id not in validation_errors
+                ]
+                
+        previous_versions = {}
+        if dashboard_ids or removed_ids:
+            self.deployer.load_dashboard_index()
+            # Read before any write, created dashboards enter the index without a published version
+            previous_versions = {
+                dashboard_id: self.deployer.get_published_version(dashboard_id) for dashboard_id in dashboard_ids
+            }
+            
+        if self.engine == ENGINE_ASSET_BUNDLE:
+            results, errors = self._deploy_with_asset_bundles(dashboard_ids, latest_folder)
+        else:
+            results, errors = self._deploy_with_api(dashboard_ids, latest_folder)
+        if removed_ids and not (errors and self.fail_fast):
+            deleted, delete_errors = self.worker_pool.run(
+                self._delete_single_dashboard, removed_ids, label='removed dashboards', fail_fast=self.fail_fast
+            )
+            results.update(deleted)
+            errors.update(delete_errors)
+        errors.update(validation_errors)
+        
+        self.deploy_report = self._build_report(planned_ids, results, errors, time.monotonic() - started)
+        self._log_report(self.deploy_report)
+        journal = self._build_journal(latest_folder, previous_versions, results, errors)
+        
+        if self.shard:
+            # The deployed pointer waits for the merge, which knows whether every shard succeeded
+            self.snapshot_store.write_file(
+                latest_folder,
+                self.shard.filename(self._environment_filename(DEPLOY_REPORT_FILENAME)),
+                json.dumps(self.deploy_report, indent=2)
+            )
+            # Written even when empty, so a rerun never leaves the journal of an earlier attempt behind
+            self.snapshot_store.write_file(
+                latest_folder,
+                self.shard.filename(self._environment_filename(DEPLOY_JOURNAL_FILENAME)),
+                json.dumps(journal, indent=2)
+            )
+            return not errors and len(results) == len(planned_ids)
+            
+        succeeded = not errors and len(results) == len(planned_ids)
+        self._save_journal(journal)
+        if self.environment:
+            self._record_deploy_state(latest_folder, self.deploy_report, succeeded)
+        if not succeeded:
+            return False
+            
+        if self.environment:
+            self.snapshot_store.update_deployed_pointer(self.environment, latest_folder)
+            
+        self.logger.info('All dashboards deployed successfully')
+        return True
+        
+    def validate_dashboards(self, snapshot: Optional[str] = None) -> bool:
+        self.logger.info('Starting dashboard validation')
+        
+        folder, dashboard_ids = self._open_snapshot(snapshot)
+        if not dashboard_ids:
             return False
             
-        self.logger.info(f'Using latest dashboard folder: {latest_folder}')
+        errors = self._validate_all(dashboard_ids, folder)
+        # Nothing is written, so no verdict is ever consumed
+        self.validated_ids = set()
+        return not errors
+        
+    def _open_snapshot(self, snapshot: Optional[str]) -> Tuple[Optional[str], List[str]]:
+        folder = snapshot or self._get_latest_s3_folder()
+        if not folder:
+            self.logger.error('No dashboard folders found in S3')
+            return None, []
+            
+        self.logger.info(f'Using latest dashboard folder: {folder}')
         
-        dashboard_files = self._get_dashboard_files(latest_folder)
+        self.manifest = self.snapshot_store.load_manifest(folder)
+        if not self.manifest:
+            self.logger.warning(f'No manifest found in {folder}, listing dashboard files')
+        self.bundle_reader = self.snapshot_store.open_bundle(self.manifest)
+        
+        dashboard_files = self._get_dashboard_files(folder)
         if not dashboard_files:
             self.logger.error('No dashboard files found')
-            return False
+            return folder, []
             
         self.logger.info(f'Found {len(dashboard_files)} dashboard files')
+        return folder, [dashboard_file.replace('.json', '') for dashboard_file in dashboard_files]
         
-        for dashboard_file in dashboard_files:
-            dashboard_id = dashboard_file.replace('.json', '')
-            self.logger.info(f'Processing dashboard: {dashboard_id}')
+    def _validate_all(self, dashboard_ids: List[str], folder: str) -> Dict[str, Exception]:
+        started = time.monotonic()
+        self.logger.info(f'Validating {len(dashboard_ids)} dashboards before any write')
+        
+        self.validated_ids = set()
+        # Never fail fast here, the point is to report every broken definition in one go. Only the verdict is
+        # kept, holding every definition until the write phase would grow memory with the size of the release
+        passed, errors = self.worker_pool.run(
+            lambda dashboard_id: self._load_valid_dashboard(dashboard_id, folder) is not None,
+            dashboard_ids,
+            label='validated dashboards'
+        )
+        self.validated_ids = set(passed)
+        self.validation_summary = {
+            'Passed': len(passed),
+            'Failed': {dashboard_id: str(errors[dashboard_id]) for dashboard_id in sorted(errors)},
+            'ElapsedSeconds': round(time.monotonic() - started, 3)
+        }
+        self._log_validation(self.validation_summary)
+        return errors
+        
+    def _log_validation(self, summary: Dict):
+        self.logger.info(
+            f"Validation summary: {summary['Passed']} passed, {len(summary['Failed'])} failed "
+            f"in {summary['ElapsedSeconds']:.1f}s"
+        )
+        for dashboard_id, message in summary['Failed'].items():
+            self.logger.error(f'Dashboard {dashboard_id} is invalid: {message}')
             
-            definition = self._load_dashboard_from_s3(dashboard_id, latest_folder)
-            if not definition:
-                self.logger.error(f'Failed to load dashboard {dashboard_id}')
-                return False
-                
-            if not self._validate_dashboard(definition):
-                self.logger.error(f'Dashboard {dashboard_id} failed validation')
-                return False
+    def _select_delta(self, dashboard_ids: List[str]) -> Tuple[List[str], List[str]]:
+        state = self.snapshot_store.load_deploy_state(self.environment)
+        if not state or not self.manifest:
+            self.logger.info(f'No deploy record for {self.environment} to compare with, deploying every dashboard')
+            return dashboard_ids, []
+            
+        deployed = state.get('Dashboards', {})
+        changed_ids = dashboard_ids
+        if self.delta:
+            changed_ids = [
+                dashboard_id for dashboard_id in dashboard_ids
+                if not self._get_manifest_hash(dashboard_id) or
+                deployed.get(dashboard_id) != self._get_manifest_hash(dashboard_id)
+            ]
+            
+        removed_ids = []
+        if self.delete_removed and self.manifest.dashboard_filter:
+            # A filtered export leaves out dashboards that still belong to the release
+            self.logger.warning(
+                f'Snapshot {self.manifest.timestamp} is filtered by {self.manifest.dashboard_filter}, '
+                f'no dashboards are deleted'
+            )
+        elif self.delete_removed:
+            # Only dashboards this tool deployed are candidates, anything created by hand is left alone
+            removed_ids = sorted(
+                dashboard_id for dashboard_id in deployed
+                if not self.manifest.get_dashboard(dashboard_id) and (not self.shard or self.shard.contains(dashboard_id))
+            )
+            if len(removed_ids) > self.delete_max:
+                raise ValueError(
+                    f'Snapshot {self.manifest.timestamp} would delete {len(removed_ids)} dashboards from '
+                    f'{self.environment}, more than DEPLOY_DELETE_MAX={self.delete_max}. '
+                    f'Check the snapshot or raise DEPLOY_DELETE_MAX'
+                )
                 
-            if not self.deployer.deploy_dashboard(definition, dashboard_id):
-                self.logger.error(f'Failed to deploy dashboard {dashboard_id}')
-                return False
+        added = sum(1 for dashboard_id in changed_ids if dashboard_id not in deployed)
+        self.delta_summary = {
+            'Base': state.get('Snapshot'),
+            'Added': added,
+            'Changed': len(changed_ids) - added,
+            'Unchanged': len(dashboard_ids) - len(changed_ids),
+            'Removed': len(removed_ids)
+        }
+        self.logger.info(
+            f"Delta against the last deploy to {self.environment} ({state.get('Snapshot')}): "
+            f"{added} added, {len(changed_ids) - added} changed, "
+            f"{len(dashboard_ids) - len(changed_ids)} unchanged, {len(removed_ids)} removed"
+        )
+        return changed_ids, removed_ids
+        
+    def _record_deploy_state(self, folder: str, report: Dict, succeeded: bool):
+        manifest = self.manifest or self.snapshot_store.load_manifest(folder)
+        if not manifest:
+            # Without content hashes there is nothing a later delta could compare against
+            return
+            
+        state = self.snapshot_store.load_deploy_state(self.environment) or {'Snapshot': None, 'Dashboards': {}}
+        deployed = state.setdefault('Dashboards', {})
+        for dashboard_id, result in report['Succeeded'].items():
+            if result['Status'] == DEPLOY_DELETED:
+                deployed.pop(dashboard_id, None)
+                continue
+            entry = manifest.get_dashboard(dashboard_id)
+            if entry and entry.get('Sha256'):
+                deployed[dashboard_id] = entry['Sha256']
+        # A failed dashboard may be half-written, so the next delta has to pick it up again
+        for dashboard_id in report['Failed']:
+            deployed.pop(dashboard_id, None)
+            
+        if succeeded:
+            state['Snapshot'] = folder
+        state['Dashboards'] = dict(sorted(deployed.items()))
+        self.snapshot_store.save_deploy_state(self.environment, state)
+        
+    def _build_journal(self, folder: str, previous_versions: Dict[str, Optional[int]],
+                       results: Dict[str, Dict], errors: Dict[str, Exception]) -> Dict:
+        dashboards = {}
+        for dashboard_id, version in previous_versions.items():
+            if dashboard_id in errors:
+                # A failed write may still have left a new version behind
+                status = DEPLOY_FAILED
+            elif dashboard_id in results and results[dashboard_id]['Status'] != DEPLOY_UNCHANGED:
+                status = results[dashboard_id]['Status']
+            else:
+                continue
+            dashboards[dashboard_id] = {
+                'Status': status,
+                'PreviousVersion': version,
+                'NewVersion': self.deployer.submitted_versions.get(dashboard_id)
+            }
+            
+        return {
+            'Snapshot': folder,
+            'Environment': self.environment,
+            'DeployedAt': datetime.now().strftime('%Y%m%d%H%M%S'),
+            'Dashboards': dict(sorted(dashboards.items()))
+        }
+        
+    def _save_journal(self, journal: Dict):
+        if not journal['Dashboards']:
+            # A run that wrote nothing keeps the journal of the last run that did, so it can still be rolled back
+            return
+        self.snapshot_store.save_run_journal(self.environment, journal)
+        self.logger.info(f"Recorded the previous versions of {len(journal['Dashboards'])} dashboards for rollback")
+        
+    def rollback(self) -> bool:
+        journal = self.snapshot_store.load_run_journal(self.environment)
+        if not journal or not journal.get('Dashboards'):
+            self.logger.error(f'No deploy run journal found for {self.environment or "the default environment"}')
+            return False
+            
+        entries = journal['Dashboards']
+        dashboard_ids = [dashboard_id for dashboard_id, entry in entries.items() if entry.get('PreviousVersion')]
+        created_ids = [dashboard_id for dashboard_id in entries if dashboard_id not in dashboard_ids]
+        self.logger.info(
+            f"Rolling back the deploy of {journal['Snapshot']} at {journal['DeployedAt']}: "
+            f'{len(dashboard_ids)} dashboards to restore, {len(created_ids)} created by the run left in place'
+        )
+        
+        started = time.monotonic()
+        # Only the published version changes, so this runs far wider than a deploy without re-sending definitions
+        results, errors = WorkerPool(self.rollback_workers, self.logger).run(
+            lambda dashboard_id: self._rollback_single_dashboard(
+                dashboard_id, entries[dashboard_id]['PreviousVersion']
+            ),
+            dashboard_ids,
+            label='dashboards to roll back'
+        )
+        report = self._build_report(dashboard_ids, results, errors, time.monotonic() - started)
+        report['Created'] = created_ids
+        self._log_report(report)
+        
+        journal['Rollback'] = dict(report, RolledBackAt=datetime.now().strftime('%Y%m%d%H%M%S'))
+        self.snapshot_store.save_run_journal(self.environment, journal)
+        if self.environment and results:
+            self._forget_deployed(list(results))
+            
+        if errors:
+            return False
+        self.logger.info(f'Rolled back {len(results)} dashboards')
+        return True
+        
+    def _rollback_single_dashboard(self, dashboard_id: str, version_number: int) -> Dict:
+        started = time.monotonic()
+        if not self.deployer.publish_version(dashboard_id, version_number):
+            raise RuntimeError(f'Failed to roll back dashboard {dashboard_id} to version {version_number}')
+            
+        # The tag still names the rolled back definition, which would make the next deploy skip the dashboard
+        self.deployer.clear_definition_hash(dashboard_id)
+        return {
+            'Status': DEPLOY_ROLLED_BACK,
+            'Version': version_number,
+            'Seconds': round(time.monotonic() - started, 3)
+        }
+        
+    def _forget_deployed(self, dashboard_ids: List[str]):
+        state = self.snapshot_store.load_deploy_state(self.environment)
+        if not state:
+            return
+        for dashboard_id in dashboard_ids:
+            state.get('Dashboards', {}).pop(dashboard_id, None)
+        self.snapshot_store.save_deploy_state(self.environment, state)
+        
+    def merge_shard_reports(self, shard_count: int, snapshot: Optional[str] = None) -> bool:
+        folder = snapshot or self._get_latest_s3_folder()
+        if not folder:
+            self.logger.error('No dashboard folders found in S3')
+            return False
+            
+        shards = [Shard(index, shard_count) for index in range(1, shard_count + 1)]
+        reports = {}
+        for shard in shards:
+            content = self.snapshot_store.read_file(
+                folder, shard.filename(self._environment_filename(DEPLOY_REPORT_FILENAME))
+            )
+            if content is not None:
+                reports[shard.index] = json.loads(content)
                 
-        self.logger.info('All dashboards deployed successfully')
+        missing = [str(shard) for shard in shards if shard.index not in reports]
+        if missing:
+            raise RuntimeError(f'Cannot merge deploy of {folder}, shards not finished: {", ".join(missing)}')
+            
+        self.deploy_report = {
+            'Succeeded': {},
+            'Failed': {},
+            'Skipped': [],
+            # Shards run side by side, so the slowest one is the wall-clock time of the deploy
+            'ElapsedSeconds': max(report['ElapsedSeconds'] for report in reports.values())
+        }
+        for report in reports.values():
+            self.deploy_report['Succeeded'].update(report['Succeeded'])
+            self.deploy_report['Failed'].update(report['Failed'])
+            self.deploy_report['Skipped'].extend(report['Skipped'])
+        for key in ('Succeeded', 'Failed'):
+            self.deploy_report[key] = dict(sorted(self.deploy_report[key].items()))
+        self.deploy_report['Skipped'].sort()
+        
+        validations = [report['Validation'] for report in reports.values() if report.get('Validation')]
+        if validations:
+            self.deploy_report['Validation'] = {
+                'Passed': sum(validation['Passed'] for validation in validations),
+                'Failed': dict(sorted(
+                    (dashboard_id, message) for validation in validations
+                    for dashboard_id, message in validation['Failed'].items()
+                )),
+                'ElapsedSeconds': max(validation['ElapsedSeconds'] for validation in validations)
+            }
+            
+        deltas = [report['Delta'] for report in reports.values() if report.get('Delta')]
+        if deltas:
+            self.deploy_report['Delta'] = dict(
+                {key: sum(delta[key] for delta in deltas) for key in ('Added', 'Changed', 'Unchanged', 'Removed')},
+                Base=deltas[0]['Base']
+            )
+            
+        self.snapshot_store.write_file(
+            folder, self._environment_filename(DEPLOY_REPORT_FILENAME), json.dumps(self.deploy_report, indent=2)
+        )
+        self._log_report(self.deploy_report)
+        self._save_journal(self._merge_shard_journals(folder, shards))
+        
+        succeeded = not self.deploy_report['Failed'] and not self.deploy_report['Skipped']
+        if self.environment:
+            # Shards leave the deploy record to the merge, so they never write it concurrently
+            self._record_deploy_state(folder, self.deploy_report, succeeded)
+        if not succeeded:
+            return False
+            
+        if self.environment:
+            self.snapshot_store.update_deployed_pointer(self.environment, folder)
+            
+        self.logger.info(f'All dashboards of {shard_count} shards deployed successfully')
         return True
         
-    def _get_latest_s3_folder(self) -> str:
-        response = self.s3_client.list_objects_v2(
-            Bucket=self.s3_bucket,
-            Prefix=self.s3_prefix,
-            Delimiter='/'
+    def _merge_shard_journals(self, folder: str, shards: List[Shard]) -> Dict:
+        journals = []
+        for shard in shards:
+            content = self.snapshot_store.read_file(
+                folder, shard.filename(self._environment_filename(DEPLOY_JOURNAL_FILENAME))
+            )
+            if content is not None:
+                journals.append(json.loads(content))
+                
+        dashboards = {}
+        for journal in journals:
+            dashboards.update(journal['Dashboards'])
+        return {
+            'Snapshot': folder,
+            'Environment': self.environment,
+            'DeployedAt': max((journal['DeployedAt'] for journal in journals), default=None),
+            'Dashboards': dict(sorted(dashboards.items()))
+        }
+        
+    def _environment_filename(self, filename: str) -> str:
+        if self.environment:
+            return filename.replace('.json', f'_{self.environment}.json')
+        return filename
+        
+    def _deploy_with_api(self, dashboard_ids: List[str],
+                         folder: str) -> Tuple[Dict[str, Dict], Dict[str, Exception]]:
+        tracker = None
+        if self.track_status and dashboard_ids:
+            tracker = self._create_status_tracker(self.max_workers)
+            self.deployer.status_tracker = tracker
+            tracker.start()
+            
+        try:
+            results, errors = self.worker_pool.run(
+                lambda dashboard_id: self._deploy_single_dashboard(dashboard_id, folder),
+                dashboard_ids,
+                label='dashboards',
+                fail_fast=self.fail_fast
+            )
+        finally:
+            if tracker:
+                self.deployer.status_tracker = None
+                self.logger.info('Waiting for QuickSight to finish building the submitted dashboards')
+                ready, failed = tracker.wait()
+                
+        if not tracker:
+            return results, errors
+            
+        for dashboard_id, seconds in ready.items():
+            if dashboard_id in results:
+                results[dashboard_id]['SecondsToReady'] = seconds
+        for dashboard_id, message in failed.items():
+            results.pop(dashboard_id, None)
+            errors[dashboard_id] = RuntimeError(f'Dashboard {dashboard_id} did not become ready: {message}')
+            # Otherwise the next run would see a matching hash and skip the broken dashboard
+            self.deployer.clear_definition_hash(dashboard_id)
+            
+        # Only a version QuickSight has finished building can be published
+        updated_ids = [
+            dashboard_id for dashboard_id in ready
+            if dashboard_id in results and results[dashboard_id]['Status'] == DEPLOY_UPDATED
+        ]
+        released, release_errors = self.worker_pool.run(
+            self._release_new_version, updated_ids, label='updated dashboards to release'
         )
+        for dashboard_id, version in released.items():
+            if version:
+                results[dashboard_id]['Version'] = version
+        for dashboard_id, error in release_errors.items():
+            results.pop(dashboard_id, None)
+            errors[dashboard_id] = error
+        return results, errors
         
-        folders = []
-        for obj in response.get('Contents', []):
-            parts = obj['Key'].replace(self.s3_prefix, '').split('/')
-            if len(parts) > 1 and parts[0]:
-                folders.append(parts[0])
+    def _create_status_tracker(self, max_workers: int) -> CreationStatusTracker:
+        return CreationStatusTracker(
+            self.deployer.quicksight,
+            self.account_id,
+            poll_interval=float(self.config.get('DEPLOY_STATUS_POLL_INTERVAL_SECONDS', '2')),
+            max_poll_interval=float(self.config.get('DEPLOY_STATUS_MAX_POLL_INTERVAL_SECONDS', '30')),
+            timeout=float(self.config.get('DEPLOY_STATUS_TIMEOUT_SECONDS', '1800')),
+            max_workers=max_workers,
+            logger=self.logger
+        )
+        
+    def _wait_until_built(self, dashboard_id: str):
+        # Without the background tracker the update is followed here, a version still building cannot be published
+        tracker = self._create_status_tracker(1)
+        tracker.track(dashboard_id, self.deployer.submitted_versions.get(dashboard_id))
+        _, failed = tracker.wait()
+        if dashboard_id in failed:
+            raise RuntimeError(f'Dashboard {dashboard_id} did not become ready: {failed[dashboard_id]}')
+            
+    def _release_new_version(self, dashboard_id: str) -> Optional[int]:
+        version = None
+        if self.publish:
+            version = self.deployer.submitted_versions.get(dashboard_id)
+            if not (version and self.deployer.publish_version(dashboard_id, version)):
+                raise RuntimeError(f'Failed to publish version {version} of dashboard {dashboard_id}')
                 
-        if not folders:
-            return None
+        # Tagged last, a run killed before this point leaves the old hash and the next run writes the dashboard again
+        self.deployer.tag_submitted_hash(dashboard_id)
+        return version
+        
+    def _delete_single_dashboard(self, dashboard_id: str) -> Dict:
+        started = time.monotonic()
+        self.logger.info(f'Deleting dashboard removed from the snapshot: {dashboard_id}')
+        if not self.deployer.delete_dashboard(dashboard_id):
+            raise RuntimeError(f'Failed to delete dashboard {dashboard_id}')
+        return {'Status': DEPLOY_DELETED, 'Seconds': round(time.monotonic() - started, 3)}
+        
+    def _deploy_single_dashboard(self, dashboard_id: str, folder: str) -> Dict:
+        started = time.monotonic()
+        definition = self._load_valid_dashboard(dashboard_id, folder)
+        
+        status = self.deployer.deploy(definition, dashboard_id, self._get_manifest_hash(dashboard_id))
+        if status == DEPLOY_FAILED:
+            raise RuntimeError(f'Failed to deploy dashboard {dashboard_id}')
+            
+        result = {'Status': status, 'Seconds': round(time.monotonic() - started, 3)}
+        if status == DEPLOY_UPDATED and not self.track_status:
+            # Without a tracker there is no later point that knows the build finished
+            if self.publish:
+                self._wait_until_built(dashboard_id)
+            version = self._release_new_version(dashboard_id)
+            if version:
+                result['Version'] = version
+        return result
+        
+    def _deploy_with_asset_bundles(self, dashboard_ids: List[str],
+                                   folder: str) -> Tuple[Dict[str, Dict], Dict[str, Exception]]:
+        # Loading, validation and change detection stay per dashboard, only the writes are batched into jobs
+        plans, errors = self.worker_pool.run(
+            lambda dashboard_id: self._plan_single_dashboard(dashboard_id, folder),
+            dashboard_ids,
+            label='dashboards',
+            fail_fast=self.fail_fast
+        )
+        results = {
+            dashboard_id: {'Status': plan['Status'], 'Seconds': plan['Seconds']}
+            for dashboard_id, plan in plans.items() if plan['Status'] == DEPLOY_UNCHANGED
+        }
+        pending = {dashboard_id: plan for dashboard_id, plan in plans.items() if dashboard_id not in results}
+        if not pending or (errors and self.fail_fast):
+            return results, errors
+            
+        self.logger.info(f'Importing {len(pending)} dashboards through asset bundle jobs')
+        runner = AssetBundleJobRunner.from_config(self.deployer.quicksight, self.account_id, self.config, self.logger)
+        imported, import_errors = runner.import_dashboards(
+            {dashboard_id: plan['Definition'] for dashboard_id, plan in pending.items()},
+            {
+                dashboard_id: [{'Key': DEFINITION_HASH_TAG, 'Value': plan['Sha256']}]
+                for dashboard_id, plan in pending.items() if plan['Sha256']
+            },
+            self.fail_fast
+        )
+        for dashboard_id, seconds in imported.items():
+            results[dashboard_id] = {
+                'Status': pending[dashboard_id]['Status'],
+                'Seconds': round(pending[dashboard_id]['Seconds'] + seconds, 3)
+            }
+        errors.update(import_errors)
+        return results, errors
+        
+    def _plan_single_dashboard(self, dashboard_id: str, folder: str) -> Dict:
+        started = time.monotonic()
+        definition = self._load_valid_dashboard(dashboard_id, folder)
+        status, definition_hash = self.deployer.plan(definition, dashboard_id, self._get_manifest_hash(dashboard_id))
+        return {
+            'Status': status,
+            'Definition': definition,
+            'Sha256': definition_hash,
+            'Seconds': round(time.monotonic() - started, 3)
+        }
+        
+    def _load_valid_dashboard(self, dashboard_id: str, folder: str) -> Dict:
+        self.logger.info(f'Processing dashboard: {dashboard_id}')
+        
+        definition = self._load_dashboard_from_s3(dashboard_id, folder)
+        if not definition:
+            raise RuntimeError(f'Failed to load dashboard {dashboard_id}')
+            
+        if dashboard_id in self.validated_ids:
+            # Passed the validation phase, the manifest checksum confirms the reload is the definition that was checked
+            self.validated_ids.discard(dashboard_id)
+            return definition
+            
+        if not self._validate_dashboard(definition):
+            raise RuntimeError(f'Dashboard {dashboard_id} failed validation')
+            
+        return definition
+        
+    def _get_manifest_hash(self, dashboard_id: str) -> Optional[str]:
+        entry = self.manifest.get_dashboard(dashboard_id) if self.manifest else None
+        return entry.get('Sha256') if entry else None
+        
+    def _build_report(self, dashboard_ids: List[str], results: Dict[str, Dict],
+                      errors: Dict[str, Exception], elapsed: float) -> Dict:
+        report = {
+            'Succeeded': {dashboard_id: results[dashboard_id] for dashboard_id in sorted(results)},
+            'Failed': {dashboard_id: str(errors[dashboard_id]) for dashboard_id in sorted(errors)},
+            'Skipped': [
+                dashboard_id for dashboard_id in dashboard_ids
+                if dashboard_id not in results and dashboard_id not in errors
+            ],
+            'ElapsedSeconds': round(elapsed, 3)
+        }
+        if self.delta_summary:
+            report['Delta'] = self.delta_summary
+        if self.validation_summary:
+            report['Validation'] = self.validation_summary
+        return report
+        
+    def _log_report(self, report: Dict):
+        statuses = {}
+        for result in report['Succeeded'].values():
+            statuses[result['Status']] = statuses.get(result['Status'], 0) + 1
+        status_info = ', '.join(f'{count} {status}' for status, count in sorted(statuses.items()))
+        
+        self.logger.info(
+            f"Deploy summary: {len(report['Succeeded'])} succeeded ({status_info or 'none'}), "
+            f"{len(report['Failed'])} failed, {len(report['Skipped'])} skipped in {report['ElapsedSeconds']:.1f}s"
+        )
+        
+        durations = {
+            dashboard_id: result['Seconds'] for dashboard_id, result in report['Succeeded'].items()
+        }
+        if durations:
+            slowest = max(durations, key=durations.get)
+            average = sum(durations.values()) / len(durations)
+            self.logger.info(
+                f'Per-dashboard time: average {average:.2f}s, slowest {slowest} ({durations[slowest]:.2f}s)'
+            )
             
-        folders.sort(reverse=True)
-        return folders[0]
+        ready_times = {
+            dashboard_id: result['SecondsToReady'] for dashboard_id, result in report['Succeeded'].items()
+            if 'SecondsToReady' in result
+        }
+        if ready_times:
+            slowest = max(ready_times, key=ready_times.get)
+            average = sum(ready_times.values()) / len(ready_times)
+            self.logger.info(
+                f'Time to ready: average {average:.2f}s, slowest {slowest} ({ready_times[slowest]:.2f}s)'
+            )
+            
+        for dashboard_id, message in report['Failed'].items():
+            self.logger.error(f'Dashboard {dashboard_id} failed: {message}')
+            
+    def _get_latest_s3_folder(self) -> str:
+        return self.snapshot_store.get_latest_snapshot()
         
     def _get_dashboard_files(self, folder: str) -> List[str]:
+        if self.manifest:
+            return [f'{dashboard_id}.json' for dashboard_id in self.manifest.dashboards]
+            
         prefix = f'{self.s3_prefix}{folder}/dashboards/'
         response = self.s3_client.list_objects_v2(
             Bucket=self.s3_bucket,
@@ -101,17 +728,25 @@ class DashboardDeployRunner:
         key = f'{self.s3_prefix}{folder}/dashboards/{dashboard_id}.json'
         
         try:
-            response = self.s3_client.get_object(
-                Bucket=self.s3_bucket,
-                Key=key
-            )
-            
-            content = response['Body'].read().decode('utf-8')
-            return json.loads(content)
+            if self.bundle_reader:
+                content, content_encoding = self.bundle_reader.read(f'dashboards/{dashboard_id}.json')
+                definition = load_definition(content, content_encoding)
+            else:
+                response = self.s3_client.get_object(
+                    Bucket=self.s3_bucket,
+                    Key=key
+                )
+                definition = load_definition(response['Body'], response.get('ContentEncoding'))
         except Exception as e:
             self.logger.error(f'Failed to load dashboard {dashboard_id}: {str(e)}')
             return None
             
+        if self.manifest and not self.manifest.verify_dashboard(dashboard_id, definition):
+            self.logger.error(f'Dashboard {dashboard_id} does not match the manifest checksum')
+            return None
+            
+        return definition
+        
     def _validate_dashboard(self, definition: Dict) -> bool:
         if not self.validator.validate_json_structure(definition):
             return False
@@ -125,12 +760,36 @@ class DashboardDeployRunner:
         return True
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Deploy QuickSight dashboard definitions from S3')
+    parser.add_argument('--snapshot', metavar='TIMESTAMP', help='deploy this snapshot instead of the latest one')
+    parser.add_argument('--shard', type=Shard.parse, metavar='INDEX/COUNT',
+                        help='deploy only the dashboards of one shard, e.g. 1/4')
+    parser.add_argument('--merge-shards', type=int, metavar='COUNT',
+                        help='combine the reports of finished shards and record the deploy')
+    parser.add_argument('--rollback', action='store_true',
+                        help='restore the dashboards written by the last deploy run to their previous versions')
+    parser.add_argument('--validate-only', action='store_true',
+                        help='validate every dashboard of the snapshot without writing anything')
+    args = parser.parse_args(argv)
+    # Every shard and the merge must agree on one snapshot, LATEST may move while they run
+    if args.merge_shards and not args.snapshot:
+        parser.error('--merge-shards requires --snapshot')
+    if args.shard and not args.snapshot:
+        parser.error('--shard requires --snapshot')
+        
     logger = setup_logger('main')
     
     try:
-        runner = DashboardDeployRunner()
-        if runner.deploy_dashboards():
+        if args.rollback:
+            succeeded = DashboardDeployRunner().rollback()
+        elif args.validate_only:
+            succeeded = DashboardDeployRunner().validate_dashboards(args.snapshot)
+        elif args.merge_shards:
+            succeeded = DashboardDeployRunner().merge_shard_reports(args.merge_shards, args.snapshot)
+        else:
+            succeeded = DashboardDeployRunner(args.shard).deploy_dashboards(args.snapshot)
+        if succeeded:
             logger.info('Dashboard deploy completed successfully')
         else:
             logger.error('Dashboard deploy failed')
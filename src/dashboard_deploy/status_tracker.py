@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from src.common.concurrency import WorkerPool
+
+
+READY_STATUSES = ('CREATION_SUCCESSFUL', 'UPDATE_SUCCESSFUL')
+FAILED_STATUSES = ('CREATION_FAILED', 'UPDATE_FAILED', 'DELETED')
+
+
+class CreationStatusTracker:
+    def __init__(self, quicksight, account_id: str, poll_interval: float = 2.0, max_poll_interval: float = 30.0,
+                 timeout: float = 1800, max_workers: int = 1, logger: Optional[logging.Logger] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.quicksight = quicksight
+        self.account_id = account_id
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max(poll_interval, max_poll_interval)
+        self.timeout = timeout
+        self.worker_pool = WorkerPool(max_workers)
+        self.logger = logger
+        self.clock = clock
+        self._in_flight = {}
+        self._ready = {}
+        self._failed = {}
+        self._interval = poll_interval
+        self._stopping = False
+        self._thread = None
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='dashboard-status-poller', daemon=True)
+        self._thread.start()
+        
+    def track(self, dashboard_id: str, version_number: Optional[int] = None):
+        with self._lock:
+            self._in_flight[dashboard_id] = (version_number, self.clock())
+            self._ready.pop(dashboard_id, None)
+            self._failed.pop(dashboard_id, None)
+            # New work is checked at the base rate again
+            self._interval = self.poll_interval
+            
+    def wait(self) -> Tuple[Dict[str, float], Dict[str, str]]:
+        with self._lock:
+            self._stopping = True
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        else:
+            self._run()
+            
+        with self._lock:
+            return dict(self._ready), dict(self._failed)
+            
+    def poll(self) -> bool:
+        with self._lock:
+            pending = dict(self._in_flight)
+        if not pending:
+            return False
+            
+        # One describe per in-flight dashboard per round, however many submissions happened in between
+        statuses, errors = self.worker_pool.run(
+            lambda dashboard_id: self._describe(dashboard_id, pending[dashboard_id][0]),
+            list(pending),
+            label='dashboard statuses'
+        )
+        for dashboard_id, error in errors.items():
+            if self.logger:
+                self.logger.warning(f'Failed to check the status of dashboard {dashboard_id}: {str(error)}')
+                
+        now = self.clock()
+        finished = False
+        with self._lock:
+            for dashboard_id, (version_number, submitted_at) in pending.items():
+                if self._in_flight.get(dashboard_id) != (version_number, submitted_at):
+                    continue
+                    
+                status, message = statuses.get(dashboard_id, (None, None))
+                if status in READY_STATUSES:
+                    self._ready[dashboard_id] = round(now - submitted_at, 3)
+                elif status in FAILED_STATUSES:
+                    self._failed[dashboard_id] = f'{status}: {message}' if message else status
+                elif now - submitted_at >= self.timeout:
+                    self._failed[dashboard_id] = f'Not ready after {self.timeout:.0f}s, last status {status}'
+                else:
+                    continue
+                    
+                del self._in_flight[dashboard_id]
+                finished = True
+                if self.logger:
+                    outcome = 'ready' if dashboard_id in self._ready else f'failed ({self._failed[dashboard_id]})'
+                    self.logger.info(f'Dashboard {dashboard_id} {outcome} after {now - submitted_at:.1f}s')
+        return finished
+        
+    def _run(self):
+        while True:
+            with self._lock:
+                interval = self._interval
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            
+            finished = self.poll()
+            with self._lock:
+                if self._stopping and not self._in_flight:
+                    return
+                if not finished and self._in_flight:
+                    self._interval = min(self._interval * 2, self.max_poll_interval)
+                    
+    def _describe(self, dashboard_id: str, version_number: Optional[int]) -> Tuple[Optional[str], Optional[str]]:
+        params = {
+            'AwsAccountId': self.account_id,
+            'DashboardId': dashboard_id
+        }
+        if version_number:
+            params['VersionNumber'] = version_number
+            
+        response = self.quicksight.describe_dashboard(**params)
+        version = response.get('Dashboard', {}).get('Version', {})
+        messages = [f"{error.get('Type')}: {error.get('Message')}" for error in version.get('Errors', [])]
+        return version.get('Status'), '; '.join(messages) or None
+
+
+def version_number(version_arn: Optional[str]) -> Optional[int]:
+    if not isinstance(version_arn, str) or '/version/' not in version_arn:
+        return None
+    return int(version_arn.rsplit('/', 1)[-1])
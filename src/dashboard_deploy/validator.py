@@ -1,16 +1,22 @@
-from typing import Dict
+from typing import Dict, Optional
 from src.common.aws_client import AWSClientManager
 from src.common.logger import setup_logger
+from src.dashboard_deploy.dataset_cache import DataSetCache
 
 
 class Validator:
-    def __init__(self, account_id: str = None, region: str = 'ap-northeast-1'):
+    def __init__(self, account_id: str = None, region: str = 'ap-northeast-1',
+                 dataset_cache_ttl: float = 900, role_name: Optional[str] = None):
         self.logger = setup_logger('Validator')
         self.account_id = account_id
         self.region = region
         if account_id:
             self.aws_manager = AWSClientManager(region)
-            self.quicksight = self.aws_manager.get_quicksight_client()
+            if role_name:
+                self.quicksight = self.aws_manager.get_quicksight_client(account_id=account_id, role_name=role_name)
+            else:
+                self.quicksight = self.aws_manager.get_quicksight_client()
+            self.dataset_cache = DataSetCache(self.quicksight, account_id, dataset_cache_ttl)
         
     def validate_json_structure(self, definition: Dict) -> bool:
         if not definition or not isinstance(definition, dict):
@@ -41,13 +47,13 @@ class Validator:
         
         for dataset_id in dataset_ids:
             try:
-                self.quicksight.describe_data_set(
-                    AwsAccountId=self.account_id,
-                    DataSetId=dataset_id
-                )
-                self.logger.info(f'DataSet {dataset_id} exists')
+                exists = self.dataset_cache.exists(dataset_id)
             except Exception as e:
-                self.logger.error(f'DataSet {dataset_id} not found: {str(e)}')
+                self.logger.error(f'DataSet {dataset_id} could not be checked: {str(e)}')
+                return False
+                
+            if not exists:
+                self.logger.error(f'DataSet {dataset_id} not found')
                 return False
                 
         return True
\ No newline at end of file
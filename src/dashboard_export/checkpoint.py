@@ -0,0 +1,61 @@
+import threading
+from typing import Dict, Optional
+
+from src.common.manifest import SnapshotManifest
+from src.common.snapshot_store import CHECKPOINT_FILENAME
+
+
+class ExportCheckpoint:
+    def __init__(self, snapshot_store, timestamp: str, flush_interval: int = 50,
+                 journal: Optional[SnapshotManifest] = None, filename: str = CHECKPOINT_FILENAME):
+        self.snapshot_store = snapshot_store
+        self.timestamp = timestamp
+        self.filename = filename
+        self.flush_interval = max(1, int(flush_interval))
+        self.journal = journal or SnapshotManifest(timestamp)
+        self._pending = 0
+        self._lock = threading.Lock()
+        
+    @classmethod
+    def start(cls, snapshot_store, timestamp: str, flush_interval: int = 50,
+              filename: str = CHECKPOINT_FILENAME) -> 'ExportCheckpoint':
+        checkpoint = cls(snapshot_store, timestamp, flush_interval, filename=filename)
+        # Written before any other object, so a run that dies early still leaves an incomplete snapshot behind
+        checkpoint.flush()
+        return checkpoint
+        
+    @classmethod
+    def resume(cls, snapshot_store, timestamp: str, flush_interval: int = 50,
+               filename: str = CHECKPOINT_FILENAME) -> 'ExportCheckpoint':
+        if snapshot_store.is_complete(timestamp):
+            raise ValueError(f'Snapshot {timestamp} is already complete')
+        journal = snapshot_store.load_checkpoint(timestamp, filename)
+        if journal is None:
+            raise ValueError(f'No checkpoint found for snapshot {timestamp}')
+        return cls(snapshot_store, timestamp, flush_interval, journal, filename)
+        
+    def get(self, dashboard_id: str) -> Optional[Dict]:
+        with self._lock:
+            return self.journal.get_dashboard(dashboard_id)
+            
+    def record(self, entry: Dict):
+        with self._lock:
+            self.journal.add_dashboard(entry)
+            self._pending += 1
+            if self._pending >= self.flush_interval:
+                self._flush()
+                
+    def flush(self):
+        with self._lock:
+            self._flush()
+            
+    def complete(self):
+        self.snapshot_store.mark_complete(self.timestamp)
+        self.discard()
+        
+    def discard(self):
+        self.snapshot_store.delete_file(self.timestamp, self.filename)
+        
+    def _flush(self):
+        self.snapshot_store.write_file(self.timestamp, self.filename, self.journal.to_json())
+        self._pending = 0
@@ -22,6 +22,10 @@ class CSVGenerator:
         
         headers = ['package_id', 'dashboard_id', 'dashboard_name', 'label', 
                   'order', 'category', 'tags', 'description']
+        # Only folder exports know where a dashboard lives, other exports keep the original columns
+        with_folder = any('FolderPath' in dashboard for dashboard in dashboards)
+        if with_folder:
+            headers.append('folder_path')
         writer.writerow(headers)
         
         for dashboard in dashboards:
@@ -35,6 +39,8 @@ class CSVGenerator:
                 '',  
                 ''   
             ]
+            if with_folder:
+                row.append(dashboard.get('FolderPath') or '')
             writer.writerow(row)
             
         return output.getvalue()
\ No newline at end of file
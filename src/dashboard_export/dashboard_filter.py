@@ -0,0 +1,86 @@
+import fnmatch
+import re
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+
+class DashboardFilter:
+    def __init__(self, name_pattern: Optional[str] = None, updated_since: Optional[datetime] = None,
+                 folder_arn: Optional[str] = None, dashboard_ids: Optional[List[str]] = None):
+        self.name_pattern = name_pattern or None
+        self.updated_since = _as_utc(updated_since) if updated_since else None
+        self.folder_arn = folder_arn or None
+        self.dashboard_ids = list(dashboard_ids) if dashboard_ids else None
+        
+    @classmethod
+    def from_config(cls, config) -> Optional['DashboardFilter']:
+        updated_since = config.get('EXPORT_FILTER_UPDATED_SINCE')
+        dashboard_ids = config.get('EXPORT_FILTER_DASHBOARD_IDS') or ''
+        dashboard_filter = cls(
+            name_pattern=config.get('EXPORT_FILTER_NAME'),
+            updated_since=datetime.fromisoformat(updated_since) if updated_since else None,
+            folder_arn=config.get('EXPORT_FILTER_FOLDER_ARN'),
+            dashboard_ids=[value.strip() for value in dashboard_ids.split(',') if value.strip()]
+        )
+        return dashboard_filter if dashboard_filter.is_active() else None
+        
+    def is_active(self) -> bool:
+        return any([self.name_pattern, self.updated_since, self.folder_arn, self.dashboard_ids])
+        
+    @property
+    def folder_id(self) -> Optional[str]:
+        return self.folder_arn.split('/')[-1] if self.folder_arn else None
+        
+    def search_filters(self) -> Optional[List[Dict]]:
+        if not self.name_pattern:
+            return None
+            
+        # search_dashboards takes a single substring filter, the full wildcard pattern is checked in matches
+        literal = max(re.split(r'[*?\[\]]', self.name_pattern), key=len)
+        if not literal:
+            return None
+        return [{
+            'Operator': 'StringLike',
+            'Name': 'DASHBOARD_NAME',
+            'Value': literal
+        }]
+        
+    def matches(self, summary: Dict) -> bool:
+        if self.dashboard_ids and summary['DashboardId'] not in self.dashboard_ids:
+            return False
+            
+        if self.name_pattern and not fnmatch.fnmatchcase(
+            (summary.get('Name') or '').lower(), self._wildcard_pattern().lower()
+        ):
+            return False
+            
+        if self.updated_since:
+            last_updated = summary.get('LastUpdatedTime')
+            if not isinstance(last_updated, datetime) or _as_utc(last_updated) < self.updated_since:
+                return False
+                
+        return True
+        
+    def describe(self) -> str:
+        parts = []
+        if self.name_pattern:
+            parts.append(f'name "{self.name_pattern}"')
+        if self.updated_since:
+            parts.append(f'updated since {self.updated_since.isoformat()}')
+        if self.folder_arn:
+            parts.append(f'folder {self.folder_arn}')
+        if self.dashboard_ids:
+            parts.append(f'{len(self.dashboard_ids)} dashboard IDs')
+        return ', '.join(parts)
+        
+    def _wildcard_pattern(self) -> str:
+        # A pattern without wildcards means "name contains", as in the console search box
+        if any(char in self.name_pattern for char in '*?['):
+            return self.name_pattern
+        return f'*{self.name_pattern}*'
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,135 @@
+import json
+import logging
+from typing import Callable, Dict, List, Optional
+
+from src.common.concurrency import WorkerPool
+
+
+DEPENDENCY_FOLDERS = {
+    'DataSets': 'datasets',
+    'DataSources': 'datasources',
+    'Themes': 'themes'
+}
+
+
+def arn_to_id(arn: str) -> str:
+    return arn.split('/')[-1]
+
+
+def extract_dependencies(definition: Dict, theme_arn: Optional[str] = None) -> Dict:
+    dataset_ids = {
+        arn_to_id(declaration['DataSetArn'])
+        for declaration in definition.get('DataSetIdentifierDeclarations', [])
+        if declaration.get('DataSetArn')
+    }
+    return {
+        'DataSets': sorted(dataset_ids),
+        'Theme': arn_to_id(theme_arn) if theme_arn and not _is_builtin_theme(theme_arn) else None
+    }
+
+
+def merge_graphs(graphs: List[Dict]) -> Optional[Dict]:
+    graphs = [graph for graph in graphs if graph]
+    if not graphs:
+        return None
+        
+    merged = {'Dashboards': {}, 'DataSets': {}, 'DataSources': [], 'Themes': []}
+    for graph in graphs:
+        merged['Dashboards'].update(graph.get('Dashboards', {}))
+        merged['DataSets'].update(graph.get('DataSets', {}))
+    for kind in ('DataSources', 'Themes'):
+        merged[kind] = sorted({asset_id for graph in graphs for asset_id in graph.get(kind, [])})
+    return merged
+
+
+class DependencyExporter:
+    def __init__(self, quicksight_client, write_file: Callable[[str, Dict], None],
+                 worker_pool: WorkerPool, logger: Optional[logging.Logger] = None):
+        self.quicksight_client = quicksight_client
+        self.write_file = write_file
+        self.worker_pool = worker_pool
+        self.logger = logger
+        
+    def export(self, dashboard_entries: Dict[str, Dict]) -> Dict:
+        dashboards = {
+            dashboard_id: entry['Dependencies']
+            for dashboard_id, entry in dashboard_entries.items()
+            if entry.get('Dependencies')
+        }
+        
+        # Every asset is fetched once per snapshot, however many dashboards share it
+        datasets = {}
+        pending = sorted({dataset_id for refs in dashboards.values() for dataset_id in refs['DataSets']})
+        while pending:
+            datasets.update(self._run(self._export_data_set, pending, 'datasets'))
+            # Datasets built on other datasets pull their parents in on the next round
+            pending = sorted({
+                parent_id for refs in datasets.values() for parent_id in refs['DataSets']
+            } - set(datasets))
+            
+        data_source_ids = sorted({
+            data_source_id for refs in datasets.values() for data_source_id in refs['DataSources']
+        })
+        self._run(self._export_data_source, data_source_ids, 'data sources')
+        
+        theme_ids = sorted({refs['Theme'] for refs in dashboards.values() if refs.get('Theme')})
+        self._run(self._export_theme, theme_ids, 'themes')
+        
+        if self.logger:
+            self.logger.info(
+                f'Exported {len(datasets)} datasets, {len(data_source_ids)} data sources and '
+                f'{len(theme_ids)} themes referenced by {len(dashboards)} dashboards'
+            )
+        return {
+            'Dashboards': dashboards,
+            'DataSets': datasets,
+            'DataSources': data_source_ids,
+            'Themes': theme_ids
+        }
+        
+    def _run(self, func: Callable[[str], Dict], items: List[str], label: str) -> Dict:
+        results, errors = self.worker_pool.run(func, items, label=label)
+        if errors:
+            failed_ids = ', '.join(sorted(errors))
+            raise RuntimeError(f'Failed to export {len(errors)} of {len(items)} {label}: {failed_ids}')
+        return results
+        
+    def _export_data_set(self, dataset_id: str) -> Dict:
+        data_set = self.quicksight_client.get_data_set(dataset_id)
+        self._store('DataSets', dataset_id, data_set)
+        
+        data_source_ids = set()
+        for table in data_set.get('PhysicalTableMap', {}).values():
+            for source in table.values():
+                if isinstance(source, dict) and source.get('DataSourceArn'):
+                    data_source_ids.add(arn_to_id(source['DataSourceArn']))
+                    
+        parent_ids = set()
+        for table in data_set.get('LogicalTableMap', {}).values():
+            parent_arn = table.get('Source', {}).get('DataSetArn')
+            if parent_arn:
+                parent_ids.add(arn_to_id(parent_arn))
+                
+        return {
+            'DataSources': sorted(data_source_ids),
+            'DataSets': sorted(parent_ids - {dataset_id})
+        }
+        
+    def _export_data_source(self, data_source_id: str) -> Dict:
+        data_source = self.quicksight_client.get_data_source(data_source_id)
+        self._store('DataSources', data_source_id, data_source)
+        return {}
+        
+    def _export_theme(self, theme_id: str) -> Dict:
+        theme = self.quicksight_client.get_theme(theme_id)
+        self._store('Themes', theme_id, theme)
+        return {}
+        
+    def _store(self, kind: str, asset_id: str, asset: Dict):
+        # describe_* responses carry datetimes, which the JSON encoders do not accept
+        self.write_file(f'{DEPENDENCY_FOLDERS[kind]}/{asset_id}.json', json.loads(json.dumps(asset, default=str)))
+
+
+def _is_builtin_theme(theme_arn: str) -> bool:
+    parts = theme_arn.split(':')
+    return len(parts) > 4 and parts[4] == 'aws'
@@ -0,0 +1,177 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.common.concurrency import WorkerPool
+
+
+class FolderIndex:
+    def __init__(self, quicksight, account_id: str, cache_path: Optional[str] = None,
+                 ttl_seconds: float = 3600, max_workers: int = 1,
+                 clock: Callable[[], float] = time.time):
+        self.quicksight = quicksight
+        self.account_id = account_id
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.worker_pool = WorkerPool(max_workers)
+        self.clock = clock
+        self._folders = None
+        self._paths = {}
+        self._folder_paths = {}
+        self._from_cache = False
+        self._lock = threading.Lock()
+        
+    def resolve(self, folder_path: str) -> Optional[str]:
+        path = normalize_path(folder_path)
+        with self._lock:
+            if self._folders is None:
+                self._load()
+                
+            folder_id = self._paths.get(path)
+            if folder_id is None and self._from_cache:
+                # The folder may have been created after the cache was written
+                self._refresh()
+                folder_id = self._paths.get(path)
+        return folder_id
+        
+    def ensure_fresh(self):
+        with self._lock:
+            # A subtree walk cannot tell a missing subfolder from one created after the cache was written
+            if self._folders is None or self._from_cache:
+                self._refresh()
+                
+    def get_path(self, folder_id: str) -> Optional[str]:
+        with self._lock:
+            if self._folders is None:
+                self._load()
+            return self._folder_paths.get(folder_id)
+            
+    def children(self, folder_id: str) -> List[str]:
+        with self._lock:
+            if self._folders is None:
+                self._load()
+            parent = self._folders.get(folder_id)
+            if not parent:
+                return []
+            return sorted(
+                child_id for child_id, folder in self._folders.items()
+                if folder.get('ParentArn') == parent['Arn']
+            )
+            
+    def _load(self):
+        folders = self._read_cache()
+        if folders is None:
+            self._refresh()
+        else:
+            self._set_folders(folders, from_cache=True)
+            
+    def _refresh(self):
+        folders = self._list_folders()
+        self._set_folders(folders, from_cache=False)
+        self._write_cache(folders)
+        
+    def _set_folders(self, folders: Dict[str, Dict], from_cache: bool):
+        self._folders = folders
+        self._paths = build_paths(folders)
+        self._folder_paths = {folder_id: path for path, folder_id in self._paths.items()}
+        self._from_cache = from_cache
+        
+    def _list_folders(self) -> Dict[str, Dict]:
+        folders = {}
+        next_token = None
+        
+        while True:
+            params = {
+                'AwsAccountId': self.account_id,
+                'MaxResults': 100
+            }
+            
+            if next_token:
+                params['NextToken'] = next_token
+                
+            response = self.quicksight.list_folders(**params)
+            for summary in response.get('FolderSummaryList', []):
+                folders[summary['FolderId']] = {
+                    'Arn': summary.get('Arn'),
+                    'Name': summary.get('Name')
+                }
+                
+            next_token = response.get('NextToken')
+            if not next_token:
+                break
+                
+        # list_folders carries no hierarchy, the parent comes from the ancestor ARNs in describe_folder
+        parents, errors = self.worker_pool.run(self._describe_parent, list(folders), label='folders')
+        if errors:
+            failed_ids = ', '.join(sorted(errors))
+            raise RuntimeError(f'Failed to describe {len(errors)} of {len(folders)} folders: {failed_ids}')
+            
+        for folder_id, parent_arn in parents.items():
+            folders[folder_id]['ParentArn'] = parent_arn
+        return folders
+        
+    def _describe_parent(self, folder_id: str) -> Optional[str]:
+        response = self.quicksight.describe_folder(
+            AwsAccountId=self.account_id,
+            FolderId=folder_id
+        )
+        ancestors = response.get('Folder', {}).get('FolderPath') or []
+        return ancestors[-1] if ancestors else None
+        
+    def _read_cache(self) -> Optional[Dict[str, Dict]]:
+        if not self.cache_path or self.ttl_seconds <= 0 or not os.path.exists(self.cache_path):
+            return None
+            
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+            
+        if data.get('AwsAccountId') != self.account_id:
+            return None
+        if self.clock() - data.get('CreatedAt', 0) >= self.ttl_seconds:
+            return None
+        return data.get('Folders')
+        
+    def _write_cache(self, folders: Dict[str, Dict]):
+        if not self.cache_path or self.ttl_seconds <= 0:
+            return
+            
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        os.makedirs(directory, exist_ok=True)
+        data = {
+            'AwsAccountId': self.account_id,
+            'CreatedAt': self.clock(),
+            'Folders': folders
+        }
+        # Write next to the target and rename, so a concurrent reader never sees half a file
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.cache_path)
+
+
+def normalize_path(folder_path: str) -> str:
+    return '/'.join(segment for segment in folder_path.split('/') if segment)
+
+
+def build_paths(folders: Dict[str, Dict]) -> Dict[str, str]:
+    ids_by_arn = {folder['Arn']: folder_id for folder_id, folder in folders.items()}
+    paths = {}
+    
+    for folder_id in folders:
+        names = []
+        current = folder_id
+        seen = set()
+        while current and current not in seen:
+            seen.add(current)
+            folder = folders[current]
+            names.append(folder.get('Name') or current)
+            current = ids_by_arn.get(folder.get('ParentArn'))
+        paths['/'.join(reversed(names))] = folder_id
+        
+    return paths
@@ -1,17 +1,27 @@
-import json
+import argparse
 import sys
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
 
+from src.common.asset_bundle import ENGINE_ASSET_BUNDLE, AssetBundleJobRunner, validate_engine
 from src.common.aws_client import AWSClientManager
+from src.common.concurrency import WorkerPool
 from src.common.config import Config
 from src.common.logger import setup_logger
+from src.common.manifest import MANIFEST_FILENAME, SnapshotManifest, content_hash
+from src.common.snapshot_bundle import BUNDLE_FILENAME
+from src.common.sharding import Shard
+from src.common.snapshot_format import encode_definition, validate_format
+from src.common.snapshot_store import CHECKPOINT_FILENAME, SnapshotStore
+from src.dashboard_export.checkpoint import ExportCheckpoint
+from src.dashboard_export.dashboard_filter import DashboardFilter
+from src.dashboard_export.dependency_exporter import DependencyExporter, extract_dependencies, merge_graphs
 from src.dashboard_export.quicksight_client import QuickSightClient
 from src.dashboard_export.csv_generator import CSVGenerator
 
 
 class DashboardExporter:
-    def __init__(self):
+    def __init__(self, shard: Optional[Shard] = None):
         self.config = Config('.env.dev2')
         self.logger = setup_logger('DashboardExporter')
         
@@ -21,57 +31,368 @@ class DashboardExporter:
         self.s3_bucket = self.config.get_required('EXPORT_DASHBOARD_S3_BUCKET')
         self.s3_prefix = self.config.get_required('EXPORT_DASHBOARD_S3_PREFIX')
         self.folder_path = self.config.get('QUICKSIGHT_FOLDER_PATH')
-        
-        self.aws_manager = AWSClientManager(self.region)
+        self.max_workers = int(self.config.get('EXPORT_MAX_WORKERS', '1'))
+        self.incremental = self.config.get('EXPORT_INCREMENTAL', 'false').lower() == 'true'
+        self.snapshot_format = validate_format(self.config.get('EXPORT_SNAPSHOT_FORMAT', 'pretty'))
+        self.bundle = self.config.get('EXPORT_BUNDLE', 'false').lower() == 'true'
+        self.bundle_part_size = int(self.config.get('EXPORT_BUNDLE_PART_SIZE_MB', '8')) * 1024 * 1024
+        self.folder_cache_path = self.config.get(
+            'QUICKSIGHT_FOLDER_CACHE_PATH', f'.cache/quicksight_folders_{self.account_id}_{self.region}.json'
+        )
+        self.folder_cache_ttl = float(self.config.get('QUICKSIGHT_FOLDER_CACHE_TTL_SECONDS', '3600'))
+        self.folder_recursive = self.config.get('QUICKSIGHT_FOLDER_RECURSIVE', 'false').lower() == 'true'
+        self.dashboard_filter = DashboardFilter.from_config(self.config)
+        self.checkpoint_interval = int(self.config.get('EXPORT_CHECKPOINT_INTERVAL', '50'))
+        self.export_dependencies = self.config.get('EXPORT_DEPENDENCIES', 'false').lower() == 'true'
+        self.engine = validate_engine(self.config.get('EXPORT_ENGINE', 'api'))
+        self.shard = shard
+        if self.shard and self.bundle:
+            raise ValueError('Sharded exports cannot be bundled, every shard would write its own archive')
+            
+        AWSClientManager.configure(
+            retry_mode=self.config.get('AWS_RETRY_MODE', 'standard'),
+            max_attempts=self.config.get('AWS_MAX_ATTEMPTS'),
+            rate_limit=self.config.get('QUICKSIGHT_RATE_LIMIT'),
+            max_rate_limit=self.config.get('QUICKSIGHT_MAX_RATE_LIMIT')
+        )
+        self.aws_manager = AWSClientManager(self.region, self.max_workers)
         self.s3_client = self.aws_manager.get_s3_client()
+        self.snapshot_store = SnapshotStore(self.s3_client, self.s3_bucket, self.s3_prefix)
         self.quicksight_client = QuickSightClient(
-            self.account_id, self.namespace, self.region, self.folder_path
+            self.account_id, self.namespace, self.region, self.folder_path, self.max_workers,
+            self.folder_cache_path, self.folder_cache_ttl, self.folder_recursive
         )
         self.csv_generator = CSVGenerator()
+        self.worker_pool = WorkerPool(self.max_workers, self.logger)
+        self.bundle_writer = None
+        self.checkpoint = None
+        self.prefetched_definitions = {}
+        
+    def export_dashboards(self, resume_timestamp: Optional[str] = None, timestamp: Optional[str] = None) -> str:
+        shard_info = f' (shard {self.shard})' if self.shard else ''
+        checkpoint_filename = self.shard.filename(CHECKPOINT_FILENAME) if self.shard else CHECKPOINT_FILENAME
+        if resume_timestamp:
+            if self.bundle:
+                raise ValueError('Bundle exports cannot be resumed, run a new export instead')
+            timestamp = resume_timestamp
+            self.checkpoint = ExportCheckpoint.resume(
+                self.snapshot_store, timestamp, self.checkpoint_interval, checkpoint_filename
+            )
+            self.logger.info(
+                f'Resuming dashboard export {timestamp}{shard_info} with '
+                f'{len(self.checkpoint.journal.dashboards)} dashboards already exported'
+            )
+        else:
+            if self.shard and not timestamp:
+                raise ValueError('Sharded exports need a timestamp shared by every shard')
+            timestamp = timestamp or datetime.now().strftime('%Y%m%d%H%M%S')
+            self.logger.info(f'Starting dashboard export with timestamp: {timestamp}{shard_info}')
+            if self.shard:
+                # Marks the snapshot as in progress until the merge, whichever shard gets there first
+                self.snapshot_store.write_file(timestamp, CHECKPOINT_FILENAME, SnapshotManifest(timestamp).to_json())
+            self.checkpoint = ExportCheckpoint.start(
+                self.snapshot_store, timestamp, self.checkpoint_interval, checkpoint_filename
+            )
+            
+        try:
+            self._export_snapshot(timestamp)
+        except Exception:
+            try:
+                self.checkpoint.flush()
+            except Exception as e:
+                self.logger.warning(f'Failed to save checkpoint for {timestamp}: {str(e)}')
+            self.logger.error(f'Export {timestamp} is incomplete, continue it with --resume {timestamp}')
+            raise
+            
+        if self.shard:
+            self.checkpoint.discard()
+            self.checkpoint = None
+            self.logger.info(
+                f'Shard {self.shard} of export {timestamp} completed, '
+                f'combine the shards with --merge-shards {self.shard.count} --timestamp {timestamp}'
+            )
+            return timestamp
+            
+        self.checkpoint.complete()
+        self.checkpoint = None
+        self._update_latest_pointer(timestamp, self.dashboard_filter.describe() if self.dashboard_filter else None)
+        
+        self.logger.info('Dashboard export completed')
+        return timestamp
         
-    def export_dashboards(self) -> str:
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        self.logger.info(f'Starting dashboard export with timestamp: {timestamp}')
+    def merge_shards(self, timestamp: str, shard_count: int) -> str:
+        shards = [Shard(index, shard_count) for index in range(1, shard_count + 1)]
+        manifests = {}
+        for shard in shards:
+            content = self.snapshot_store.read_file(timestamp, shard.filename(MANIFEST_FILENAME))
+            if content is not None:
+                manifests[shard.index] = SnapshotManifest.from_json(content.decode('utf-8'))
+                
+        missing = [str(shard) for shard in shards if shard.index not in manifests]
+        if missing:
+            raise RuntimeError(f'Cannot merge export {timestamp}, shards not finished: {", ".join(missing)}')
+            
+        manifest = SnapshotManifest(timestamp)
+        for partial in manifests.values():
+            for entry in partial.dashboards.values():
+                manifest.add_dashboard(entry)
+        manifest.dependencies = merge_graphs([partial.dependencies for partial in manifests.values()])
+        manifest.dashboard_filter = next(
+            (partial.dashboard_filter for partial in manifests.values() if partial.dashboard_filter), None
+        )
+        
+        # Manifest entries carry the ID, name and folder path the CSV files are built from
+        self._write_csv_files([manifest.dashboards[key] for key in sorted(manifest.dashboards)], manifest, timestamp)
+        self._save_to_s3(MANIFEST_FILENAME, manifest.to_json(), timestamp)
+        
+        ExportCheckpoint(self.snapshot_store, timestamp).complete()
+        self._update_latest_pointer(timestamp, manifest.dashboard_filter)
+        
+        self.logger.info(f'Merged {shard_count} shards with {len(manifest.dashboards)} dashboards into export {timestamp}')
+        return timestamp
         
-        dashboards = self.quicksight_client.list_dashboards()
+    def _update_latest_pointer(self, timestamp: str, dashboard_filter: Optional[str]):
+        if dashboard_filter:
+            # A filtered export holds only part of the release, tools following LATEST must not take it for the whole
+            self.logger.info(
+                f'Export {timestamp} is filtered by {dashboard_filter}, LATEST is left unchanged. '
+                f'Pass --snapshot {timestamp} to deploy it'
+            )
+            return
+        if not self.snapshot_store.update_latest_pointer(timestamp):
+            self.logger.info(f'LATEST already points to a newer export, export {timestamp} does not replace it')
+        
+    def _export_snapshot(self, timestamp: str):
+        dashboards = self.quicksight_client.list_dashboards(self.dashboard_filter)
         folder_info = f' in folder "{self.folder_path}"' if self.folder_path else ''
+        if self.folder_path and self.folder_recursive:
+            folder_info += ' and its subfolders'
+        if self.dashboard_filter:
+            folder_info += f' matching {self.dashboard_filter.describe()}'
         self.logger.info(f'Found {len(dashboards)} dashboards{folder_info}')
         
-        for dashboard in dashboards:
-            dashboard_id = dashboard['DashboardId']
-            self.logger.info(f'Exporting dashboard: {dashboard_id}')
+        if self.shard:
+            dashboards = [dashboard for dashboard in dashboards if self.shard.contains(dashboard['DashboardId'])]
+            self.logger.info(f'Shard {self.shard} exports {len(dashboards)} of them')
+            
+        previous_manifest = self._load_previous_manifest(timestamp) if self.incremental else None
+        summaries = {dashboard['DashboardId']: dashboard for dashboard in dashboards}
+        
+        if self.engine == ENGINE_ASSET_BUNDLE:
+            self.prefetched_definitions = self._prefetch_definitions(summaries, previous_manifest)
             
-            definition = self.quicksight_client.get_dashboard_definition(dashboard_id)
+        if self.bundle:
+            self.bundle_writer = self.snapshot_store.create_bundle(timestamp, self.bundle_part_size)
             
-            filename = f'dashboards/{dashboard_id}.json'
-            self._save_to_s3(filename, json.dumps(definition, indent=2), timestamp)
+        try:
+            results, errors = self.worker_pool.run(
+                lambda dashboard_id: self._export_dashboard(
+                    summaries[dashboard_id], timestamp, previous_manifest
+                ),
+                list(summaries),
+                label='dashboards'
+            )
+            if errors:
+                failed_ids = ', '.join(sorted(errors))
+                raise RuntimeError(
+                    f'Failed to export {len(errors)} of {len(summaries)} dashboards: {failed_ids}'
+                )
+                
+            manifest = SnapshotManifest(timestamp)
+            for entry in results.values():
+                manifest.add_dashboard(entry)
+            if self.dashboard_filter:
+                manifest.dashboard_filter = self.dashboard_filter.describe()
+                
+            if self.export_dependencies:
+                manifest.dependencies = DependencyExporter(
+                    self.quicksight_client,
+                    lambda filename, asset: self._write_asset(filename, asset, timestamp),
+                    self.worker_pool,
+                    self.logger
+                ).export(results)
+                
+            # Shards leave the CSV files to the merge, which sees every dashboard
+            if not self.shard:
+                self._write_csv_files(dashboards, manifest, timestamp)
+                
+            if self.bundle_writer:
+                members = self.bundle_writer.close()
+                manifest.bundle = {'Filename': BUNDLE_FILENAME, 'Members': members}
+                self.logger.info(f'Bundled {len(members)} files into {BUNDLE_FILENAME}')
+        except Exception:
+            if self.bundle_writer:
+                self.bundle_writer.abort()
+            raise
+        finally:
+            self.bundle_writer = None
+            self.prefetched_definitions = {}
             
-        packages_csv = self.csv_generator.generate_packages_csv(dashboards)
-        self._save_to_s3('packages.csv', packages_csv, timestamp)
+        manifest_filename = self.shard.filename(MANIFEST_FILENAME) if self.shard else MANIFEST_FILENAME
+        self._save_to_s3(manifest_filename, manifest.to_json(), timestamp)
         
-        dashboards_csv = self.csv_generator.generate_dashboards_csv(dashboards)
-        self._save_to_s3('dashboards.csv', dashboards_csv, timestamp)
+    def _write_csv_files(self, dashboards: List[Dict], manifest: SnapshotManifest, timestamp: str):
+        packages_csv = self.csv_generator.generate_packages_csv(dashboards).encode('utf-8')
+        self._write_file('packages.csv', packages_csv, timestamp)
+        manifest.add_file('packages.csv', packages_csv)
         
-        self.logger.info('Dashboard export completed')
-        return timestamp
+        dashboards_csv = self.csv_generator.generate_dashboards_csv(dashboards).encode('utf-8')
+        self._write_file('dashboards.csv', dashboards_csv, timestamp)
+        manifest.add_file('dashboards.csv', dashboards_csv)
         
-    def _save_to_s3(self, filename: str, content: str, timestamp: str):
+    def _load_previous_manifest(self, timestamp: str) -> Optional[SnapshotManifest]:
+        previous_manifest = self.snapshot_store.find_previous_manifest(timestamp)
+        if previous_manifest:
+            self.logger.info(f'Incremental export based on snapshot {previous_manifest.timestamp}')
+        else:
+            self.logger.info('No previous snapshot manifest found, exporting all dashboards')
+        return previous_manifest
+        
+    def _prefetch_definitions(self, summaries: Dict[str, Dict],
+                              previous_manifest: Optional[SnapshotManifest] = None) -> Dict[str, Dict]:
+        dashboard_arns = {
+            dashboard_id: summary.get('Arn') or
+                f'arn:aws:quicksight:{self.region}:{self.account_id}:dashboard/{dashboard_id}'
+            for dashboard_id, summary in summaries.items()
+            if not self._checkpoint_entry(summary) and not self._unchanged_entry(summary, previous_manifest)
+        }
+        if not dashboard_arns:
+            return {}
+            
+        self.logger.info(f'Exporting {len(dashboard_arns)} dashboard definitions through asset bundle jobs')
+        runner = AssetBundleJobRunner.from_config(
+            self.quicksight_client.quicksight, self.account_id, self.config, self.logger
+        )
+        definitions, errors = runner.export_dashboards(dashboard_arns)
+        if errors:
+            failed_ids = ', '.join(sorted(errors))
+            raise RuntimeError(
+                f'Failed to export {len(errors)} of {len(dashboard_arns)} dashboards through asset bundle jobs: {failed_ids}'
+            )
+        return definitions
+        
+    def _checkpoint_entry(self, summary: Dict) -> Optional[Dict]:
+        checkpoint_entry = self.checkpoint.get(summary['DashboardId']) if self.checkpoint is not None else None
+        if checkpoint_entry and self._has_dependencies(checkpoint_entry) and (
+            SnapshotManifest.is_unchanged(checkpoint_entry, summary) or summary.get('PublishedVersionNumber') is None
+        ):
+            return checkpoint_entry
+        return None
+        
+    def _unchanged_entry(self, summary: Dict, previous_manifest: Optional[SnapshotManifest]) -> Optional[Dict]:
+        previous_entry = previous_manifest.get_dashboard(summary['DashboardId']) if previous_manifest else None
+        if previous_entry and self._has_dependencies(previous_entry) and \
+                SnapshotManifest.is_unchanged(previous_entry, summary):
+            return previous_entry
+        return None
+        
+    def _export_dashboard(self, summary: Dict, timestamp: str,
+                          previous_manifest: Optional[SnapshotManifest] = None) -> Dict:
+        dashboard_id = summary['DashboardId']
+        
+        checkpoint_entry = self._checkpoint_entry(summary)
+        if checkpoint_entry:
+            self.logger.info(f'Dashboard {dashboard_id} already exported before the interruption, skipping')
+            return checkpoint_entry
+            
+        entry = self._export_dashboard_file(summary, timestamp, previous_manifest)
+        # Bundle members only reach S3 when the archive is closed, so they cannot be checkpointed
+        if self.checkpoint is not None and not self.bundle_writer:
+            self.checkpoint.record(entry)
+        return entry
+        
+    def _export_dashboard_file(self, summary: Dict, timestamp: str,
+                               previous_manifest: Optional[SnapshotManifest] = None) -> Dict:
+        dashboard_id = summary['DashboardId']
+        filename = f'dashboards/{dashboard_id}.json'
+        
+        previous_entry = self._unchanged_entry(summary, previous_manifest)
+        if previous_entry:
+            self.logger.info(f'Dashboard {dashboard_id} unchanged, copying from {previous_manifest.timestamp}')
+            if self.bundle_writer or previous_manifest.bundle:
+                content, content_encoding = self.snapshot_store.read_snapshot_file(previous_manifest, filename)
+                self._write_file(filename, content, timestamp, content_encoding)
+            else:
+                self.snapshot_store.copy_file(previous_manifest.timestamp, timestamp, filename)
+            if summary.get('FolderPath'):
+                return dict(previous_entry, FolderPath=summary['FolderPath'])
+            return previous_entry
+            
+        self.logger.info(f'Exporting dashboard: {dashboard_id}')
+        
+        response = self._describe_definition(dashboard_id)
+        definition = response['Definition']
+        content, content_encoding = encode_definition(definition, self.snapshot_format)
+        self._write_file(filename, content, timestamp, content_encoding)
+        entry = SnapshotManifest.build_entry(
+            summary, timestamp, content_hash(definition), len(content)
+        )
+        if self.export_dependencies:
+            entry['Dependencies'] = extract_dependencies(definition, response.get('ThemeArn'))
+        return entry
+        
+    def _describe_definition(self, dashboard_id: str) -> Dict:
+        prefetched = self.prefetched_definitions.get(dashboard_id)
+        if prefetched:
+            return prefetched
+        if self.export_dependencies:
+            return self.quicksight_client.describe_dashboard_definition(dashboard_id)
+        return {'Definition': self.quicksight_client.get_dashboard_definition(dashboard_id)}
+        
+    def _has_dependencies(self, entry: Dict) -> bool:
+        # Entries written without dependency export cannot feed the graph, so those dashboards are fetched again
+        return not self.export_dependencies or 'Dependencies' in entry
+        
+    def _write_asset(self, filename: str, asset: Dict, timestamp: str):
+        content, content_encoding = encode_definition(asset, self.snapshot_format)
+        self._write_file(filename, content, timestamp, content_encoding)
+        
+    def _write_file(self, filename: str, content: bytes, timestamp: str,
+                    content_encoding: Optional[str] = None):
+        if self.bundle_writer:
+            self.bundle_writer.add(filename, content, content_encoding)
+        else:
+            self._save_to_s3(filename, content, timestamp, content_encoding)
+            
+    def _save_to_s3(self, filename: str, content: Union[str, bytes], timestamp: str,
+                    content_encoding: Optional[str] = None):
         key = f'{self.s3_prefix}{timestamp}/{filename}'
         self.logger.info(f'Saving to S3: s3://{self.s3_bucket}/{key}')
         
-        self.s3_client.put_object(
-            Bucket=self.s3_bucket,
-            Key=key,
-            Body=content
-        )
+        params = {
+            'Bucket': self.s3_bucket,
+            'Key': key,
+            'Body': content
+        }
+        if content_encoding:
+            params['ContentType'] = 'application/json'
+            params['ContentEncoding'] = content_encoding
+            
+        self.s3_client.put_object(**params)
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Export QuickSight dashboard definitions to S3')
+    parser.add_argument('--resume', metavar='TIMESTAMP', help='continue an interrupted export snapshot')
+    parser.add_argument('--timestamp', help='snapshot timestamp to write, shared by every shard of one export')
+    parser.add_argument('--shard', type=Shard.parse, metavar='INDEX/COUNT',
+                        help='export only the dashboards of one shard, e.g. 1/4')
+    parser.add_argument('--merge-shards', type=int, metavar='COUNT',
+                        help='combine the finished shards of the --timestamp export into one snapshot')
+    args = parser.parse_args(argv)
+    if args.merge_shards and not args.timestamp:
+        parser.error('--merge-shards requires --timestamp')
+    if args.shard and not (args.timestamp or args.resume):
+        parser.error('--shard requires --timestamp or --resume')
+        
     logger = setup_logger('main')
     
     try:
-        exporter = DashboardExporter()
-        exporter.export_dashboards()
+        if args.merge_shards:
+            DashboardExporter().merge_shards(args.timestamp, args.merge_shards)
+        else:
+            exporter = DashboardExporter(args.shard)
+            exporter.export_dashboards(args.resume, args.timestamp)
         logger.info('Dashboard export completed successfully')
     except Exception as e:
         logger.error(f'Dashboard export failed: {str(e)}')
@@ -1,21 +1,46 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from src.common.aws_client import AWSClientManager
+from src.common.concurrency import WorkerPool
+from src.dashboard_export.dashboard_filter import DashboardFilter
+from src.dashboard_export.folder_index import FolderIndex
 
 
 class QuickSightClient:
-    def __init__(self, account_id: str, namespace: str, region: str, folder_path: str = None):
+    def __init__(self, account_id: str, namespace: str, region: str, folder_path: str = None,
+                 max_pool_connections: int = None, folder_cache_path: Optional[str] = None,
+                 folder_cache_ttl: float = 3600, recursive: bool = False):
         self.account_id = account_id
         self.namespace = namespace
         self.region = region
         self.folder_path = folder_path
-        self.aws_manager = AWSClientManager(region)
+        self.recursive = recursive
+        self.aws_manager = AWSClientManager(region, max_pool_connections)
         self.quicksight = self.aws_manager.get_quicksight_client()
+        self.folder_index = FolderIndex(
+            self.quicksight, account_id, folder_cache_path, folder_cache_ttl, max_pool_connections or 1
+        )
+        self.worker_pool = WorkerPool(max_pool_connections or 1)
         
-    def list_dashboards(self) -> List[Dict]:
-        if self.folder_path:
-            return self._list_dashboards_from_folder()
+    def list_dashboards(self, dashboard_filter: Optional[DashboardFilter] = None) -> List[Dict]:
+        if not dashboard_filter:
+            if self.folder_path:
+                return self._list_dashboards_from_folder()
+            else:
+                return self._list_all_dashboards()
+                
+        # Narrow the listing on the server side first, then apply whatever filters remain locally
+        if dashboard_filter.folder_id:
+            dashboards = self._list_dashboards_from_folder(dashboard_filter.folder_id)
+        elif self.folder_path:
+            dashboards = self._list_dashboards_from_folder()
+        elif dashboard_filter.dashboard_ids:
+            dashboards = self._describe_dashboards(dashboard_filter.dashboard_ids)
+        elif dashboard_filter.search_filters():
+            dashboards = self._search_dashboards(dashboard_filter.search_filters())
         else:
-            return self._list_all_dashboards()
+            dashboards = self._list_all_dashboards()
+            
+        return [dashboard for dashboard in dashboards if dashboard_filter.matches(dashboard)]
     
     def _list_all_dashboards(self) -> List[Dict]:
         dashboards = []
@@ -39,11 +64,97 @@ class QuickSightClient:
                 
         return dashboards
     
-    def _list_dashboards_from_folder(self) -> List[Dict]:
-        folder_id = self._get_folder_id_by_path(self.folder_path)
+    def _search_dashboards(self, filters: List[Dict]) -> List[Dict]:
+        dashboards = []
+        next_token = None
+        
+        while True:
+            params = {
+                'AwsAccountId': self.account_id,
+                'Filters': filters,
+                'MaxResults': 100
+            }
+            
+            if next_token:
+                params['NextToken'] = next_token
+                
+            response = self.quicksight.search_dashboards(**params)
+            dashboards.extend(response.get('DashboardSummaryList', []))
+            
+            next_token = response.get('NextToken')
+            if not next_token:
+                break
+                
+        return dashboards
+    
+    def _describe_dashboards(self, dashboard_ids: List[str]) -> List[Dict]:
+        summaries, errors = self.worker_pool.run(self._describe_dashboard_summary, dashboard_ids, label='dashboards')
+        if errors:
+            failed_ids = ', '.join(sorted(errors))
+            raise RuntimeError(f'Failed to describe {len(errors)} of {len(dashboard_ids)} dashboards: {failed_ids}')
+        return [summaries[dashboard_id] for dashboard_id in dashboard_ids]
+    
+    def _describe_dashboard_summary(self, dashboard_id: str) -> Dict:
+        response = self.quicksight.describe_dashboard(
+            AwsAccountId=self.account_id,
+            DashboardId=dashboard_id
+        )
+        dashboard = response['Dashboard']
+        return {
+            'Arn': dashboard.get('Arn'),
+            'DashboardId': dashboard['DashboardId'],
+            'Name': dashboard.get('Name', ''),
+            'CreatedTime': dashboard.get('CreatedTime'),
+            'LastUpdatedTime': dashboard.get('LastUpdatedTime'),
+            'PublishedVersionNumber': dashboard.get('Version', {}).get('VersionNumber'),
+            'LastPublishedTime': dashboard.get('LastPublishedTime')
+        }
+    
+    def _list_dashboards_from_folder(self, folder_id: Optional[str] = None) -> List[Dict]:
         if not folder_id:
+            folder_id = self._get_folder_id_by_path(self.folder_path)
+            if not folder_id:
+                raise ValueError(f'QuickSight folder not found: {self.folder_path}')
+            
+        if self.recursive:
+            self.folder_index.ensure_fresh()
+            
+        dashboards = {}
+        level = [folder_id]
+        
+        # Breadth-first, so a dashboard filed in several folders keeps its shallowest path
+        while level:
+            members, errors = self.worker_pool.run(self._list_folder_dashboards, level, label='folders')
+            if errors:
+                failed_ids = ', '.join(sorted(errors))
+                raise RuntimeError(f'Failed to list members of {len(errors)} folders: {failed_ids}')
+                
+            next_level = []
+            for current_id in level:
+                folder_path = self.folder_index.get_path(current_id)
+                for dashboard in members[current_id]:
+                    if dashboard['DashboardId'] not in dashboards:
+                        dashboard['FolderPath'] = folder_path
+                        dashboards[dashboard['DashboardId']] = dashboard
+                if self.recursive:
+                    next_level.extend(self.folder_index.children(current_id))
+            level = next_level
+            
+        return self._join_dashboard_summaries(list(dashboards.values()))
+    
+    def _join_dashboard_summaries(self, members: List[Dict]) -> List[Dict]:
+        if not members:
             return []
             
+        # One paginated listing fills in names and versions for any folder size, instead of a describe per member
+        summaries = {summary['DashboardId']: summary for summary in self._list_all_dashboards()}
+        dashboards = []
+        for member in members:
+            summary = summaries.get(member['DashboardId'])
+            dashboards.append(dict(summary, FolderPath=member.get('FolderPath')) if summary else member)
+        return dashboards
+    
+    def _list_folder_dashboards(self, folder_id: str) -> List[Dict]:
         dashboards = []
         next_token = None
         
@@ -67,9 +178,10 @@ class QuickSightClient:
             ]
             
             for member in dashboard_members:
+                # The member ARN ends in the dashboard ID, the display name is joined in later
                 dashboard_summary = {
                     'DashboardId': member['MemberId'],
-                    'Name': member.get('MemberArn', '').split('/')[-1]  # Extract name from ARN
+                    'Name': member['MemberId']
                 }
                 dashboards.append(dashboard_summary)
             
@@ -79,33 +191,42 @@ class QuickSightClient:
                 
         return dashboards
     
-    def _get_folder_id_by_path(self, folder_path: str) -> str:
-        # Remove trailing slash if present
-        folder_path = folder_path.rstrip('/')
-        
-        try:
-            # List all folders and find the one matching the path
-            response = self.quicksight.list_folders(
-                AwsAccountId=self.account_id
-            )
-            
-            folders = response.get('FolderSummaryList', [])
-            for folder in folders:
-                if folder.get('Name') == folder_path:
-                    return folder.get('FolderId')
-                    
-        except Exception as e:
-            # If folder listing fails, return None to fall back to all dashboards
-            return None
-            
-        return None
+    def _get_folder_id_by_path(self, folder_path: str) -> Optional[str]:
+        return self.folder_index.resolve(folder_path)
         
     def get_dashboard_definition(self, dashboard_id: str) -> Dict:
-        response = self.quicksight.describe_dashboard_definition(
+        return self.describe_dashboard_definition(dashboard_id)['Definition']
+        
+    def describe_dashboard_definition(self, dashboard_id: str) -> Dict:
+        return self.quicksight.describe_dashboard_definition(
             AwsAccountId=self.account_id,
             DashboardId=dashboard_id
         )
-        return response['Definition']
+        
+    def get_data_set(self, dataset_id: str) -> Dict:
+        response = self.quicksight.describe_data_set(
+            AwsAccountId=self.account_id,
+            DataSetId=dataset_id
+        )
+        return response['DataSet']
+        
+    def get_data_source(self, data_source_id: str) -> Dict:
+        response = self.quicksight.describe_data_source(
+            AwsAccountId=self.account_id,
+            DataSourceId=data_source_id
+        )
+        return response['DataSource']
+        
+    def get_theme(self, theme_id: str) -> Dict:
+        response = self.quicksight.describe_theme(
+            AwsAccountId=self.account_id,
+            ThemeId=theme_id
+        )
+        return response['Theme']
         
     def assume_cross_account_role(self, account_id: str, role_name: str):
-        self.quicksight = self.aws_manager.get_quicksight_client(account_id=account_id)
\ No newline at end of file
+        self.quicksight = self.aws_manager.get_quicksight_client(account_id=account_id, role_name=role_name)
+        # Folders from another account must not be served from, or written to, this account's cache
+        self.folder_index = FolderIndex(
+            self.quicksight, account_id, max_workers=self.folder_index.worker_pool.max_workers
+        )
\ No newline at end of file
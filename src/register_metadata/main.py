@@ -7,6 +7,7 @@ from typing import List, Dict
 from src.common.aws_client import AWSClientManager
 from src.common.config import Config
 from src.common.logger import setup_logger
+from src.common.snapshot_store import SnapshotStore
 from src.register_metadata.csv_processor import CSVProcessor
 from src.register_metadata.dynamodb_client import DynamoDBClient
 
@@ -21,8 +22,17 @@ class MetadataRegistrar:
         self.s3_prefix = self.config.get_required('METADATA_SOURCE_S3_PREFIX')
         self.table_name = self.config.get_required('DYNAMODB_TABLE_NAME')
         
+        AWSClientManager.configure(
+            retry_mode=self.config.get('AWS_RETRY_MODE', 'standard'),
+            max_attempts=self.config.get('AWS_MAX_ATTEMPTS'),
+            rate_limit=self.config.get('QUICKSIGHT_RATE_LIMIT'),
+            max_rate_limit=self.config.get('QUICKSIGHT_MAX_RATE_LIMIT')
+        )
         self.aws_manager = AWSClientManager(self.region)
         self.s3_client = self.aws_manager.get_s3_client()
+        self.snapshot_store = SnapshotStore(self.s3_client, self.s3_bucket, self.s3_prefix)
+        self.manifest = None
+        self.bundle_reader = None
         self.csv_processor = CSVProcessor()
         self.dynamodb_client = DynamoDBClient(self.table_name, self.region)
         
@@ -36,6 +46,11 @@ class MetadataRegistrar:
             
         self.logger.info(f'Using latest metadata folder: {latest_folder}')
         
+        self.manifest = self.snapshot_store.load_manifest(latest_folder)
+        if not self.manifest:
+            self.logger.warning(f'No manifest found in {latest_folder}, skipping checksum verification')
+        self.bundle_reader = self.snapshot_store.open_bundle(self.manifest)
+        
         temp_dir = tempfile.mkdtemp()
         try:
             packages_file = os.path.join(temp_dir, 'packages.csv')
@@ -62,35 +77,27 @@ class MetadataRegistrar:
             shutil.rmtree(temp_dir)
             
     def _get_latest_s3_folder(self) -> str:
-        response = self.s3_client.list_objects_v2(
-            Bucket=self.s3_bucket,
-            Prefix=self.s3_prefix,
-            Delimiter='/'
-        )
-        
-        folders = []
-        for obj in response.get('Contents', []):
-            parts = obj['Key'].replace(self.s3_prefix, '').split('/')
-            if len(parts) > 1 and parts[0]:
-                folders.append(parts[0])
-                
-        if not folders:
-            return None
-            
-        folders.sort(reverse=True)
-        return folders[0]
+        return self.snapshot_store.get_latest_snapshot()
         
     def _download_csv_from_s3(self, filename: str, folder: str, local_path: str):
-        key = f'{self.s3_prefix}{folder}/{filename}'
-        self.logger.info(f'Downloading s3://{self.s3_bucket}/{key} to {local_path}')
-        
-        response = self.s3_client.get_object(
-            Bucket=self.s3_bucket,
-            Key=key
-        )
-        
+        if self.bundle_reader:
+            self.logger.info(f'Reading {filename} from s3://{self.s3_bucket}/{self.bundle_reader.key} to {local_path}')
+            content, _ = self.bundle_reader.read(filename)
+        else:
+            key = f'{self.s3_prefix}{folder}/{filename}'
+            self.logger.info(f'Downloading s3://{self.s3_bucket}/{key} to {local_path}')
+            
+            response = self.s3_client.get_object(
+                Bucket=self.s3_bucket,
+                Key=key
+            )
+            content = response['Body'].read()
+            
+        if self.manifest and not self.manifest.verify_file(filename, content):
+            raise ValueError(f'{filename} in {folder} does not match the manifest checksum')
+            
         with open(local_path, 'w', encoding='utf-8') as f:
-            f.write(response['Body'].read().decode('utf-8'))
+            f.write(content.decode('utf-8'))
 
 
 def main():
@@ -0,0 +1,30 @@
+import pytest
+from botocore.exceptions import ClientError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        
+    def __call__(self):
+        return self.now
+        
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def not_found():
+    def make(operation: str = 'DescribeDashboard'):
+        return ClientError(
+            {'Error': {'Code': 'ResourceNotFoundException', 'Message': 'Resource not found'}},
+            operation
+        )
+    return make
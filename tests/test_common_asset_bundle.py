@@ -0,0 +1,215 @@
+import io
+import json
+import zipfile
+import pytest
+from src.common.asset_bundle import (
+    AssetBundleJobRunner, pack_dashboards, unpack_dashboards, validate_engine
+)
+
+
+ARN_PREFIX = 'arn:aws:quicksight:ap-northeast-1:123456789012:dashboard'
+
+
+class FakeAssetBundleJobs:
+    # Local stand-in for the QuickSight asset bundle job APIs, each job finishes after a number of polls
+    def __init__(self, definitions=None, polls_until_done=2, failing_ids=(), missing_ids=()):
+        self.definitions = definitions or {}
+        self.polls_until_done = polls_until_done
+        self.failing_ids = set(failing_ids)
+        self.missing_ids = set(missing_ids)
+        self.jobs = {}
+        self.imported = {}
+        self.max_in_flight = 0
+        self.describe_calls = 0
+        
+    def _start(self, job_id, job):
+        job['Polls'] = 0
+        self.jobs[job_id] = job
+        in_flight = sum(1 for job in self.jobs.values() if job['Polls'] < self.polls_until_done)
+        self.max_in_flight = max(self.max_in_flight, in_flight)
+        
+    def _describe(self, job_id):
+        self.describe_calls += 1
+        job = self.jobs[job_id]
+        job['Polls'] += 1
+        if job['Polls'] < self.polls_until_done:
+            return {'JobStatus': 'IN_PROGRESS'}
+        failed = [dashboard_id for dashboard_id in job['DashboardIds'] if dashboard_id in self.failing_ids]
+        if failed:
+            return {
+                'JobStatus': job['FailedStatus'],
+                'Errors': [
+                    {'Arn': f'{ARN_PREFIX}/{dashboard_id}', 'Type': 'InvalidParameterValueException',
+                     'Message': 'Invalid definition'}
+                    for dashboard_id in failed
+                ]
+            }
+        return dict(job['Response'], JobStatus='SUCCESSFUL')
+        
+    def start_asset_bundle_export_job(self, AwsAccountId, AssetBundleExportJobId, ResourceArns,
+                                      IncludeAllDependencies, ExportFormat):
+        dashboard_ids = [arn.split('/')[-1] for arn in ResourceArns]
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            for dashboard_id in dashboard_ids:
+                if dashboard_id in self.missing_ids:
+                    continue
+                archive.writestr(f'{AssetBundleExportJobId}/dashboard/{dashboard_id}.json', json.dumps({
+                    'dashboardId': dashboard_id,
+                    'name': f'Dashboard {dashboard_id}',
+                    'definition': self.definitions[dashboard_id],
+                    'themeArn': 'arn:aws:quicksight:ap-northeast-1:123456789012:theme/theme-001'
+                }))
+        self._start(AssetBundleExportJobId, {
+            'DashboardIds': dashboard_ids,
+            'FailedStatus': 'FAILED',
+            'Response': {'DownloadUrl': buffer.getvalue()}
+        })
+        
+    def describe_asset_bundle_export_job(self, AwsAccountId, AssetBundleExportJobId):
+        return self._describe(AssetBundleExportJobId)
+        
+    def start_asset_bundle_import_job(self, AwsAccountId, AssetBundleImportJobId, AssetBundleImportSource,
+                                      FailureAction, OverrideTags=None):
+        dashboards = unpack_dashboards(AssetBundleImportSource['Body'])
+        self._start(AssetBundleImportJobId, {
+            'DashboardIds': list(dashboards),
+            'FailedStatus': 'FAILED_ROLLBACK_COMPLETED',
+            'Response': {}
+        })
+        for dashboard_id, dashboard in dashboards.items():
+            if dashboard_id not in self.failing_ids:
+                self.imported[dashboard_id] = dict(dashboard, OverrideTags=OverrideTags)
+                
+    def describe_asset_bundle_import_job(self, AwsAccountId, AssetBundleImportJobId):
+        return self._describe(AssetBundleImportJobId)
+
+
+def _runner(jobs, clock, **kwargs):
+    # The stub hands back the archive itself in place of a presigned URL
+    return AssetBundleJobRunner(
+        jobs, '123456789012', poll_interval=1, max_poll_interval=4,
+        download=lambda url: url, clock=clock, sleep=clock.sleep, **kwargs
+    )
+
+
+def test_validate_engine():
+    assert validate_engine('asset_bundle') == 'asset_bundle'
+    with pytest.raises(ValueError, match='Unsupported engine: bulk'):
+        validate_engine('bulk')
+
+
+def test_pack_and_unpack_dashboards():
+    definition = {'Name': 'Sales', 'Sheets': []}
+    
+    dashboards = unpack_dashboards(pack_dashboards({'dash-001': definition}))
+    
+    assert dashboards['dash-001']['Definition'] == definition
+    assert dashboards['dash-001']['Name'] == 'Sales'
+
+
+class TestAssetBundleJobRunner:
+    def test_export_batches_jobs_and_limits_concurrency(self, clock):
+        definitions = {f'dash-{i:03d}': {'Sheets': [i]} for i in range(25)}
+        jobs = FakeAssetBundleJobs(definitions, polls_until_done=3)
+        
+        runner = _runner(jobs, clock, batch_size=4, max_concurrent_jobs=2)
+        results, errors = runner.export_dashboards({
+            dashboard_id: f'{ARN_PREFIX}/{dashboard_id}' for dashboard_id in definitions
+        })
+        
+        assert errors == {}
+        assert len(jobs.jobs) == 7
+        assert jobs.max_in_flight == 2
+        assert results['dash-007']['Definition'] == {'Sheets': [7]}
+        assert results['dash-007']['ThemeArn'].endswith('theme/theme-001')
+        # Each poll describes the jobs in flight, not the dashboards they carry
+        assert jobs.describe_calls == 7 * 3
+        
+    def test_poll_interval_backs_off_until_a_job_finishes(self, clock):
+        jobs = FakeAssetBundleJobs({'dash-001': {}}, polls_until_done=5)
+        
+        runner = _runner(jobs, clock)
+        runner.export_dashboards({'dash-001': f'{ARN_PREFIX}/dash-001'})
+        
+        assert clock.sleeps == [1, 2, 4, 4, 4]
+        
+    def test_export_reports_missing_dashboards(self, clock):
+        jobs = FakeAssetBundleJobs({'dash-001': {}, 'dash-002': {}}, missing_ids=['dash-002'])
+        
+        results, errors = _runner(jobs, clock).export_dashboards({
+            'dash-001': f'{ARN_PREFIX}/dash-001',
+            'dash-002': f'{ARN_PREFIX}/dash-002'
+        })
+        
+        assert list(results) == ['dash-001']
+        assert 'missing from export job' in str(errors['dash-002'])
+        
+    def test_import_with_tags(self, clock):
+        jobs = FakeAssetBundleJobs()
+        
+        results, errors = _runner(jobs, clock, batch_size=2).import_dashboards(
+            {f'dash-00{i}': {'Name': f'Dashboard {i}'} for i in range(1, 4)},
+            {'dash-001': [{'Key': 'DefinitionSha256', 'Value': 'abc'}]}
+        )
+        
+        assert errors == {}
+        assert sorted(results) == ['dash-001', 'dash-002', 'dash-003']
+        assert jobs.imported['dash-001']['OverrideTags'] == {
+            'Dashboards': [{'DashboardIds': ['dash-001'], 'Tags': [{'Key': 'DefinitionSha256', 'Value': 'abc'}]}]
+        }
+        assert jobs.imported['dash-003']['OverrideTags'] is None
+        
+    def test_failed_import_fails_whole_batch_and_stops_on_fail_fast(self, clock):
+        jobs = FakeAssetBundleJobs(failing_ids=['dash-002'])
+        
+        results, errors = _runner(jobs, clock, batch_size=2, max_concurrent_jobs=1).import_dashboards(
+            {f'dash-00{i}': {} for i in range(1, 6)}, fail_fast=True
+        )
+        
+        assert results == {}
+        assert sorted(errors) == ['dash-001', 'dash-002']
+        assert 'FAILED_ROLLBACK_COMPLETED: InvalidParameterValueException: Invalid definition' in str(errors['dash-002'])
+        assert len(jobs.jobs) == 1
+        
+    def test_timeout(self, clock):
+        jobs = FakeAssetBundleJobs({'dash-001': {}}, polls_until_done=100)
+        
+        results, errors = _runner(jobs, clock, timeout=10).export_dashboards({
+            'dash-001': f'{ARN_PREFIX}/dash-001'
+        })
+        
+        assert results == {}
+        assert isinstance(errors['dash-001'], TimeoutError)
+        
+    def test_timeout_reports_batches_never_started(self, clock):
+        jobs = FakeAssetBundleJobs({'dash-001': {}, 'dash-002': {}}, polls_until_done=100)
+        
+        results, errors = _runner(jobs, clock, timeout=10, batch_size=1, max_concurrent_jobs=1).export_dashboards({
+            'dash-001': f'{ARN_PREFIX}/dash-001',
+            'dash-002': f'{ARN_PREFIX}/dash-002'
+        })
+        
+        assert results == {}
+        assert len(jobs.jobs) == 1
+        assert 'did not finish in time' in str(errors['dash-001'])
+        assert 'not started in time' in str(errors['dash-002'])
+        
+    def test_describe_error_fails_only_its_batch(self, clock):
+        jobs = FakeAssetBundleJobs({'dash-001': {}, 'dash-002': {}})
+        describe = jobs.describe_asset_bundle_export_job
+        
+        def flaky_describe(AwsAccountId, AssetBundleExportJobId):
+            if 'dash-001' in jobs.jobs[AssetBundleExportJobId]['DashboardIds']:
+                raise RuntimeError('Throttled')
+            return describe(AwsAccountId, AssetBundleExportJobId)
+            
+        jobs.describe_asset_bundle_export_job = flaky_describe
+        
+        results, errors = _runner(jobs, clock, batch_size=1).export_dashboards({
+            'dash-001': f'{ARN_PREFIX}/dash-001',
+            'dash-002': f'{ARN_PREFIX}/dash-002'
+        })
+        
+        assert list(results) == ['dash-002']
+        assert str(errors['dash-001']) == 'Throttled'
@@ -1,92 +1,201 @@
+import threading
+from datetime import datetime, timedelta, timezone
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 import boto3
+from botocore.credentials import RefreshableCredentials
 from src.common.aws_client import AWSClientManager
 
 
+def _role_credentials(key='test_key', expires_in=timedelta(hours=1)):
+    return {
+        'Credentials': {
+            'AccessKeyId': key,
+            'SecretAccessKey': 'test_secret',
+            'SessionToken': 'test_token',
+            'Expiration': datetime.now(timezone.utc) + expires_in
+        }
+    }
+
+
+@pytest.fixture(autouse=True)
+def reset_client_cache():
+    AWSClientManager.reset()
+    yield
+    AWSClientManager.reset()
+
+
 class TestAWSClientManager:
-    @patch('boto3.client')
-    def test_init_default_region(self, mock_boto_client):
+    @patch('boto3.session.Session')
+    def test_init_default_region(self, mock_session_class):
         manager = AWSClientManager()
         
         assert manager.region == 'ap-northeast-1'
         
-    @patch('boto3.client')
-    def test_init_custom_region(self, mock_boto_client):
+    @patch('boto3.session.Session')
+    def test_init_custom_region(self, mock_session_class):
         manager = AWSClientManager(region='us-east-1')
         
         assert manager.region == 'us-east-1'
         
-    @patch('boto3.client')
-    def test_get_quicksight_client_default(self, mock_boto_client):
+    @patch('boto3.session.Session')
+    def test_get_quicksight_client_default(self, mock_session_class):
         mock_client = Mock()
-        mock_boto_client.return_value = mock_client
+        mock_session_class.return_value.client.return_value = mock_client
         
         manager = AWSClientManager()
         client = manager.get_quicksight_client()
         
-        mock_boto_client.assert_called_with('quicksight', region_name='ap-northeast-1')
+        call = mock_session_class.return_value.client.call_args
+        assert call.args == ('quicksight',)
+        assert call.kwargs['region_name'] == 'ap-northeast-1'
         assert client == mock_client
         
-    @patch('boto3.client')
-    def test_get_quicksight_client_with_account_id(self, mock_boto_client):
+    @patch('boto3.session.Session')
+    def test_get_quicksight_client_with_account_id(self, mock_session_class):
         mock_sts_client = Mock()
         mock_qs_client = Mock()
-        mock_assume_role_response = {
-            'Credentials': {
-                'AccessKeyId': 'test_key',
-                'SecretAccessKey': 'test_secret',
-                'SessionToken': 'test_token'
-            }
-        }
-        mock_sts_client.assume_role.return_value = mock_assume_role_response
+        mock_sts_client.assume_role.return_value = _role_credentials()
         
         def client_side_effect(service, **kwargs):
             if service == 'sts':
                 return mock_sts_client
             return mock_qs_client
             
-        mock_boto_client.side_effect = client_side_effect
+        mock_session_class.return_value.client.side_effect = client_side_effect
         
         manager = AWSClientManager()
-        client = manager.get_quicksight_client(account_id='123456789012')
+        client = manager.get_quicksight_client(account_id='123456789012', role_name='TestRole')
         
         assert client == mock_qs_client
+        mock_sts_client.assume_role.assert_called_once_with(
+            RoleArn='arn:aws:iam::123456789012:role/TestRole',
+            RoleSessionName='QuickSightManagementTools'
+        )
         
-    @patch('boto3.client')
-    def test_get_s3_client(self, mock_boto_client):
+    @patch('boto3.session.Session')
+    def test_role_credentials_are_refreshable_and_shared(self, mock_session_class):
+        mock_sts_client = Mock()
+        mock_sts_client.assume_role.return_value = _role_credentials()
+        mock_session_class.return_value.client.side_effect = \
+            lambda service, **kwargs: mock_sts_client if service == 'sts' else Mock()
+            
+        first = AWSClientManager().get_quicksight_client(account_id='123456789012', role_name='TestRole')
+        second = AWSClientManager().get_quicksight_client(account_id='123456789012', role_name='TestRole')
+        other_region = AWSClientManager('us-east-1').get_quicksight_client(
+            account_id='123456789012', role_name='TestRole'
+        )
+        
+        role_session_calls = [call for call in mock_session_class.call_args_list if 'botocore_session' in call.kwargs]
+        assert first is second
+        assert other_region is not first
+        assert len(role_session_calls) == 1
+        assert isinstance(role_session_calls[0].kwargs['botocore_session']._credentials, RefreshableCredentials)
+        assert mock_sts_client.assume_role.call_count == 1
+        
+    @patch('boto3.session.Session')
+    def test_role_credentials_refresh_before_expiry(self, mock_session_class):
+        mock_sts_client = Mock()
+        mock_sts_client.assume_role.side_effect = [
+            _role_credentials('expiring_key', timedelta(minutes=5)),
+            _role_credentials('fresh_key')
+        ]
+        mock_session_class.return_value.client.side_effect = \
+            lambda service, **kwargs: mock_sts_client if service == 'sts' else Mock()
+            
+        AWSClientManager().get_quicksight_client(account_id='123456789012', role_name='TestRole')
+        
+        botocore_session = [
+            call for call in mock_session_class.call_args_list if 'botocore_session' in call.kwargs
+        ][0].kwargs['botocore_session']
+        frozen = botocore_session._credentials.get_frozen_credentials()
+        
+        assert frozen.access_key == 'fresh_key'
+        assert mock_sts_client.assume_role.call_count == 2
+        
+    @patch('boto3.session.Session')
+    def test_get_s3_client(self, mock_session_class):
         mock_client = Mock()
-        mock_boto_client.return_value = mock_client
+        mock_session_class.return_value.client.return_value = mock_client
         
         manager = AWSClientManager()
         client = manager.get_s3_client()
         
-        mock_boto_client.assert_called_with('s3', region_name='ap-northeast-1')
+        call = mock_session_class.return_value.client.call_args
+        assert call.args == ('s3',)
+        assert call.kwargs['region_name'] == 'ap-northeast-1'
         assert client == mock_client
         
-    @patch('boto3.client')
-    def test_get_dynamodb_client(self, mock_boto_client):
+    @patch('boto3.session.Session')
+    def test_get_dynamodb_client(self, mock_session_class):
         mock_client = Mock()
-        mock_boto_client.return_value = mock_client
+        mock_session_class.return_value.client.return_value = mock_client
         
         manager = AWSClientManager()
         client = manager.get_dynamodb_client()
         
-        mock_boto_client.assert_called_with('dynamodb', region_name='ap-northeast-1')
+        call = mock_session_class.return_value.client.call_args
+        assert call.args == ('dynamodb',)
+        assert call.kwargs['region_name'] == 'ap-northeast-1'
         assert client == mock_client
         
-    @patch('boto3.client')
-    def test_assume_role(self, mock_boto_client):
+    @patch('boto3.session.Session')
+    def test_clients_are_shared_across_managers(self, mock_session_class):
+        mock_session_class.return_value.client.side_effect = lambda service, **kwargs: Mock()
+        
+        first = AWSClientManager().get_quicksight_client()
+        second = AWSClientManager().get_quicksight_client()
+        other_region = AWSClientManager('us-east-1').get_quicksight_client()
+        
+        assert first is second
+        assert other_region is not first
+        assert mock_session_class.call_count == 1
+        assert mock_session_class.return_value.client.call_count == 2
+        
+    @patch('boto3.session.Session')
+    def test_concurrent_requests_create_one_client(self, mock_session_class):
+        mock_session_class.return_value.client.side_effect = lambda service, **kwargs: Mock()
+        clients = []
+        
+        def get_client():
+            clients.append(AWSClientManager().get_s3_client())
+            
+        threads = [threading.Thread(target=get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+            
+        assert len({id(client) for client in clients}) == 1
+        assert mock_session_class.return_value.client.call_count == 1
+        
+    @patch('boto3.session.Session')
+    def test_max_pool_connections(self, mock_session_class):
+        manager = AWSClientManager(max_pool_connections=32)
+        manager.get_s3_client()
+        
+        config = mock_session_class.return_value.client.call_args.kwargs['config']
+        assert config.max_pool_connections == 32
+        
+    @patch('boto3.session.Session')
+    def test_configure_retry_mode_rebuilds_clients(self, mock_session_class):
+        mock_session_class.return_value.client.side_effect = lambda service, **kwargs: Mock()
+        
+        manager = AWSClientManager()
+        before = manager.get_s3_client()
+        AWSClientManager.configure(retry_mode='adaptive', max_attempts='8')
+        after = manager.get_s3_client()
+        
+        config = mock_session_class.return_value.client.call_args.kwargs['config']
+        assert config.retries == {'mode': 'adaptive', 'max_attempts': 8}
+        assert before is not after
+        
+    @patch('boto3.session.Session')
+    def test_assume_role(self, mock_session_class):
         mock_sts_client = Mock()
-        mock_credentials = {
-            'Credentials': {
-                'AccessKeyId': 'test_key',
-                'SecretAccessKey': 'test_secret',
-                'SessionToken': 'test_token'
-            }
-        }
+        mock_credentials = _role_credentials()
         mock_sts_client.assume_role.return_value = mock_credentials
-        mock_boto_client.return_value = mock_sts_client
+        mock_session_class.return_value.client.return_value = mock_sts_client
         
         manager = AWSClientManager()
         result = manager.assume_role('123456789012', 'TestRole')
@@ -95,4 +204,32 @@ class TestAWSClientManager:
             RoleArn='arn:aws:iam::123456789012:role/TestRole',
             RoleSessionName='QuickSightManagementTools'
         )
-        assert result == mock_credentials['Credentials']
\ No newline at end of file
+        assert result == mock_credentials['Credentials']
+        
+    @patch('boto3.session.Session')
+    def test_rate_limiter_attached_to_quicksight_clients_only(self, mock_session_class):
+        mock_session_class.return_value.client.side_effect = lambda service, **kwargs: Mock()
+        
+        manager = AWSClientManager()
+        quicksight = manager.get_quicksight_client()
+        s3 = manager.get_s3_client()
+        
+        assert quicksight.meta.events.register.call_count == 2
+        assert s3.meta.events.register.call_count == 0
+        assert manager.get_rate_limiter() is AWSClientManager().get_rate_limiter()
+        assert manager.get_rate_limiter('s3') is None
+        
+    @patch('boto3.session.Session')
+    def test_rate_limit_settings(self, mock_session_class):
+        AWSClientManager.configure(rate_limit='4', max_rate_limit='20')
+        rate_limiter = AWSClientManager().get_rate_limiter()
+        
+        assert rate_limiter.initial_rate == 4
+        assert rate_limiter.max_rate == 20
+        assert AWSClientManager().get_rate_limiter(account_id='987654321098') is not rate_limiter
+        
+        AWSClientManager.configure(rate_limit='0')
+        quicksight = AWSClientManager().get_quicksight_client()
+        
+        assert AWSClientManager().get_rate_limiter() is None
+        assert quicksight.meta.events.register.call_count == 0
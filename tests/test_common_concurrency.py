@@ -0,0 +1,76 @@
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from src.common.concurrency import WorkerPool
+
+
+class TestWorkerPool:
+    def test_run_returns_results(self):
+        pool = WorkerPool(max_workers=4)
+        
+        results, errors = pool.run(lambda item: item.upper(), ['a', 'b', 'c'])
+        
+        assert results == {'a': 'A', 'b': 'B', 'c': 'C'}
+        assert errors == {}
+        
+    def test_run_empty_items(self):
+        pool = WorkerPool(max_workers=4)
+        
+        results, errors = pool.run(lambda item: item, [])
+        
+        assert results == {}
+        assert errors == {}
+        
+    def test_run_collects_errors_without_stopping(self):
+        def func(item):
+            if item == 'b':
+                raise ValueError('boom')
+            return item
+            
+        pool = WorkerPool(max_workers=2, logger=Mock())
+        
+        results, errors = pool.run(func, ['a', 'b', 'c'])
+        
+        assert results == {'a': 'a', 'c': 'c'}
+        assert list(errors) == ['b']
+        assert str(errors['b']) == 'boom'
+        
+    def test_run_bounds_concurrency(self):
+        lock = threading.Lock()
+        state = {'active': 0, 'peak': 0}
+        
+        def func(item):
+            with lock:
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+            time.sleep(0.01)
+            with lock:
+                state['active'] -= 1
+                
+        pool = WorkerPool(max_workers=3)
+        pool.run(func, [str(i) for i in range(12)])
+        
+        assert state['peak'] <= 3
+        
+    def test_run_fail_fast_skips_pending(self):
+        def func(item):
+            if item == '0':
+                raise ValueError('boom')
+            time.sleep(0.01)
+            return item
+            
+        pool = WorkerPool(max_workers=1)
+        
+        results, errors = pool.run(func, [str(i) for i in range(5)], fail_fast=True)
+        
+        assert list(errors) == ['0']
+        assert len(results) < 4
+        
+    def test_run_logs_progress(self):
+        logger = Mock()
+        pool = WorkerPool(max_workers=2, logger=logger)
+        
+        pool.run(lambda item: item, ['a', 'b'], label='dashboards')
+        
+        logger.info.assert_any_call('Progress: 2/2 dashboards processed (0 failed)')
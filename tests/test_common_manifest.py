@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime
+from src.common.manifest import SnapshotManifest, canonical_json, content_hash
+
+
+class TestSnapshotManifest:
+    def test_build_entry(self):
+        summary = {
+            'DashboardId': 'dash-001',
+            'Name': 'Dashboard 1',
+            'LastUpdatedTime': datetime(2024, 1, 1, 12, 0, 0),
+            'PublishedVersionNumber': 3
+        }
+        
+        entry = SnapshotManifest.build_entry(summary, '20240101120000')
+        
+        assert entry == {
+            'DashboardId': 'dash-001',
+            'Name': 'Dashboard 1',
+            'Sha256': None,
+            'Size': None,
+            'LastUpdatedTime': '2024-01-01T12:00:00',
+            'VersionNumber': 3,
+            'ExportedAt': '20240101120000'
+        }
+        
+    def test_build_entry_with_folder_path(self):
+        summary = {'DashboardId': 'dash-001', 'Name': 'Dashboard 1', 'FolderPath': 'release/finance'}
+        
+        entry = SnapshotManifest.build_entry(summary, '20240101120000')
+        
+        assert entry['FolderPath'] == 'release/finance'
+        
+    def test_is_unchanged(self):
+        summary = {
+            'DashboardId': 'dash-001',
+            'LastUpdatedTime': datetime(2024, 1, 1, 12, 0, 0),
+            'PublishedVersionNumber': 3
+        }
+        entry = SnapshotManifest.build_entry(summary, '20240101120000')
+        
+        assert SnapshotManifest.is_unchanged(entry, summary) is True
+        assert SnapshotManifest.is_unchanged(entry, dict(summary, PublishedVersionNumber=4)) is False
+        assert SnapshotManifest.is_unchanged(
+            entry, dict(summary, LastUpdatedTime=datetime(2024, 1, 2))
+        ) is False
+        
+    def test_is_unchanged_without_version_info(self):
+        entry = {'DashboardId': 'dash-001', 'LastUpdatedTime': None, 'VersionNumber': None}
+        summary = {'DashboardId': 'dash-001', 'Name': 'dash-001'}
+        
+        assert SnapshotManifest.is_unchanged(entry, summary) is False
+        
+    def test_json_round_trip(self):
+        manifest = SnapshotManifest('20240101120000')
+        manifest.add_dashboard({'DashboardId': 'dash-002', 'Name': 'Dashboard 2'})
+        manifest.add_dashboard({'DashboardId': 'dash-001', 'Name': 'Dashboard 1'})
+        
+        loaded = SnapshotManifest.from_json(manifest.to_json())
+        
+        assert loaded.timestamp == '20240101120000'
+        assert list(loaded.dashboards) == ['dash-001', 'dash-002']
+        assert loaded.get_dashboard('dash-002')['Name'] == 'Dashboard 2'
+        assert loaded.dashboard_filter is None
+        assert 'Filter' not in manifest.to_json()
+        
+        manifest.dashboard_filter = '3 dashboard IDs'
+        assert SnapshotManifest.from_json(manifest.to_json()).dashboard_filter == '3 dashboard IDs'
+        
+    def test_content_hash_ignores_key_order_and_whitespace(self):
+        assert canonical_json({'b': 1, 'a': [1, 2]}) == '{"a":[1,2],"b":1}'
+        assert content_hash({'b': 1, 'a': 'ダッシュボード'}) == content_hash({'a': 'ダッシュボード', 'b': 1})
+        assert content_hash({'a': 1}) != content_hash({'a': 2})
+        
+    def test_verify_file(self):
+        manifest = SnapshotManifest('20240101120000')
+        manifest.add_file('packages.csv', b'package_id\n')
+        
+        assert manifest.files['packages.csv']['Size'] == 11
+        assert manifest.verify_file('packages.csv', b'package_id\n') is True
+        assert manifest.verify_file('packages.csv', b'tampered\n') is False
+        assert manifest.verify_file('unknown.csv', b'anything') is True
+        
+    def test_verify_dashboard(self):
+        definition = {'Name': 'Dashboard 1', 'DataSetIds': ['dataset1']}
+        manifest = SnapshotManifest('20240101120000')
+        manifest.add_dashboard(SnapshotManifest.build_entry(
+            {'DashboardId': 'dash-001'}, '20240101120000', content_hash(definition), 100
+        ))
+        
+        assert manifest.verify_dashboard('dash-001', dict(definition)) is True
+        assert manifest.verify_dashboard('dash-001', dict(definition, Name='Other')) is False
+        
+    def test_files_round_trip(self):
+        manifest = SnapshotManifest('20240101120000')
+        manifest.add_file('dashboards.csv', b'content')
+        
+        loaded = SnapshotManifest.from_json(manifest.to_json())
+        
+        assert loaded.files == manifest.files
@@ -0,0 +1,133 @@
+import threading
+import pytest
+from unittest.mock import Mock
+from src.common.rate_limiter import AdaptiveRateLimiter, TokenBucket
+
+
+class TestTokenBucket:
+    def test_acquire_within_burst_does_not_wait(self, clock):
+        bucket = TokenBucket(5, clock, clock.sleep)
+        
+        for _ in range(5):
+            bucket.acquire()
+            
+        assert clock.sleeps == []
+        
+    def test_acquire_waits_when_empty(self, clock):
+        bucket = TokenBucket(2, clock, clock.sleep)
+        
+        for _ in range(4):
+            bucket.acquire()
+            
+        assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+        
+    def test_tokens_refill_over_time(self, clock):
+        bucket = TokenBucket(2, clock, clock.sleep)
+        bucket.acquire()
+        bucket.acquire()
+        
+        clock.now += 1.0
+        bucket.acquire()
+        bucket.acquire()
+        
+        assert clock.sleeps == []
+        
+    def test_concurrent_acquire_reserves_tokens(self, clock):
+        sleeps = []
+        lock = threading.Lock()
+        
+        def record_sleep(seconds):
+            with lock:
+                sleeps.append(seconds)
+                
+        bucket = TokenBucket(1, clock, record_sleep)
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+            
+        assert sorted(sleeps) == [pytest.approx(1.0), pytest.approx(2.0), pytest.approx(3.0)]
+
+
+class TestAdaptiveRateLimiter:
+    def test_buckets_are_per_operation(self, clock):
+        limiter = AdaptiveRateLimiter(initial_rate=1, clock=clock, sleep=clock.sleep)
+        
+        limiter.acquire('DescribeDashboard')
+        limiter.acquire('DescribeDataSet')
+        limiter.acquire('UpdateDashboard')
+        
+        assert clock.sleeps == []
+        assert set(limiter.get_rates()) == {'DescribeDashboard', 'DescribeDataSet', 'UpdateDashboard'}
+        
+    def test_throttle_halves_rate_once_per_burst(self, clock):
+        limiter = AdaptiveRateLimiter(initial_rate=8, clock=clock, sleep=clock.sleep)
+        
+        limiter.on_throttle('UpdateDashboard')
+        limiter.on_throttle('UpdateDashboard')
+        
+        assert limiter.get_rate('UpdateDashboard') == 4
+        
+        clock.now += 1.0
+        limiter.on_throttle('UpdateDashboard')
+        
+        assert limiter.get_rate('UpdateDashboard') == 2
+        assert limiter.get_rate('ListDashboards') == 8
+        
+    def test_throttle_respects_min_rate(self, clock):
+        limiter = AdaptiveRateLimiter(initial_rate=1, min_rate=0.5, clock=clock, sleep=clock.sleep)
+        
+        for _ in range(3):
+            limiter.on_throttle('ListDashboards')
+            clock.now += 1.0
+            
+        assert limiter.get_rate('ListDashboards') == 0.5
+        
+    def test_success_grows_rate_up_to_max(self, clock):
+        limiter = AdaptiveRateLimiter(initial_rate=2, max_rate=3, clock=clock, sleep=clock.sleep)
+        
+        limiter.on_success('ListDashboards')
+        
+        assert limiter.get_rate('ListDashboards') == 2.5
+        
+        for _ in range(10):
+            limiter.on_success('ListDashboards')
+            
+        assert limiter.get_rate('ListDashboards') == 3
+        
+    def test_attach_registers_event_handlers(self):
+        client = Mock()
+        client.meta.service_model.service_id.hyphenize.return_value = 'quicksight'
+        limiter = AdaptiveRateLimiter()
+        
+        limiter.attach(client)
+        
+        events = [call.args[0] for call in client.meta.events.register.call_args_list]
+        assert events == ['before-send.quicksight', 'needs-retry.quicksight']
+        
+    def test_after_attempt_classifies_responses(self, clock):
+        limiter = AdaptiveRateLimiter(initial_rate=4, clock=clock, sleep=clock.sleep)
+        throttled = (Mock(status_code=400), {'Error': {'Code': 'ThrottlingException'}})
+        too_many = (Mock(status_code=429), {})
+        succeeded = (Mock(status_code=200), {'DashboardSummaryList': []})
+        
+        assert limiter._after_attempt('needs-retry.quicksight.ListDashboards', response=throttled) is None
+        assert limiter.get_rate('ListDashboards') == 2
+        
+        limiter._after_attempt('needs-retry.quicksight.ListDashboards', response=succeeded)
+        assert limiter.get_rate('ListDashboards') == 2.5
+        
+        limiter._after_attempt('needs-retry.quicksight.DescribeDashboard', response=too_many)
+        assert limiter.get_rate('DescribeDashboard') == 2
+        
+        limiter._after_attempt('needs-retry.quicksight.DescribeDataSet', response=None)
+        assert limiter.get_rate('DescribeDataSet') == 4
+        
+    def test_before_send_acquires_operation_bucket(self, clock):
+        limiter = AdaptiveRateLimiter(initial_rate=1, clock=clock, sleep=clock.sleep)
+        
+        assert limiter._before_send('before-send.quicksight.DescribeDashboard', request=Mock()) is None
+        limiter._before_send('before-send.quicksight.DescribeDashboard', request=Mock())
+        
+        assert clock.sleeps == [pytest.approx(1.0)]
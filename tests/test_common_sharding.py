@@ -0,0 +1,32 @@
+import pytest
+from src.common.sharding import Shard, shard_index
+
+
+def test_parse():
+    shard = Shard.parse('2/4')
+    
+    assert (shard.index, shard.count) == (2, 4)
+    assert str(shard) == '2/4'
+    
+    for value in ('0/4', '5/4', '2', 'a/b', '1/2/3'):
+        with pytest.raises(ValueError):
+            Shard.parse(value)
+            
+            
+def test_shards_split_items_exactly_once():
+    items = [f'dash-{i:04d}' for i in range(1000)]
+    shards = [Shard(index, 4) for index in range(1, 5)]
+    
+    assigned = [[item for item in items if shard.contains(item)] for shard in shards]
+    
+    assert sorted(item for shard_items in assigned for item in shard_items) == items
+    assert all(200 < len(shard_items) < 300 for shard_items in assigned)
+    # Stable across processes, unlike the salted built-in hash()
+    assert shard_index('dash-0001', 4) == shard_index('dash-0001', 4)
+    
+    
+def test_filename():
+    shard = Shard(1, 3)
+    
+    assert shard.filename('manifest.json') == 'shards/manifest-1-of-3.json'
+    assert shard.filename('_COMPLETE') == 'shards/_COMPLETE-1-of-3'
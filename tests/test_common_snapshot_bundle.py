@@ -0,0 +1,129 @@
+import io
+import tarfile
+from unittest.mock import Mock
+from src.common.snapshot_bundle import MIN_PART_SIZE, BundleReader, BundleWriter, MultipartUploadWriter
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+        self.parts = {}
+        self.calls = []
+        
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append('put_object')
+        self.objects[Key] = bytes(Body)
+        
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        self.calls.append('create_multipart_upload')
+        self.parts[Key] = {}
+        return {'UploadId': 'upload-1'}
+        
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.calls.append('upload_part')
+        self.parts[Key][PartNumber] = Body
+        return {'ETag': f'etag-{PartNumber}'}
+        
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self.calls.append('complete_multipart_upload')
+        parts = self.parts.pop(Key)
+        self.objects[Key] = b''.join(parts[part['PartNumber']] for part in MultipartUpload['Parts'])
+        
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.calls.append('abort_multipart_upload')
+        self.parts.pop(Key, None)
+        
+    def get_object(self, Bucket, Key, Range=None):
+        self.calls.append('get_object')
+        content = self.objects[Key]
+        if Range:
+            start, end = Range[len('bytes='):].split('-')
+            content = content[int(start):int(end) + 1]
+        return {'Body': io.BytesIO(content)}
+
+
+class TestMultipartUploadWriter:
+    def test_small_upload_uses_single_put(self):
+        s3 = FakeS3()
+        
+        writer = MultipartUploadWriter(s3, 'test-bucket', 'bundle.tar')
+        writer.write(b'small')
+        writer.close()
+        
+        assert s3.calls == ['put_object']
+        assert s3.objects['bundle.tar'] == b'small'
+        
+    def test_large_upload_streams_parts(self):
+        s3 = FakeS3()
+        data = bytes(range(256)) * (MIN_PART_SIZE // 256) * 2 + b'tail'
+        
+        writer = MultipartUploadWriter(s3, 'test-bucket', 'bundle.tar', part_size=1)
+        for offset in range(0, len(data), 1024 * 1024):
+            writer.write(data[offset:offset + 1024 * 1024])
+        assert len(writer._buffer) < MIN_PART_SIZE
+        writer.close()
+        
+        assert s3.calls.count('upload_part') == 3
+        assert s3.objects['bundle.tar'] == data
+        
+    def test_abort(self):
+        s3 = FakeS3()
+        
+        writer = MultipartUploadWriter(s3, 'test-bucket', 'bundle.tar', part_size=MIN_PART_SIZE)
+        writer.write(b'x' * MIN_PART_SIZE)
+        writer.abort()
+        
+        assert 'abort_multipart_upload' in s3.calls
+        assert 'bundle.tar' not in s3.objects
+
+
+class TestBundle:
+    def test_write_then_ranged_read(self):
+        s3 = FakeS3()
+        
+        writer = BundleWriter(s3, 'test-bucket', 'export/20240101120000/bundle.tar')
+        writer.add('dashboards/dash-001.json', b'{"Name": "Dashboard 1"}')
+        writer.add('dashboards/dash-002.json', b'\x1f\x8bcompressed', 'gzip')
+        writer.add('packages.csv', b'')
+        members = writer.close()
+        
+        reader = BundleReader(s3, 'test-bucket', 'export/20240101120000/bundle.tar', members)
+        s3.calls = []
+        
+        assert reader.read('dashboards/dash-001.json') == (b'{"Name": "Dashboard 1"}', None)
+        assert reader.read('dashboards/dash-002.json') == (b'\x1f\x8bcompressed', 'gzip')
+        assert reader.read('packages.csv') == (b'', None)
+        assert s3.calls == ['get_object', 'get_object']
+        
+    def test_bundle_is_plain_tar(self):
+        s3 = FakeS3()
+        
+        writer = BundleWriter(s3, 'test-bucket', 'bundle.tar')
+        writer.add('dashboards.csv', b'id,name\n')
+        writer.close()
+        
+        with tarfile.open(fileobj=io.BytesIO(s3.objects['bundle.tar'])) as tar:
+            assert tar.extractfile('dashboards.csv').read() == b'id,name\n'
+            
+    def test_read_without_index_streams_bundle(self):
+        s3 = FakeS3()
+        
+        writer = BundleWriter(s3, 'test-bucket', 'bundle.tar')
+        writer.add('packages.csv', b'package\n')
+        writer.add('dashboards.csv', b'dashboard\n')
+        writer.close()
+        
+        reader = BundleReader(s3, 'test-bucket', 'bundle.tar')
+        
+        assert reader.read('dashboards.csv') == (b'dashboard\n', None)
+        assert list(reader.iter_members()) == [('packages.csv', b'package\n'), ('dashboards.csv', b'dashboard\n')]
+        
+    def test_abort_skips_upload(self):
+        s3 = Mock()
+        
+        writer = BundleWriter(s3, 'test-bucket', 'bundle.tar')
+        writer.add('packages.csv', b'package\n')
+        writer.abort()
+        
+        s3.put_object.assert_not_called()
+        s3.abort_multipart_upload.assert_not_called()
@@ -0,0 +1,63 @@
+import gzip
+import io
+import json
+import pytest
+from unittest.mock import patch
+from src.common import snapshot_format
+from src.common.manifest import canonical_json
+from src.common.snapshot_format import encode_definition, load_definition, validate_format
+
+
+DEFINITION = {
+    'Name': 'ダッシュボード',
+    'DataSetIds': ['dataset1'],
+    'Sheets': [{'SheetId': 'sheet1', 'Visuals': []}]
+}
+
+
+class TestSnapshotFormat:
+    def test_pretty_format_is_indented_json(self):
+        content, content_encoding = encode_definition(DEFINITION)
+        
+        assert content_encoding is None
+        assert content == json.dumps(DEFINITION, indent=2).encode('utf-8')
+        assert load_definition(io.BytesIO(content)) == DEFINITION
+        
+    def test_gzip_format_is_compressed_canonical_json(self):
+        content, content_encoding = encode_definition(DEFINITION, 'gzip')
+        
+        assert content_encoding == 'gzip'
+        assert gzip.decompress(content) == canonical_json(DEFINITION).encode('utf-8')
+        assert load_definition(io.BytesIO(content), 'gzip') == DEFINITION
+        
+    def test_gzip_output_is_deterministic(self):
+        assert encode_definition(DEFINITION, 'gzip') == encode_definition(DEFINITION, 'gzip')
+        
+    def test_gzip_detected_without_content_encoding(self):
+        content, _ = encode_definition(DEFINITION, 'gzip')
+        
+        assert load_definition(io.BytesIO(content)) == DEFINITION
+        assert load_definition(content) == DEFINITION
+        
+    def test_zstd_round_trip(self):
+        pytest.importorskip('zstandard')
+        content, content_encoding = encode_definition(DEFINITION, 'zstd')
+        
+        assert content_encoding == 'zstd'
+        assert load_definition(io.BytesIO(content), 'zstd') == DEFINITION
+        assert load_definition(content) == DEFINITION
+        
+    def test_zstd_requires_zstandard(self):
+        with patch.object(snapshot_format, 'zstandard', None):
+            with pytest.raises(ValueError, match='zstandard'):
+                validate_format('zstd')
+            with pytest.raises(ValueError, match='zstandard'):
+                load_definition(io.BytesIO(b''), 'zstd')
+                
+    def test_unsupported_format(self):
+        with pytest.raises(ValueError, match='Unsupported snapshot format'):
+            encode_definition(DEFINITION, 'bzip2')
+            
+    def test_unsupported_content_encoding(self):
+        with pytest.raises(ValueError, match='Unsupported content encoding'):
+            load_definition(io.BytesIO(b'{}'), 'br')
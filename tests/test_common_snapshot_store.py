@@ -0,0 +1,276 @@
+import pytest
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+from src.common.manifest import SnapshotManifest
+from src.common.snapshot_store import SnapshotStore
+
+
+def _no_such_key():
+    return ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+
+
+class TestSnapshotStore:
+    def test_list_snapshots_paginated(self):
+        mock_s3_client = Mock()
+        mock_s3_client.list_objects_v2.side_effect = [
+            {
+                'CommonPrefixes': [{'Prefix': 'export/20240102120000/'}],
+                'NextContinuationToken': 'token1'
+            },
+            {
+                'CommonPrefixes': [{'Prefix': 'export/20240101120000/'}]
+            }
+        ]
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        snapshots = store.list_snapshots()
+        
+        assert snapshots == ['20240101120000', '20240102120000']
+        mock_s3_client.list_objects_v2.assert_called_with(
+            Bucket='test-bucket',
+            Prefix='export/',
+            Delimiter='/',
+            ContinuationToken='token1'
+        )
+        
+    def test_get_latest_snapshot_from_pointer(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.return_value = {
+            'Body': Mock(read=Mock(return_value=b'20240103120000\n'))
+        }
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.get_latest_snapshot() == '20240103120000'
+        mock_s3_client.get_object.assert_called_once_with(Bucket='test-bucket', Key='export/LATEST')
+        mock_s3_client.list_objects_v2.assert_not_called()
+        
+    def test_get_latest_snapshot_fallback_listing(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_s3_client.list_objects_v2.return_value = {
+            'CommonPrefixes': [
+                {'Prefix': 'export/20240102120000/'},
+                {'Prefix': 'export/20240101120000/'}
+            ]
+        }
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.get_latest_snapshot() == '20240102120000'
+        
+    def test_get_latest_snapshot_fallback_skips_incomplete(self):
+        def get_object(Bucket, Key):
+            if Key == 'export/20240102120000/checkpoint.json':
+                return {'Body': Mock(read=Mock(return_value=b'{}'))}
+            raise _no_such_key()
+            
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = get_object
+        mock_s3_client.list_objects_v2.return_value = {
+            'CommonPrefixes': [
+                {'Prefix': 'export/20240101120000/'},
+                {'Prefix': 'export/20240102120000/'}
+            ]
+        }
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.get_latest_snapshot() == '20240101120000'
+        
+    def test_is_complete(self):
+        objects = {
+            'export/20240101120000/_COMPLETE': b'20240101120000',
+            'export/20240101120000/checkpoint.json': b'{}',
+            'export/20240102120000/checkpoint.json': b'{}'
+        }
+        
+        def get_object(Bucket, Key):
+            if Key in objects:
+                return {'Body': Mock(read=Mock(return_value=objects[Key]))}
+            raise _no_such_key()
+            
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = get_object
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.is_complete('20240101120000') is True
+        assert store.is_complete('20240102120000') is False
+        assert store.is_complete('20231201120000') is True
+        
+    def test_mark_complete(self):
+        mock_s3_client = Mock()
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        store.mark_complete('20240101120000')
+        
+        mock_s3_client.put_object.assert_called_once_with(
+            Bucket='test-bucket', Key='export/20240101120000/_COMPLETE', Body='20240101120000'
+        )
+        
+    def test_get_latest_snapshot_empty_prefix(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_s3_client.list_objects_v2.return_value = {}
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.get_latest_snapshot() is None
+        
+    def test_update_pointers(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        store.update_latest_pointer('20240101120000')
+        store.update_deployed_pointer('intg', '20240101120000')
+        
+        mock_s3_client.put_object.assert_any_call(
+            Bucket='test-bucket', Key='export/LATEST', Body='20240101120000'
+        )
+        mock_s3_client.put_object.assert_any_call(
+            Bucket='test-bucket', Key='export/DEPLOYED_intg', Body='20240101120000'
+        )
+        
+    def test_update_latest_pointer_only_moves_forward(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.return_value = {'Body': Mock(read=Mock(return_value=b'20240102000000'))}
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.update_latest_pointer('20240101000000') is False
+        mock_s3_client.put_object.assert_not_called()
+        assert store.update_latest_pointer('20240103000000') is True
+        mock_s3_client.put_object.assert_called_once_with(
+            Bucket='test-bucket', Key='export/LATEST', Body='20240103000000'
+        )
+        
+    def test_deploy_state(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.load_deploy_state('intg') is None
+        
+        state = {'Snapshot': '20240101120000', 'Dashboards': {'dash-001': 'abc'}}
+        store.save_deploy_state('intg', state)
+        body = mock_s3_client.put_object.call_args.kwargs['Body']
+        mock_s3_client.put_object.assert_called_once_with(
+            Bucket='test-bucket', Key='export/DEPLOY_STATE_intg.json', Body=body
+        )
+        
+        mock_s3_client.get_object.side_effect = None
+        mock_s3_client.get_object.return_value = {'Body': Mock(read=Mock(return_value=body.encode('utf-8')))}
+        assert store.load_deploy_state('intg') == state
+        
+    def test_run_journal(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.load_run_journal('intg') is None
+        
+        journal = {
+            'Snapshot': '20240101120000',
+            'Dashboards': {'dash-001': {'Status': 'updated', 'PreviousVersion': 3}}
+        }
+        store.save_run_journal('intg', journal)
+        store.save_run_journal(None, journal)
+        body = mock_s3_client.put_object.call_args.kwargs['Body']
+        assert [call.kwargs['Key'] for call in mock_s3_client.put_object.call_args_list] == [
+            'export/DEPLOY_JOURNAL_intg.json', 'export/DEPLOY_JOURNAL.json'
+        ]
+        
+        mock_s3_client.get_object.side_effect = None
+        mock_s3_client.get_object.return_value = {'Body': Mock(read=Mock(return_value=body.encode('utf-8')))}
+        assert store.load_run_journal(None) == journal
+        
+    def test_read_file_missing(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.read_file('20240101120000', 'manifest.json') is None
+        
+    def test_read_file_other_error(self):
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDenied', 'Message': 'Denied'}}, 'GetObject'
+        )
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        with pytest.raises(ClientError):
+            store.read_file('20240101120000', 'manifest.json')
+            
+    def test_copy_file(self):
+        mock_s3_client = Mock()
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        store.copy_file('20240101120000', '20240102120000', 'dashboards/dash-001.json')
+        
+        mock_s3_client.copy_object.assert_called_once_with(
+            Bucket='test-bucket',
+            Key='export/20240102120000/dashboards/dash-001.json',
+            CopySource={
+                'Bucket': 'test-bucket',
+                'Key': 'export/20240101120000/dashboards/dash-001.json'
+            }
+        )
+        
+    def test_find_previous_manifest_skips_snapshots_without_manifest(self):
+        manifest = SnapshotManifest('20240101120000')
+        manifest.add_dashboard({'DashboardId': 'dash-001'})
+        
+        def get_object(Bucket, Key):
+            if Key == 'export/20240101120000/manifest.json':
+                return {'Body': Mock(read=Mock(return_value=manifest.to_json().encode()))}
+            raise _no_such_key()
+            
+        mock_s3_client = Mock()
+        mock_s3_client.list_objects_v2.return_value = {
+            'CommonPrefixes': [
+                {'Prefix': 'export/20240101120000/'},
+                {'Prefix': 'export/20240102120000/'},
+                {'Prefix': 'export/20240103120000/'}
+            ]
+        }
+        mock_s3_client.get_object.side_effect = get_object
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        previous = store.find_previous_manifest('20240103120000')
+        
+        assert previous.timestamp == '20240101120000'
+        assert previous.get_dashboard('dash-001') is not None
+        
+    def test_filtered_snapshots_skipped(self):
+        full = SnapshotManifest('20240101120000')
+        full.add_dashboard({'DashboardId': 'dash-001'})
+        filtered = SnapshotManifest('20240102120000', dashboard_filter='1 dashboard IDs')
+        manifests = {
+            'export/20240101120000/manifest.json': full,
+            'export/20240102120000/manifest.json': filtered
+        }
+        
+        def get_object(Bucket, Key):
+            if Key in manifests:
+                return {'Body': Mock(read=Mock(return_value=manifests[Key].to_json().encode()))}
+            raise _no_such_key()
+            
+        mock_s3_client = Mock()
+        mock_s3_client.list_objects_v2.return_value = {
+            'CommonPrefixes': [
+                {'Prefix': 'export/20240101120000/'},
+                {'Prefix': 'export/20240102120000/'}
+            ]
+        }
+        mock_s3_client.get_object.side_effect = get_object
+        
+        store = SnapshotStore(mock_s3_client, 'test-bucket', 'export/')
+        
+        assert store.get_latest_snapshot() == '20240101120000'
+        assert store.find_previous_manifest('20240103120000').timestamp == '20240101120000'
@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import Mock
+from src.common.manifest import SnapshotManifest
+from src.dashboard_export.checkpoint import ExportCheckpoint
+
+
+class TestExportCheckpoint:
+    def test_start_writes_empty_journal(self):
+        mock_store = Mock()
+        
+        ExportCheckpoint.start(mock_store, '20240101120000')
+        
+        timestamp, filename, content = mock_store.write_file.call_args.args
+        assert (timestamp, filename) == ('20240101120000', 'checkpoint.json')
+        assert SnapshotManifest.from_json(content).dashboards == {}
+        
+    def test_record_flushes_every_interval(self):
+        mock_store = Mock()
+        checkpoint = ExportCheckpoint(mock_store, '20240101120000', flush_interval=2)
+        
+        checkpoint.record({'DashboardId': 'dash-001'})
+        mock_store.write_file.assert_not_called()
+        checkpoint.record({'DashboardId': 'dash-002'})
+        checkpoint.record({'DashboardId': 'dash-003'})
+        
+        assert mock_store.write_file.call_count == 1
+        journal = SnapshotManifest.from_json(mock_store.write_file.call_args.args[2])
+        assert sorted(journal.dashboards) == ['dash-001', 'dash-002']
+        assert checkpoint.get('dash-003') == {'DashboardId': 'dash-003'}
+        
+    def test_resume(self):
+        journal = SnapshotManifest('20240101120000', {'dash-001': {'DashboardId': 'dash-001'}})
+        mock_store = Mock()
+        mock_store.is_complete.return_value = False
+        mock_store.load_checkpoint.return_value = journal
+        
+        checkpoint = ExportCheckpoint.resume(mock_store, '20240101120000')
+        
+        assert checkpoint.get('dash-001') == {'DashboardId': 'dash-001'}
+        
+    def test_resume_complete_snapshot(self):
+        mock_store = Mock()
+        mock_store.is_complete.return_value = True
+        
+        with pytest.raises(ValueError, match='already complete'):
+            ExportCheckpoint.resume(mock_store, '20240101120000')
+            
+    def test_resume_without_checkpoint(self):
+        mock_store = Mock()
+        mock_store.is_complete.return_value = False
+        mock_store.load_checkpoint.return_value = None
+        
+        with pytest.raises(ValueError, match='No checkpoint found'):
+            ExportCheckpoint.resume(mock_store, '20240101120000')
+            
+    def test_complete(self):
+        mock_store = Mock()
+        
+        ExportCheckpoint(mock_store, '20240101120000').complete()
+        
+        mock_store.mark_complete.assert_called_once_with('20240101120000')
+        mock_store.delete_file.assert_called_once_with('20240101120000', 'checkpoint.json')
@@ -58,4 +58,17 @@ class TestCSVGenerator:
         
         lines = csv_content.strip().split('\n')
         assert '"Dashboard with, comma"' in lines[1]
-        assert '"Dashboard with ""quotes"""' in lines[2]
\ No newline at end of file
+        assert '"Dashboard with ""quotes"""' in lines[2]        
+    def test_generate_dashboards_csv_with_folder_path(self):
+        dashboards = [
+            {'DashboardId': 'dash-001', 'Name': 'Sales Dashboard', 'FolderPath': 'release/sales'},
+            {'DashboardId': 'dash-002', 'Name': 'Profit Analysis', 'FolderPath': None}
+        ]
+        
+        generator = CSVGenerator()
+        csv_content = generator.generate_dashboards_csv(dashboards)
+        
+        lines = [line.strip() for line in csv_content.strip().split('\n')]
+        assert lines[0] == "package_id,dashboard_id,dashboard_name,label,order,category,tags,description,folder_path"
+        assert lines[1] == ",dash-001,Sales Dashboard,,,,,,release/sales"
+        assert lines[2] == ",dash-002,Profit Analysis,,,,,,"
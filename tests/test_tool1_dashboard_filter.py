@@ -0,0 +1,64 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock
+from src.dashboard_export.dashboard_filter import DashboardFilter
+
+
+def _config(values):
+    config = Mock()
+    config.get.side_effect = lambda key, default=None: values.get(key, default)
+    return config
+
+
+class TestDashboardFilter:
+    def test_from_config_inactive(self):
+        assert DashboardFilter.from_config(_config({})) is None
+        
+    def test_from_config(self):
+        dashboard_filter = DashboardFilter.from_config(_config({
+            'EXPORT_FILTER_NAME': 'Sales*',
+            'EXPORT_FILTER_UPDATED_SINCE': '2024-01-01T00:00:00+09:00',
+            'EXPORT_FILTER_FOLDER_ARN': 'arn:aws:quicksight:ap-northeast-1:123456789012:folder/folder-001',
+            'EXPORT_FILTER_DASHBOARD_IDS': 'dash-001, dash-002,'
+        }))
+        
+        assert dashboard_filter.name_pattern == 'Sales*'
+        assert dashboard_filter.updated_since == datetime(2023, 12, 31, 15, 0, tzinfo=timezone.utc)
+        assert dashboard_filter.folder_id == 'folder-001'
+        assert dashboard_filter.dashboard_ids == ['dash-001', 'dash-002']
+        
+    def test_search_filters_use_longest_literal(self):
+        dashboard_filter = DashboardFilter(name_pattern='*Sales*2024')
+        
+        assert dashboard_filter.search_filters() == [
+            {'Operator': 'StringLike', 'Name': 'DASHBOARD_NAME', 'Value': 'Sales'}
+        ]
+        assert DashboardFilter(name_pattern='*').search_filters() is None
+        assert DashboardFilter(dashboard_ids=['dash-001']).search_filters() is None
+        
+    @pytest.mark.parametrize('pattern, name, expected', [
+        ('sales', 'Monthly Sales Report', True),
+        ('Sales*', 'sales 2024', True),
+        ('Sales*', 'Monthly Sales', False),
+        ('Sales ????', 'Sales 2024', True)
+    ])
+    def test_matches_name(self, pattern, name, expected):
+        dashboard_filter = DashboardFilter(name_pattern=pattern)
+        
+        assert dashboard_filter.matches({'DashboardId': 'dash-001', 'Name': name}) is expected
+        
+    def test_matches_updated_since_and_ids(self):
+        dashboard_filter = DashboardFilter(
+            updated_since=datetime(2024, 1, 1), dashboard_ids=['dash-001', 'dash-002']
+        )
+        
+        assert dashboard_filter.matches({
+            'DashboardId': 'dash-001', 'LastUpdatedTime': datetime(2024, 1, 2, tzinfo=timezone.utc)
+        }) is True
+        assert dashboard_filter.matches({
+            'DashboardId': 'dash-002', 'LastUpdatedTime': datetime(2023, 12, 31, tzinfo=timezone.utc)
+        }) is False
+        assert dashboard_filter.matches({'DashboardId': 'dash-002'}) is False
+        assert dashboard_filter.matches({
+            'DashboardId': 'dash-003', 'LastUpdatedTime': datetime(2024, 1, 2, tzinfo=timezone.utc)
+        }) is False
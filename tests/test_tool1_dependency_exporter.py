@@ -0,0 +1,97 @@
+import pytest
+import threading
+from datetime import datetime
+from unittest.mock import Mock
+from src.common.concurrency import WorkerPool
+from src.dashboard_export.dependency_exporter import DependencyExporter, extract_dependencies
+
+
+ARN_PREFIX = 'arn:aws:quicksight:ap-northeast-1:123456789012'
+
+
+def _data_set(dataset_id, data_source_ids=(), parent_ids=()):
+    return {
+        'DataSetId': dataset_id,
+        'LastUpdatedTime': datetime(2024, 1, 1),
+        'PhysicalTableMap': {
+            f'table-{index}': {'RelationalTable': {'DataSourceArn': f'{ARN_PREFIX}:datasource/{data_source_id}'}}
+            for index, data_source_id in enumerate(data_source_ids)
+        },
+        'LogicalTableMap': {
+            f'logical-{index}': {'Source': {'DataSetArn': f'{ARN_PREFIX}:dataset/{parent_id}'}}
+            for index, parent_id in enumerate(parent_ids)
+        }
+    }
+
+
+def test_extract_dependencies():
+    definition = {
+        'DataSetIdentifierDeclarations': [
+            {'Identifier': 'sales', 'DataSetArn': f'{ARN_PREFIX}:dataset/ds-002'},
+            {'Identifier': 'costs', 'DataSetArn': f'{ARN_PREFIX}:dataset/ds-001'},
+            {'Identifier': 'sales2', 'DataSetArn': f'{ARN_PREFIX}:dataset/ds-002'}
+        ]
+    }
+    
+    assert extract_dependencies(definition, f'{ARN_PREFIX}:theme/theme-001') == {
+        'DataSets': ['ds-001', 'ds-002'],
+        'Theme': 'theme-001'
+    }
+    assert extract_dependencies(definition, 'arn:aws:quicksight::aws:theme/MIDNIGHT')['Theme'] is None
+    assert extract_dependencies({}) == {'DataSets': [], 'Theme': None}
+
+
+class TestDependencyExporter:
+    def test_export_dedupes_shared_assets(self):
+        data_sets = {
+            'ds-001': _data_set('ds-001', ['src-001']),
+            'ds-002': _data_set('ds-002', ['src-001', 'src-002'], ['ds-003']),
+            'ds-003': _data_set('ds-003', ['src-002'])
+        }
+        mock_client = Mock()
+        mock_client.get_data_set.side_effect = lambda dataset_id: data_sets[dataset_id]
+        mock_client.get_data_source.side_effect = lambda data_source_id: {'DataSourceId': data_source_id}
+        mock_client.get_theme.side_effect = lambda theme_id: {'ThemeId': theme_id}
+        
+        written = {}
+        lock = threading.Lock()
+        
+        def write_file(filename, asset):
+            with lock:
+                assert filename not in written
+                written[filename] = asset
+                
+        entries = {
+            f'dash-00{i}': {
+                'DashboardId': f'dash-00{i}',
+                'Dependencies': {'DataSets': ['ds-001', 'ds-002'], 'Theme': 'theme-001'}
+            }
+            for i in range(1, 6)
+        }
+        entries['dash-009'] = {'DashboardId': 'dash-009'}
+        
+        exporter = DependencyExporter(mock_client, write_file, WorkerPool(4))
+        graph = exporter.export(entries)
+        
+        assert mock_client.get_data_set.call_count == 3
+        assert mock_client.get_data_source.call_count == 2
+        assert mock_client.get_theme.call_count == 1
+        assert sorted(written) == [
+            'datasets/ds-001.json', 'datasets/ds-002.json', 'datasets/ds-003.json',
+            'datasources/src-001.json', 'datasources/src-002.json',
+            'themes/theme-001.json'
+        ]
+        assert written['datasets/ds-001.json']['LastUpdatedTime'] == '2024-01-01 00:00:00'
+        assert graph['DataSets']['ds-002'] == {'DataSources': ['src-001', 'src-002'], 'DataSets': ['ds-003']}
+        assert graph['DataSources'] == ['src-001', 'src-002']
+        assert graph['Themes'] == ['theme-001']
+        assert set(graph['Dashboards']) == {f'dash-00{i}' for i in range(1, 6)}
+        
+    def test_export_reports_failures(self):
+        mock_client = Mock()
+        mock_client.get_data_set.side_effect = Exception('AccessDeniedException')
+        
+        exporter = DependencyExporter(mock_client, Mock(), WorkerPool(2))
+        
+        with pytest.raises(RuntimeError, match='Failed to export 1 of 1 datasets: ds-001'):
+            exporter.export({'dash-001': {'Dependencies': {'DataSets': ['ds-001'], 'Theme': None}}})
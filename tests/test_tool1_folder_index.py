@@ -0,0 +1,131 @@
+import json
+import pytest
+from unittest.mock import Mock
+from src.dashboard_export.folder_index import FolderIndex, build_paths, normalize_path
+
+
+def _mock_quicksight(folders):
+    quicksight = Mock()
+    quicksight.list_folders.return_value = {
+        'FolderSummaryList': [
+            {'FolderId': folder_id, 'Name': name, 'Arn': f'arn:folder/{folder_id}'}
+            for folder_id, name, _ in folders
+        ]
+    }
+    parents = {folder_id: parent for folder_id, _, parent in folders}
+    
+    def describe_folder(AwsAccountId, FolderId):
+        ancestors = []
+        current = parents[FolderId]
+        while current:
+            ancestors.insert(0, f'arn:folder/{current}')
+            current = parents[current]
+        return {'Folder': {'FolderId': FolderId, 'FolderPath': ancestors}}
+        
+    quicksight.describe_folder.side_effect = describe_folder
+    return quicksight
+
+
+FOLDERS = [
+    ('folder-001', 'release', None),
+    ('folder-002', 'finance', 'folder-001'),
+    ('folder-003', 'monthly', 'folder-002'),
+    ('folder-004', 'finance', None)
+]
+
+
+class TestFolderIndex:
+    def test_resolve_nested_paths(self):
+        index = FolderIndex(_mock_quicksight(FOLDERS), '123456789012', max_workers=4)
+        
+        assert index.resolve('release/') == 'folder-001'
+        assert index.resolve('release/finance') == 'folder-002'
+        assert index.resolve('/release/finance/monthly/') == 'folder-003'
+        assert index.resolve('finance') == 'folder-004'
+        assert index.resolve('release/missing') is None
+        
+    def test_children_and_paths(self):
+        index = FolderIndex(_mock_quicksight(FOLDERS), '123456789012')
+        
+        assert index.children('folder-001') == ['folder-002']
+        assert index.children('folder-003') == []
+        assert index.get_path('folder-003') == 'release/finance/monthly'
+        
+    def test_cache_reused_within_ttl(self, tmp_path):
+        cache_path = str(tmp_path / 'folders.json')
+        quicksight = _mock_quicksight(FOLDERS)
+        
+        FolderIndex(quicksight, '123456789012', cache_path, clock=lambda: 1000.0).resolve('release')
+        index = FolderIndex(quicksight, '123456789012', cache_path, clock=lambda: 1500.0)
+        
+        assert index.resolve('release/finance') == 'folder-002'
+        assert quicksight.list_folders.call_count == 1
+        assert json.loads(open(cache_path).read())['AwsAccountId'] == '123456789012'
+        
+    def test_cache_expired(self, tmp_path):
+        cache_path = str(tmp_path / 'folders.json')
+        quicksight = _mock_quicksight(FOLDERS)
+        
+        FolderIndex(quicksight, '123456789012', cache_path, 60, clock=lambda: 1000.0).resolve('release')
+        FolderIndex(quicksight, '123456789012', cache_path, 60, clock=lambda: 1060.0).resolve('release')
+        
+        assert quicksight.list_folders.call_count == 2
+        
+    def test_cache_for_other_account_ignored(self, tmp_path):
+        cache_path = str(tmp_path / 'folders.json')
+        quicksight = _mock_quicksight(FOLDERS)
+        
+        FolderIndex(quicksight, '123456789012', cache_path).resolve('release')
+        FolderIndex(quicksight, '987654321098', cache_path).resolve('release')
+        
+        assert quicksight.list_folders.call_count == 2
+        
+    def test_cache_invalidated_on_miss(self, tmp_path):
+        cache_path = str(tmp_path / 'folders.json')
+        FolderIndex(_mock_quicksight(FOLDERS[:1]), '123456789012', cache_path).resolve('release')
+        quicksight = _mock_quicksight(FOLDERS)
+        
+        index = FolderIndex(quicksight, '123456789012', cache_path)
+        
+        assert index.resolve('release') == 'folder-001'
+        quicksight.list_folders.assert_not_called()
+        assert index.resolve('release/finance') == 'folder-002'
+        assert quicksight.list_folders.call_count == 1
+        assert index.resolve('release/missing') is None
+        assert quicksight.list_folders.call_count == 1
+        
+    def test_ensure_fresh_replaces_cached_tree(self, tmp_path):
+        cache_path = str(tmp_path / 'folders.json')
+        FolderIndex(_mock_quicksight(FOLDERS[:2]), '123456789012', cache_path).resolve('release')
+        quicksight = _mock_quicksight(FOLDERS)
+        
+        index = FolderIndex(quicksight, '123456789012', cache_path)
+        assert index.resolve('release/finance') == 'folder-002'
+        assert index.children('folder-002') == []
+        
+        index.ensure_fresh()
+        assert index.children('folder-002') == ['folder-003']
+        index.ensure_fresh()
+        assert quicksight.list_folders.call_count == 1
+        
+    def test_describe_errors_raised(self):
+        quicksight = _mock_quicksight(FOLDERS)
+        quicksight.describe_folder.side_effect = Exception('AccessDenied')
+        
+        index = FolderIndex(quicksight, '123456789012')
+        
+        with pytest.raises(RuntimeError, match='Failed to describe 4 of 4 folders'):
+            index.resolve('release')
+
+
+def test_normalize_path():
+    assert normalize_path('/release//finance/') == 'release/finance'
+
+
+def test_build_paths_ignores_parent_cycles():
+    folders = {
+        'a': {'Arn': 'arn:a', 'Name': 'a', 'ParentArn': 'arn:b'},
+        'b': {'Arn': 'arn:b', 'Name': 'b', 'ParentArn': 'arn:a'}
+    }
+    
+    assert build_paths(folders) == {'b/a': 'a', 'a/b': 'b'}
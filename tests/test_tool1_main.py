@@ -1,10 +1,18 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import gzip
+import io
 import json
 from datetime import datetime
+from botocore.exceptions import ClientError
+from src.common.manifest import SnapshotManifest, content_hash
+from src.common.sharding import Shard
 from src.dashboard_export.main import DashboardExporter, main
 
 
+def _no_such_key():
+    return ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+
 class TestDashboardExporter:
     @patch('src.dashboard_export.main.AWSClientManager')
     @patch('src.dashboard_export.main.Config')
@@ -17,7 +25,9 @@ class TestDashboardExporter:
             'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
             'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
         }[key]
-        mock_config_instance.get.return_value = 'release/'
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'QUICKSIGHT_FOLDER_PATH': 'release/'
+        }.get(key, default)
         mock_config.return_value = mock_config_instance
         
         exporter = DashboardExporter()
@@ -41,7 +51,9 @@ class TestDashboardExporter:
             'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
             'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
         }[key]
-        mock_config_instance.get.return_value = 'release/'
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'QUICKSIGHT_FOLDER_PATH': 'release/'
+        }.get(key, default)
         mock_config.return_value = mock_config_instance
         
         mock_qs_client = Mock()
@@ -55,13 +67,219 @@ class TestDashboardExporter:
         mock_qs_client_class.return_value = mock_qs_client
         
         mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
         mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
         
         exporter = DashboardExporter()
         timestamp = exporter.export_dashboards()
         
         assert timestamp is not None
-        assert mock_s3_client.put_object.call_count == 3  
+        assert mock_s3_client.put_object.call_count == 7
+        keys = [call.kwargs['Key'] for call in mock_s3_client.put_object.call_args_list]
+        assert keys[0] == f'test-prefix/{timestamp}/checkpoint.json'
+        assert keys[-3:] == [
+            f'test-prefix/{timestamp}/manifest.json',
+            f'test-prefix/{timestamp}/_COMPLETE',
+            'test-prefix/LATEST'
+        ]
+        mock_s3_client.delete_object.assert_called_once_with(
+            Bucket='test-bucket',
+            Key=f'test-prefix/{timestamp}/checkpoint.json'
+        )
+        mock_s3_client.put_object.assert_called_with(
+            Bucket='test-bucket',
+            Key='test-prefix/LATEST',
+            Body=timestamp
+        )
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_filtered_keeps_latest(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_FILTER_DASHBOARD_IDS': 'dash-001'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': 'dash-001', 'Name': 'Dashboard 1'}
+        ]
+        mock_qs_client.get_dashboard_definition.return_value = {'DashboardId': 'dash-001', 'Name': 'Dashboard 1'}
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        timestamp = DashboardExporter().export_dashboards()
+        
+        bodies = {call.kwargs['Key']: call.kwargs['Body'] for call in mock_s3_client.put_object.call_args_list}
+        assert 'test-prefix/LATEST' not in bodies
+        assert f'test-prefix/{timestamp}/_COMPLETE' in bodies
+        manifest = SnapshotManifest.from_json(bodies[f'test-prefix/{timestamp}/manifest.json'])
+        assert manifest.dashboard_filter == '1 dashboard IDs'
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_concurrent(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_MAX_WORKERS': '4'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': f'dash-00{i}', 'Name': f'Dashboard {i}'} for i in range(1, 6)
+        ]
+        mock_qs_client.get_dashboard_definition.side_effect = lambda dashboard_id: {
+            'DashboardId': dashboard_id
+        }
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        exporter.export_dashboards()
+        
+        assert exporter.max_workers == 4
+        mock_aws_manager.assert_called_with('ap-northeast-1', 4)
+        assert mock_qs_client.get_dashboard_definition.call_count == 5
+        assert mock_s3_client.put_object.call_count == 11
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_collects_failures(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_MAX_WORKERS': '2'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        def get_definition(dashboard_id):
+            if dashboard_id == 'dash-002':
+                raise Exception('ThrottlingException')
+            return {'DashboardId': dashboard_id}
+            
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': 'dash-001', 'Name': 'Dashboard 1'},
+            {'DashboardId': 'dash-002', 'Name': 'Dashboard 2'},
+            {'DashboardId': 'dash-003', 'Name': 'Dashboard 3'}
+        ]
+        mock_qs_client.get_dashboard_definition.side_effect = get_definition
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_s3_client = Mock()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        
+        with pytest.raises(RuntimeError, match='Failed to export 1 of 3 dashboards: dash-002'):
+            exporter.export_dashboards()
+            
+        saved_keys = [call.kwargs['Key'] for call in mock_s3_client.put_object.call_args_list]
+        dashboard_keys = [key for key in saved_keys if '/dashboards/' in key]
+        assert len(dashboard_keys) == 2
+        assert all(key.endswith(('dash-001.json', 'dash-003.json')) for key in dashboard_keys)
+        assert saved_keys[-1].endswith('/checkpoint.json')
+        journal = SnapshotManifest.from_json(mock_s3_client.put_object.call_args_list[-1].kwargs['Body'])
+        assert sorted(journal.dashboards) == ['dash-001', 'dash-003']
+        assert not any(key.endswith(('manifest.json', '_COMPLETE', 'LATEST')) for key in saved_keys)
+        
+    @patch('src.dashboard_export.main.SnapshotStore')
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_incremental(self, mock_qs_client_class, mock_config, mock_aws_manager,
+                                           mock_store_class):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_INCREMENTAL': 'true'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        updated = datetime(2024, 1, 1, 12, 0, 0)
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': 'dash-001', 'Name': 'Dashboard 1',
+             'LastUpdatedTime': updated, 'PublishedVersionNumber': 3},
+            {'DashboardId': 'dash-002', 'Name': 'Dashboard 2',
+             'LastUpdatedTime': datetime(2024, 1, 2), 'PublishedVersionNumber': 5},
+            {'DashboardId': 'dash-003', 'Name': 'Dashboard 3',
+             'LastUpdatedTime': updated, 'PublishedVersionNumber': 1}
+        ]
+        mock_qs_client.get_dashboard_definition.side_effect = lambda dashboard_id: {
+            'DashboardId': dashboard_id
+        }
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        previous_manifest = SnapshotManifest('20240101000000', {
+            'dash-001': {'DashboardId': 'dash-001', 'Name': 'Dashboard 1',
+                         'LastUpdatedTime': updated.isoformat(), 'VersionNumber': 3,
+                         'ExportedAt': '20231201000000'},
+            'dash-002': {'DashboardId': 'dash-002', 'Name': 'Dashboard 2',
+                         'LastUpdatedTime': updated.isoformat(), 'VersionNumber': 4,
+                         'ExportedAt': '20231201000000'}
+        })
+        mock_store = mock_store_class.return_value
+        mock_store.find_previous_manifest.return_value = previous_manifest
+        
+        mock_s3_client = Mock()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        timestamp = exporter.export_dashboards()
+        
+        mock_store.copy_file.assert_called_once_with(
+            '20240101000000', timestamp, 'dashboards/dash-001.json'
+        )
+        exported_ids = [call.args[0] for call in mock_qs_client.get_dashboard_definition.call_args_list]
+        assert sorted(exported_ids) == ['dash-002', 'dash-003']
+        
+        manifest_call = mock_s3_client.put_object.call_args_list[-1]
+        assert manifest_call.kwargs['Key'] == f'test-prefix/{timestamp}/manifest.json'
+        manifest = SnapshotManifest.from_json(manifest_call.kwargs['Body'])
+        assert manifest.get_dashboard('dash-001')['ExportedAt'] == '20231201000000'
+        assert manifest.get_dashboard('dash-002')['ExportedAt'] == timestamp
+        assert manifest.get_dashboard('dash-002')['VersionNumber'] == 5
+        assert manifest.get_dashboard('dash-002')['Sha256'] == content_hash({'DashboardId': 'dash-002'})
+        assert manifest.get_dashboard('dash-002')['Size'] > 0
+        assert set(manifest.files) == {'packages.csv', 'dashboards.csv'}
         
     @patch('src.dashboard_export.main.AWSClientManager')
     @patch('src.dashboard_export.main.Config')
@@ -75,7 +293,9 @@ class TestDashboardExporter:
             'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
             'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
         }[key]
-        mock_config_instance.get.return_value = 'release/'
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'QUICKSIGHT_FOLDER_PATH': 'release/'
+        }.get(key, default)
         mock_config.return_value = mock_config_instance
         
         mock_s3_client = Mock()
@@ -89,7 +309,464 @@ class TestDashboardExporter:
             Key='test-prefix/20240101120000/test.json',
             Body='test content'
         )
-
+        
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_gzip_format(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_SNAPSHOT_FORMAT': 'gzip'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        definition = {'DashboardId': 'dash-001', 'Name': 'Dashboard 1', 'Sheets': [{'SheetId': 's1'}]}
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': 'dash-001', 'Name': 'Dashboard 1'}
+        ]
+        mock_qs_client.get_dashboard_definition.return_value = definition
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        exporter.export_dashboards()
+        
+        dashboard_call = [
+            call for call in mock_s3_client.put_object.call_args_list
+            if call.kwargs['Key'].endswith('dashboards/dash-001.json')
+        ][0]
+        assert dashboard_call.kwargs['ContentEncoding'] == 'gzip'
+        assert json.loads(gzip.decompress(dashboard_call.kwargs['Body'])) == definition
+        
+        manifest = SnapshotManifest.from_json(mock_s3_client.put_object.call_args_list[-3].kwargs['Body'])
+        entry = manifest.get_dashboard('dash-001')
+        assert entry['Sha256'] == content_hash(definition)
+        assert entry['Size'] == len(dashboard_call.kwargs['Body'])
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_bundle(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_BUNDLE': 'true'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': f'dash-00{i}', 'Name': f'Dashboard {i}'} for i in range(1, 4)
+        ]
+        mock_qs_client.get_dashboard_definition.side_effect = lambda dashboard_id: {'DashboardId': dashboard_id}
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        timestamp = exporter.export_dashboards()
+        
+        keys = [call.kwargs['Key'] for call in mock_s3_client.put_object.call_args_list]
+        assert keys == [
+            f'test-prefix/{timestamp}/checkpoint.json',
+            f'test-prefix/{timestamp}/bundle.tar',
+            f'test-prefix/{timestamp}/manifest.json',
+            f'test-prefix/{timestamp}/_COMPLETE',
+            'test-prefix/LATEST'
+        ]
+        bundle = mock_s3_client.put_object.call_args_list[1].kwargs['Body']
+        manifest = SnapshotManifest.from_json(mock_s3_client.put_object.call_args_list[2].kwargs['Body'])
+        assert manifest.bundle['Filename'] == 'bundle.tar'
+        assert set(manifest.bundle['Members']) == {
+            'dashboards/dash-001.json', 'dashboards/dash-002.json', 'dashboards/dash-003.json',
+            'packages.csv', 'dashboards.csv'
+        }
+        member = manifest.bundle['Members']['dashboards/dash-002.json']
+        content = bundle[member['Offset']:member['Offset'] + member['Size']]
+        assert json.loads(content) == {'DashboardId': 'dash-002'}
+        
+    @patch('src.dashboard_export.main.SnapshotStore')
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_resume(self, mock_qs_client_class, mock_config, mock_aws_manager, mock_store_class):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': 'dash-001', 'Name': 'Dashboard 1', 'PublishedVersionNumber': 2},
+            {'DashboardId': 'dash-002', 'Name': 'Dashboard 2', 'PublishedVersionNumber': 3,
+             'LastUpdatedTime': datetime(2024, 1, 1)},
+            {'DashboardId': 'dash-003', 'Name': 'Dashboard 3', 'PublishedVersionNumber': 1}
+        ]
+        mock_qs_client.get_dashboard_definition.side_effect = lambda dashboard_id: {'DashboardId': dashboard_id}
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_store = mock_store_class.return_value
+        mock_store.is_complete.return_value = False
+        mock_store.load_checkpoint.return_value = SnapshotManifest('20240101120000', {
+            'dash-001': {'DashboardId': 'dash-001', 'VersionNumber': 1, 'LastUpdatedTime': None},
+            'dash-002': {'DashboardId': 'dash-002', 'VersionNumber': 3,
+                         'LastUpdatedTime': datetime(2024, 1, 1).isoformat()}
+        })
+        
+        mock_s3_client = Mock()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        timestamp = exporter.export_dashboards('20240101120000')
+        
+        assert timestamp == '20240101120000'
+        exported_ids = [call.args[0] for call in mock_qs_client.get_dashboard_definition.call_args_list]
+        assert sorted(exported_ids) == ['dash-001', 'dash-003']
+        mock_store.mark_complete.assert_called_once_with('20240101120000')
+        mock_store.update_latest_pointer.assert_called_once_with('20240101120000')
+        manifest = SnapshotManifest.from_json(mock_s3_client.put_object.call_args_list[-1].kwargs['Body'])
+        assert sorted(manifest.dashboards) == ['dash-001', 'dash-002', 'dash-003']
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_resume_older_export_keeps_newer_latest(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [{'DashboardId': 'dash-001', 'Name': 'Dashboard 1'}]
+        mock_qs_client.get_dashboard_definition.side_effect = lambda dashboard_id: {'DashboardId': dashboard_id}
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        objects = {
+            'test-prefix/LATEST': b'20240102000000',
+            'test-prefix/20240101000000/checkpoint.json': SnapshotManifest('20240101000000').to_json().encode()
+        }
+        
+        def get_object(Bucket, Key):
+            if Key not in objects:
+                raise _no_such_key()
+            return {'Body': Mock(read=Mock(return_value=objects[Key]))}
+            
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = get_object
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        assert DashboardExporter().export_dashboards('20240101000000') == '20240101000000'
+        
+        keys = [call.kwargs['Key'] for call in mock_s3_client.put_object.call_args_list]
+        assert 'test-prefix/20240101000000/_COMPLETE' in keys
+        assert 'test-prefix/LATEST' not in keys
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_resume_rejects_bundle(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.return_value = 'value'
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_BUNDLE': 'true'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        exporter = DashboardExporter()
+        
+        with pytest.raises(ValueError, match='Bundle exports cannot be resumed'):
+            exporter.export_dashboards('20240101120000')
+            
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    @patch('src.dashboard_export.main.AssetBundleJobRunner')
+    def test_export_dashboards_with_asset_bundle_engine(self, mock_runner_class, mock_qs_client_class,
+                                                        mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_ENGINE': 'asset_bundle'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': 'dash-001', 'Name': 'Dashboard 1', 'Arn': 'arn:aws:quicksight:r:a:dashboard/dash-001'},
+            {'DashboardId': 'dash-002', 'Name': 'Dashboard 2'}
+        ]
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_runner = Mock()
+        mock_runner.export_dashboards.return_value = ({
+            'dash-001': {'Definition': {'Sheets': [1]}},
+            'dash-002': {'Definition': {'Sheets': [2]}}
+        }, {})
+        mock_runner_class.from_config.return_value = mock_runner
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        timestamp = exporter.export_dashboards()
+        
+        mock_runner_class.from_config.assert_called_once_with(
+            mock_qs_client.quicksight, '123456789012', mock_config_instance, exporter.logger
+        )
+        mock_runner.export_dashboards.assert_called_once_with({
+            'dash-001': 'arn:aws:quicksight:r:a:dashboard/dash-001',
+            'dash-002': 'arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-002'
+        })
+        mock_qs_client.get_dashboard_definition.assert_not_called()
+        
+        bodies = {
+            call.kwargs['Key']: call.kwargs['Body'] for call in mock_s3_client.put_object.call_args_list
+        }
+        assert json.loads(bodies[f'test-prefix/{timestamp}/dashboards/dash-002.json']) == {'Sheets': [2]}
+        manifest = SnapshotManifest.from_json(bodies[f'test-prefix/{timestamp}/manifest.json'])
+        assert manifest.get_dashboard('dash-001')['Sha256'] == content_hash({'Sheets': [1]})
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    @patch('src.dashboard_export.main.AssetBundleJobRunner')
+    def test_export_dashboards_with_asset_bundle_engine_failure(self, mock_runner_class, mock_qs_client_class,
+                                                                mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_ENGINE': 'asset_bundle'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [{'DashboardId': 'dash-001', 'Name': 'Dashboard 1'}]
+        mock_qs_client_class.return_value = mock_qs_client
+        mock_runner_class.from_config.return_value.export_dashboards.return_value = (
+            {}, {'dash-001': RuntimeError('FAILED')}
+        )
+        mock_aws_manager.return_value.get_s3_client.return_value = Mock()
+        
+        exporter = DashboardExporter()
+        
+        with pytest.raises(RuntimeError, match='Failed to export 1 of 1 dashboards through asset bundle jobs: dash-001'):
+            exporter.export_dashboards()
+            
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_with_dependencies(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_DEPENDENCIES': 'true',
+            'EXPORT_MAX_WORKERS': '4'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': f'dash-00{i}', 'Name': f'Dashboard {i}'} for i in range(1, 4)
+        ]
+        mock_qs_client.describe_dashboard_definition.side_effect = lambda dashboard_id: {
+            'Definition': {
+                'DataSetIdentifierDeclarations': [
+                    {'Identifier': 'shared', 'DataSetArn': 'arn:aws:quicksight:r:a:dataset/ds-001'}
+                ]
+            },
+            'ThemeArn': 'arn:aws:quicksight:r:a:theme/theme-001'
+        }
+        mock_qs_client.get_data_set.return_value = {
+            'DataSetId': 'ds-001',
+            'PhysicalTableMap': {'t1': {'CustomSql': {'DataSourceArn': 'arn:aws:quicksight:r:a:datasource/src-001'}}}
+        }
+        mock_qs_client.get_data_source.return_value = {'DataSourceId': 'src-001'}
+        mock_qs_client.get_theme.return_value = {'ThemeId': 'theme-001'}
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = _no_such_key()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        timestamp = exporter.export_dashboards()
+        
+        keys = [call.kwargs['Key'] for call in mock_s3_client.put_object.call_args_list]
+        for filename in ('datasets/ds-001.json', 'datasources/src-001.json', 'themes/theme-001.json'):
+            assert keys.count(f'test-prefix/{timestamp}/{filename}') == 1
+        mock_qs_client.get_dashboard_definition.assert_not_called()
+        mock_qs_client.get_data_set.assert_called_once_with('ds-001')
+        
+        manifest = SnapshotManifest.from_json(mock_s3_client.put_object.call_args_list[-3].kwargs['Body'])
+        assert manifest.get_dashboard('dash-002')['Dependencies'] == {'DataSets': ['ds-001'], 'Theme': 'theme-001'}
+        assert manifest.dependencies['DataSets'] == {'ds-001': {'DataSources': ['src-001'], 'DataSets': []}}
+        assert manifest.dependencies['Themes'] == ['theme-001']
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_export_dashboards_shard(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        dashboard_ids = [f'dash-{i:03d}' for i in range(20)]
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = [
+            {'DashboardId': dashboard_id, 'Name': dashboard_id} for dashboard_id in dashboard_ids
+        ]
+        mock_qs_client.get_dashboard_definition.return_value = {'Sheets': []}
+        mock_qs_client_class.return_value = mock_qs_client
+        
+        mock_s3_client = Mock()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        shard = Shard(2, 3)
+        exporter = DashboardExporter(shard)
+        timestamp = exporter.export_dashboards(timestamp='20240101120000')
+        
+        assert timestamp == '20240101120000'
+        keys = [call.kwargs['Key'] for call in mock_s3_client.put_object.call_args_list]
+        expected_ids = [dashboard_id for dashboard_id in dashboard_ids if shard.contains(dashboard_id)]
+        assert 0 < len(expected_ids) < len(dashboard_ids)
+        assert sorted(key for key in keys if '/dashboards/' in key) == [
+            f'test-prefix/20240101120000/dashboards/{dashboard_id}.json' for dashboard_id in expected_ids
+        ]
+        assert 'test-prefix/20240101120000/checkpoint.json' in keys
+        assert 'test-prefix/20240101120000/shards/manifest-2-of-3.json' in keys
+        for key in ('manifest.json', 'dashboards.csv', '_COMPLETE', 'LATEST'):
+            assert not any(written.endswith(key) for written in keys)
+        mock_s3_client.delete_object.assert_called_once_with(
+            Bucket='test-bucket', Key='test-prefix/20240101120000/shards/checkpoint-2-of-3.json'
+        )
+        
+        with pytest.raises(ValueError, match='need a timestamp'):
+            exporter.export_dashboards()
+            
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    @patch('src.dashboard_export.main.QuickSightClient')
+    def test_merge_shards(self, mock_qs_client_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_ACCOUNT_ID': '123456789012',
+            'QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'EXPORT_DASHBOARD_S3_BUCKET': 'test-bucket',
+            'EXPORT_DASHBOARD_S3_PREFIX': 'test-prefix/'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        partials = {
+            'test-prefix/20240101120000/shards/manifest-1-of-2.json': SnapshotManifest('20240101120000', {
+                'dash-002': {'DashboardId': 'dash-002', 'Name': 'Dashboard 2', 'Sha256': 'b'}
+            }, dependencies={'Dashboards': {}, 'DataSets': {}, 'DataSources': ['src-002'], 'Themes': []}),
+            'test-prefix/20240101120000/shards/manifest-2-of-2.json': SnapshotManifest('20240101120000', {
+                'dash-001': {'DashboardId': 'dash-001', 'Name': 'Dashboard 1', 'Sha256': 'a'}
+            }, dependencies={'Dashboards': {}, 'DataSets': {}, 'DataSources': ['src-001'], 'Themes': []})
+        }
+        
+        def get_object(Bucket, Key):
+            if Key not in partials:
+                raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+            return {'Body': io.BytesIO(partials[Key].to_json().encode('utf-8'))}
+            
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.side_effect = get_object
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        exporter = DashboardExporter()
+        
+        with pytest.raises(RuntimeError, match='shards not finished: 1/3, 2/3, 3/3'):
+            exporter.merge_shards('20240101120000', 3)
+        mock_s3_client.put_object.assert_not_called()
+        
+        exporter.merge_shards('20240101120000', 2)
+        
+        bodies = {call.kwargs['Key']: call.kwargs['Body'] for call in mock_s3_client.put_object.call_args_list}
+        manifest = SnapshotManifest.from_json(bodies['test-prefix/20240101120000/manifest.json'])
+        assert sorted(manifest.dashboards) == ['dash-001', 'dash-002']
+        assert manifest.dependencies['DataSources'] == ['src-001', 'src-002']
+        assert bodies['test-prefix/20240101120000/dashboards.csv'].decode('utf-8').splitlines()[1:] == [
+            ',dash-001,Dashboard 1,,,,,', ',dash-002,Dashboard 2,,,,,'
+        ]
+        assert bodies['test-prefix/20240101120000/_COMPLETE'] == '20240101120000'
+        assert bodies['test-prefix/LATEST'] == '20240101120000'
+        mock_s3_client.delete_object.assert_called_once_with(
+            Bucket='test-bucket', Key='test-prefix/20240101120000/checkpoint.json'
+        )
+        
+    @patch('src.dashboard_export.main.AWSClientManager')
+    @patch('src.dashboard_export.main.Config')
+    def test_init_rejects_unknown_snapshot_format(self, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.return_value = 'value'
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'EXPORT_SNAPSHOT_FORMAT': 'bzip2'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        with pytest.raises(ValueError, match='Unsupported snapshot format'):
+            DashboardExporter()
 
 @patch('src.dashboard_export.main.DashboardExporter')
 @patch('src.dashboard_export.main.setup_logger')
@@ -101,12 +778,41 @@ def test_main_success(mock_setup_logger, mock_exporter_class):
     mock_exporter.export_dashboards.return_value = '20240101120000'
     mock_exporter_class.return_value = mock_exporter
     
-    main()
+    main([])
     
-    mock_exporter.export_dashboards.assert_called_once()
+    mock_exporter_class.assert_called_once_with(None)
+    mock_exporter.export_dashboards.assert_called_once_with(None, None)
     mock_logger.info.assert_any_call('Dashboard export completed successfully')
     
 
+@patch('src.dashboard_export.main.DashboardExporter')
+@patch('src.dashboard_export.main.setup_logger')
+def test_main_resume(mock_setup_logger, mock_exporter_class):
+    mock_exporter = Mock()
+    mock_exporter_class.return_value = mock_exporter
+    
+    main(['--resume', '20240101120000'])
+    
+    mock_exporter.export_dashboards.assert_called_once_with('20240101120000', None)
+    
+
+@patch('src.dashboard_export.main.DashboardExporter')
+@patch('src.dashboard_export.main.setup_logger')
+def test_main_shard_and_merge(mock_setup_logger, mock_exporter_class):
+    main(['--shard', '2/4', '--timestamp', '20240101120000'])
+    
+    shard = mock_exporter_class.call_args.args[0]
+    assert (shard.index, shard.count) == (2, 4)
+    mock_exporter_class.return_value.export_dashboards.assert_called_once_with(None, '20240101120000')
+    
+    main(['--merge-shards', '4', '--timestamp', '20240101120000'])
+    
+    mock_exporter_class.return_value.merge_shards.assert_called_once_with('20240101120000', 4)
+    
+    with pytest.raises(SystemExit):
+        main(['--shard', '2/4'])
+        
+
 @patch('src.dashboard_export.main.DashboardExporter')
 @patch('src.dashboard_export.main.setup_logger')
 def test_main_error(mock_setup_logger, mock_exporter_class):
@@ -118,7 +824,7 @@ def test_main_error(mock_setup_logger, mock_exporter_class):
     mock_exporter_class.return_value = mock_exporter
     
     with pytest.raises(SystemExit) as exc_info:
-        main()
+        main([])
     
     assert exc_info.value.code == 1
     mock_logger.error.assert_called()
\ No newline at end of file
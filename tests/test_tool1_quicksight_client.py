@@ -1,5 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from datetime import datetime, timezone
+from src.dashboard_export.dashboard_filter import DashboardFilter
 from src.dashboard_export.quicksight_client import QuickSightClient
 
 
@@ -82,6 +84,25 @@ class TestQuickSightClient:
             DashboardId='dash-001'
         )
         
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_get_dependency_assets(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_data_set.return_value = {'DataSet': {'DataSetId': 'ds-001'}}
+        mock_qs_client.describe_data_source.return_value = {'DataSource': {'DataSourceId': 'src-001'}}
+        mock_qs_client.describe_theme.return_value = {'Theme': {'ThemeId': 'theme-001'}}
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1')
+        
+        assert client.get_data_set('ds-001') == {'DataSetId': 'ds-001'}
+        assert client.get_data_source('src-001') == {'DataSourceId': 'src-001'}
+        assert client.get_theme('theme-001') == {'ThemeId': 'theme-001'}
+        mock_qs_client.describe_data_set.assert_called_once_with(AwsAccountId='123456789012', DataSetId='ds-001')
+        mock_qs_client.describe_data_source.assert_called_once_with(
+            AwsAccountId='123456789012', DataSourceId='src-001'
+        )
+        mock_qs_client.describe_theme.assert_called_once_with(AwsAccountId='123456789012', ThemeId='theme-001')
+        
     @patch('src.dashboard_export.quicksight_client.AWSClientManager')
     def test_assume_cross_account_role(self, mock_aws_manager):
         mock_aws_manager_instance = mock_aws_manager.return_value
@@ -95,7 +116,7 @@ class TestQuickSightClient:
         client.assume_cross_account_role('987654321098', 'TestRole')
         
         assert client.quicksight == mock_new_client
-        mock_aws_manager_instance.get_quicksight_client.assert_called_with(account_id='987654321098')
+        mock_aws_manager_instance.get_quicksight_client.assert_called_with(account_id='987654321098', role_name='TestRole')
         
     @patch('src.dashboard_export.quicksight_client.AWSClientManager')
     def test_init_with_folder_path(self, mock_aws_manager):
@@ -113,9 +134,10 @@ class TestQuickSightClient:
         # Mock list_folders response
         mock_qs_client.list_folders.return_value = {
             'FolderSummaryList': [
-                {'FolderId': 'folder-001', 'Name': 'release'}
+                {'FolderId': 'folder-001', 'Name': 'release', 'Arn': 'arn:folder/folder-001'}
             ]
         }
+        mock_qs_client.describe_folder.return_value = {'Folder': {'FolderPath': []}}
         
         # Mock list_folder_members response
         mock_qs_client.list_folder_members.return_value = {
@@ -133,22 +155,66 @@ class TestQuickSightClient:
             ]
         }
         
+        mock_qs_client.list_dashboards.return_value = {
+            'DashboardSummaryList': [
+                {'DashboardId': 'dash-001', 'Name': 'Dashboard 1', 'PublishedVersionNumber': 3},
+                {'DashboardId': 'dash-002', 'Name': 'Dashboard 2', 'PublishedVersionNumber': 1},
+                {'DashboardId': 'dash-003', 'Name': 'Dashboard 3', 'PublishedVersionNumber': 1}
+            ]
+        }
+        
         mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
         
         client = QuickSightClient('123456789012', 'default', 'ap-northeast-1', 'release/')
         dashboards = client.list_dashboards()
         
         assert len(dashboards) == 2
-        assert dashboards[0]['DashboardId'] == 'dash-001'
+        assert dashboards[0] == {
+            'DashboardId': 'dash-001', 'Name': 'Dashboard 1', 'PublishedVersionNumber': 3, 'FolderPath': 'release'
+        }
         assert dashboards[1]['DashboardId'] == 'dash-002'
+        assert dashboards[1]['Name'] == 'Dashboard 2'
+        mock_qs_client.list_dashboards.assert_called_once_with(AwsAccountId='123456789012', MaxResults=100)
         
-        mock_qs_client.list_folders.assert_called_with(AwsAccountId='123456789012')
+        mock_qs_client.list_folders.assert_called_with(AwsAccountId='123456789012', MaxResults=100)
         mock_qs_client.list_folder_members.assert_called_with(
             AwsAccountId='123456789012',
             FolderId='folder-001',
             MaxResults=100
         )
         
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_from_nested_folder(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_folders.side_effect = [
+            {
+                'FolderSummaryList': [
+                    {'FolderId': 'folder-001', 'Name': 'release', 'Arn': 'arn:folder/folder-001'},
+                    {'FolderId': 'folder-002', 'Name': 'finance', 'Arn': 'arn:folder/folder-002'}
+                ],
+                'NextToken': 'token1'
+            },
+            {
+                'FolderSummaryList': [
+                    {'FolderId': 'folder-003', 'Name': 'finance', 'Arn': 'arn:folder/folder-003'}
+                ]
+            }
+        ]
+        mock_qs_client.describe_folder.side_effect = lambda AwsAccountId, FolderId: {
+            'Folder': {'FolderPath': ['arn:folder/folder-001'] if FolderId == 'folder-003' else []}
+        }
+        mock_qs_client.list_folder_members.return_value = {'FolderMemberList': []}
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1', 'release/finance/')
+        client.list_dashboards()
+        
+        mock_qs_client.list_folder_members.assert_called_with(
+            AwsAccountId='123456789012',
+            FolderId='folder-003',
+            MaxResults=100
+        )
+        
     @patch('src.dashboard_export.quicksight_client.AWSClientManager')
     def test_list_dashboards_folder_not_found(self, mock_aws_manager):
         mock_qs_client = Mock()
@@ -161,7 +227,212 @@ class TestQuickSightClient:
         mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
         
         client = QuickSightClient('123456789012', 'default', 'ap-northeast-1', 'nonexistent/')
+        
+        with pytest.raises(ValueError, match='QuickSight folder not found: nonexistent/'):
+            client.list_dashboards()
+        mock_qs_client.list_dashboards.assert_not_called()
+        
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_folder_listing_error(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_folders.side_effect = Exception('AccessDenied')
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1', 'release/')
+        
+        with pytest.raises(Exception, match='AccessDenied'):
+            client.list_dashboards()
+        
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_from_folder_recursive(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_folders.return_value = {
+            'FolderSummaryList': [
+                {'FolderId': 'folder-001', 'Name': 'release', 'Arn': 'arn:folder/folder-001'},
+                {'FolderId': 'folder-002', 'Name': 'finance', 'Arn': 'arn:folder/folder-002'},
+                {'FolderId': 'folder-003', 'Name': 'sales', 'Arn': 'arn:folder/folder-003'},
+                {'FolderId': 'folder-004', 'Name': 'monthly', 'Arn': 'arn:folder/folder-004'}
+            ]
+        }
+        ancestors = {
+            'folder-001': [],
+            'folder-002': ['arn:folder/folder-001'],
+            'folder-003': ['arn:folder/folder-001'],
+            'folder-004': ['arn:folder/folder-001', 'arn:folder/folder-002']
+        }
+        mock_qs_client.describe_folder.side_effect = lambda AwsAccountId, FolderId: {
+            'Folder': {'FolderPath': ancestors[FolderId]}
+        }
+        members = {
+            'folder-001': ['dash-001'],
+            'folder-002': ['dash-002', 'dash-003'],
+            'folder-003': ['dash-003'],
+            'folder-004': ['dash-001', 'dash-004']
+        }
+        mock_qs_client.list_folder_members.side_effect = lambda AwsAccountId, FolderId, MaxResults: {
+            'FolderMemberList': [
+                {'MemberId': member_id, 'MemberType': 'DASHBOARD', 'MemberArn': f'arn:dashboard/{member_id}'}
+                for member_id in members[FolderId]
+            ]
+        }
+        mock_qs_client.list_dashboards.return_value = {'DashboardSummaryList': []}
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient(
+            '123456789012', 'default', 'ap-northeast-1', 'release/', max_pool_connections=4, recursive=True
+        )
+        dashboards = client.list_dashboards()
+        
+        assert {dashboard['DashboardId']: dashboard['FolderPath'] for dashboard in dashboards} == {
+            'dash-001': 'release',
+            'dash-002': 'release/finance',
+            'dash-003': 'release/finance',
+            'dash-004': 'release/finance/monthly'
+        }
+        assert mock_qs_client.list_folder_members.call_count == 4
+        
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_from_folder_not_recursive(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_folders.return_value = {
+            'FolderSummaryList': [
+                {'FolderId': 'folder-001', 'Name': 'release', 'Arn': 'arn:folder/folder-001'},
+                {'FolderId': 'folder-002', 'Name': 'finance', 'Arn': 'arn:folder/folder-002'}
+            ]
+        }
+        mock_qs_client.describe_folder.side_effect = lambda AwsAccountId, FolderId: {
+            'Folder': {'FolderPath': ['arn:folder/folder-001'] if FolderId == 'folder-002' else []}
+        }
+        mock_qs_client.list_folder_members.return_value = {'FolderMemberList': []}
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1', 'release/')
+        client.list_dashboards()
+        
+        mock_qs_client.list_folder_members.assert_called_once_with(
+            AwsAccountId='123456789012',
+            FolderId='folder-001',
+            MaxResults=100
+        )
+        
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_from_folder_member_not_listed(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_folders.return_value = {
+            'FolderSummaryList': [{'FolderId': 'folder-001', 'Name': 'release', 'Arn': 'arn:folder/folder-001'}]
+        }
+        mock_qs_client.describe_folder.return_value = {'Folder': {'FolderPath': []}}
+        mock_qs_client.list_folder_members.return_value = {
+            'FolderMemberList': [
+                {'MemberId': 'dash-001', 'MemberType': 'DASHBOARD', 'MemberArn': 'arn:dashboard/dash-001'}
+            ]
+        }
+        mock_qs_client.list_dashboards.side_effect = [
+            {'DashboardSummaryList': [{'DashboardId': 'dash-002', 'Name': 'Dashboard 2'}], 'NextToken': 'token1'},
+            {'DashboardSummaryList': []}
+        ]
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1', 'release/')
         dashboards = client.list_dashboards()
         
-        assert len(dashboards) == 0
-        mock_qs_client.list_folders.assert_called_with(AwsAccountId='123456789012')
\ No newline at end of file
+        assert dashboards == [{'DashboardId': 'dash-001', 'Name': 'dash-001', 'FolderPath': 'release'}]
+        assert mock_qs_client.list_dashboards.call_count == 2
+        
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_search_by_name(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.search_dashboards.side_effect = [
+            {
+                'DashboardSummaryList': [
+                    {'DashboardId': 'dash-001', 'Name': 'Sales 2024',
+                     'LastUpdatedTime': datetime(2024, 2, 1, tzinfo=timezone.utc)}
+                ],
+                'NextToken': 'token1'
+            },
+            {
+                'DashboardSummaryList': [
+                    {'DashboardId': 'dash-002', 'Name': 'Sales 2023',
+                     'LastUpdatedTime': datetime(2023, 2, 1, tzinfo=timezone.utc)},
+                    {'DashboardId': 'dash-003', 'Name': 'Monthly Sales 2024',
+                     'LastUpdatedTime': datetime(2024, 2, 1, tzinfo=timezone.utc)}
+                ]
+            }
+        ]
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1')
+        dashboards = client.list_dashboards(
+            DashboardFilter(name_pattern='Sales*', updated_since=datetime(2024, 1, 1))
+        )
+        
+        assert [dashboard['DashboardId'] for dashboard in dashboards] == ['dash-001']
+        mock_qs_client.search_dashboards.assert_called_with(
+            AwsAccountId='123456789012',
+            Filters=[{'Operator': 'StringLike', 'Name': 'DASHBOARD_NAME', 'Value': 'Sales'}],
+            MaxResults=100,
+            NextToken='token1'
+        )
+        mock_qs_client.list_dashboards.assert_not_called()
+        
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_by_ids(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.side_effect = lambda AwsAccountId, DashboardId: {
+            'Dashboard': {
+                'DashboardId': DashboardId,
+                'Name': f'Name of {DashboardId}',
+                'Version': {'VersionNumber': 4}
+            }
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1', max_pool_connections=3)
+        dashboards = client.list_dashboards(DashboardFilter(dashboard_ids=['dash-003', 'dash-001']))
+        
+        assert [dashboard['DashboardId'] for dashboard in dashboards] == ['dash-003', 'dash-001']
+        assert dashboards[0]['Name'] == 'Name of dash-003'
+        assert dashboards[0]['PublishedVersionNumber'] == 4
+        assert mock_qs_client.describe_dashboard.call_count == 2
+        mock_qs_client.list_dashboards.assert_not_called()
+        
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_by_ids_not_found(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.side_effect = Exception('ResourceNotFoundException')
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1')
+        
+        with pytest.raises(RuntimeError, match='Failed to describe 1 of 1 dashboards: dash-404'):
+            client.list_dashboards(DashboardFilter(dashboard_ids=['dash-404']))
+            
+    @patch('src.dashboard_export.quicksight_client.AWSClientManager')
+    def test_list_dashboards_by_folder_arn(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_folders.return_value = {
+            'FolderSummaryList': [{'FolderId': 'folder-009', 'Name': 'hotfix', 'Arn': 'arn:folder/folder-009'}]
+        }
+        mock_qs_client.describe_folder.return_value = {'Folder': {'FolderPath': []}}
+        mock_qs_client.list_folder_members.return_value = {
+            'FolderMemberList': [
+                {'MemberId': 'dash-001', 'MemberType': 'DASHBOARD'},
+                {'MemberId': 'dash-002', 'MemberType': 'DASHBOARD'}
+            ]
+        }
+        mock_qs_client.list_dashboards.return_value = {'DashboardSummaryList': []}
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        client = QuickSightClient('123456789012', 'default', 'ap-northeast-1')
+        dashboards = client.list_dashboards(DashboardFilter(
+            folder_arn='arn:aws:quicksight:ap-northeast-1:123456789012:folder/folder-009',
+            dashboard_ids=['dash-002']
+        ))
+        
+        assert dashboards == [{'DashboardId': 'dash-002', 'Name': 'dash-002', 'FolderPath': 'hotfix'}]
+        mock_qs_client.list_folder_members.assert_called_once_with(
+            AwsAccountId='123456789012',
+            FolderId='folder-009',
+            MaxResults=100
+        )
+        mock_qs_client.describe_dashboard.assert_not_called()
@@ -1,6 +1,10 @@
 import pytest
 from unittest.mock import Mock, patch
-from src.dashboard_deploy.dashboard_deployer import DashboardDeployer
+from botocore.exceptions import ClientError
+from src.common.manifest import content_hash
+from src.dashboard_deploy.dashboard_deployer import (
+    DEPLOY_CREATED, DEPLOY_UNCHANGED, DEPLOY_UPDATED, DashboardDeployer
+)
 
 
 class TestDashboardDeployer:
@@ -14,6 +18,16 @@ class TestDashboardDeployer:
         assert deployer.account_id == '123456789012'
         assert deployer.namespace == 'default'
         assert deployer.quicksight == mock_qs_client
+        mock_aws_manager.return_value.get_quicksight_client.assert_called_once_with()
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_init_with_cross_account_role(self, mock_aws_manager):
+        deployer = DashboardDeployer('987654321098', 'default', 'ap-northeast-1', role_name='TestRole')
+        
+        mock_aws_manager.return_value.get_quicksight_client.assert_called_once_with(
+            account_id='987654321098', role_name='TestRole'
+        )
+        assert deployer.quicksight == mock_aws_manager.return_value.get_quicksight_client.return_value
         
     @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
     def test_check_existing_dashboard_exists(self, mock_aws_manager):
@@ -29,9 +43,9 @@ class TestDashboardDeployer:
         assert exists is True
         
     @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
-    def test_check_existing_dashboard_not_exists(self, mock_aws_manager):
+    def test_check_existing_dashboard_not_exists(self, mock_aws_manager, not_found):
         mock_qs_client = Mock()
-        mock_qs_client.describe_dashboard.side_effect = Exception('ResourceNotFoundException')
+        mock_qs_client.describe_dashboard.side_effect = not_found()
         mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
         
         deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1')
@@ -80,9 +94,9 @@ class TestDashboardDeployer:
         mock_qs_client.update_dashboard.assert_called_once()
         
     @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
-    def test_deploy_dashboard_create_new(self, mock_aws_manager):
+    def test_deploy_dashboard_create_new(self, mock_aws_manager, not_found):
         mock_qs_client = Mock()
-        mock_qs_client.describe_dashboard.side_effect = Exception('ResourceNotFoundException')
+        mock_qs_client.describe_dashboard.side_effect = not_found()
         mock_qs_client.create_dashboard.return_value = {
             'DashboardId': 'dash-001',
             'CreationStatus': 'CREATION_SUCCESSFUL'
@@ -121,4 +135,244 @@ class TestDashboardDeployer:
         result = deployer.deploy_dashboard(definition, 'dash-001')
         
         assert result is True
-        mock_qs_client.update_dashboard.assert_called_once()
\ No newline at end of file
+        mock_qs_client.update_dashboard.assert_called_once()
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_deploy_skips_unchanged_dashboard(self, mock_aws_manager):
+        definition = {
+            'Name': 'Test Dashboard',
+            'DataSetIds': ['dataset1']
+        }
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.return_value = {
+            'Dashboard': {'DashboardId': 'dash-001'}
+        }
+        mock_qs_client.list_tags_for_resource.return_value = {
+            'Tags': [{'Key': 'DefinitionSha256', 'Value': content_hash(definition)}]
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1', 'tag')
+        status = deployer.deploy(definition, 'dash-001')
+        
+        assert status == DEPLOY_UNCHANGED
+        mock_qs_client.list_tags_for_resource.assert_called_once_with(
+            ResourceArn='arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001'
+        )
+        mock_qs_client.update_dashboard.assert_not_called()
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_deploy_off_always_updates(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.return_value = {
+            'Dashboard': {'DashboardId': 'dash-001'}
+        }
+        mock_qs_client.list_tags_for_resource.return_value = {
+            'Tags': [{'Key': 'DefinitionSha256', 'Value': 'abc'}]
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1', 'off')
+        status = deployer.deploy({'Name': 'Test Dashboard', 'DataSetIds': ['dataset1']}, 'dash-001', 'abc')
+        
+        assert status == DEPLOY_UPDATED
+        mock_qs_client.list_tags_for_resource.assert_not_called()
+        mock_qs_client.update_dashboard.assert_called_once()
+        # The given hash is still tagged so a later switch to 'tag' compares against the live definition
+        mock_qs_client.tag_resource.assert_called_once_with(
+            ResourceArn='arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001',
+            Tags=[{'Key': 'DefinitionSha256', 'Value': 'abc'}]
+        )
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_plan_does_not_write(self, mock_aws_manager):
+        definition = {
+            'Name': 'Test Dashboard',
+            'DataSetIds': ['dataset1']
+        }
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.return_value = {
+            'Dashboard': {'DashboardId': 'dash-001'}
+        }
+        mock_qs_client.list_tags_for_resource.return_value = {
+            'Tags': [{'Key': 'DefinitionSha256', 'Value': 'old-hash'}]
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1', 'tag')
+        
+        assert deployer.plan(definition, 'dash-001') == (DEPLOY_UPDATED, content_hash(definition))
+        mock_qs_client.update_dashboard.assert_not_called()
+        mock_qs_client.tag_resource.assert_not_called()
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_delete_dashboard(self, mock_aws_manager, not_found):
+        mock_qs_client = Mock()
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1')
+        
+        assert deployer.delete_dashboard('dash-001') is True
+        mock_qs_client.delete_dashboard.assert_called_once_with(AwsAccountId='123456789012', DashboardId='dash-001')
+        
+        mock_qs_client.delete_dashboard.side_effect = not_found()
+        assert deployer.delete_dashboard('dash-001') is True
+        
+        mock_qs_client.delete_dashboard.side_effect = Exception('AccessDeniedException')
+        assert deployer.delete_dashboard('dash-001') is False
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_status_tracking_and_clear_definition_hash(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.create_dashboard.return_value = {
+            'Arn': 'arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001',
+            'VersionArn': 'arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001/version/1'
+        }
+        mock_qs_client.update_dashboard.return_value = {
+            'VersionArn': 'arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-002/version/4'
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1')
+        deployer.status_tracker = Mock()
+        
+        assert deployer.create_dashboard({'Name': 'Test Dashboard'}, 'dash-001') is True
+        assert deployer.update_dashboard({'Name': 'Test Dashboard'}, 'dash-002') is True
+        assert deployer.status_tracker.track.call_args_list == [(('dash-001', 1),), (('dash-002', 4),)]
+        assert deployer.submitted_versions == {'dash-001': 1, 'dash-002': 4}
+        
+        deployer.clear_definition_hash('dash-002')
+        mock_qs_client.untag_resource.assert_called_once_with(
+            ResourceArn='arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-002',
+            TagKeys=['DefinitionSha256']
+        )
+        
+        mock_qs_client.untag_resource.side_effect = Exception('AccessDeniedException')
+        deployer.clear_definition_hash('dash-002')
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_publish_version(self, mock_aws_manager, not_found):
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = {
+            'DashboardSummaryList': [{'DashboardId': 'dash-001', 'PublishedVersionNumber': 5}]
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1')
+        assert deployer.get_published_version('dash-001') is None
+        deployer.load_dashboard_index()
+        assert deployer.get_published_version('dash-001') == 5
+        assert deployer.get_published_version('dash-002') is None
+        
+        assert deployer.publish_version('dash-001', 4) is True
+        mock_qs_client.update_dashboard_published_version.assert_called_once_with(
+            AwsAccountId='123456789012', DashboardId='dash-001', VersionNumber=4
+        )
+        
+        mock_qs_client.update_dashboard_published_version.side_effect = not_found()
+        assert deployer.publish_version('dash-001', 4) is False
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_deploy_updates_and_tags_changed_dashboard(self, mock_aws_manager):
+        definition = {
+            'Name': 'Test Dashboard',
+            'DataSetIds': ['dataset1']
+        }
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.return_value = {
+            'Dashboard': {'DashboardId': 'dash-001'}
+        }
+        mock_qs_client.list_tags_for_resource.return_value = {
+            'Tags': [{'Key': 'DefinitionSha256', 'Value': 'stale'}]
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1', 'tag')
+        status = deployer.deploy(definition, 'dash-001')
+        
+        assert status == DEPLOY_UPDATED
+        mock_qs_client.update_dashboard.assert_called_once()
+        mock_qs_client.tag_resource.assert_called_once_with(
+            ResourceArn='arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001',
+            Tags=[{'Key': 'DefinitionSha256', 'Value': content_hash(definition)}]
+        )
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_deploy_compares_target_definition_without_tag(self, mock_aws_manager):
+        definition = {
+            'Name': 'Test Dashboard',
+            'DataSetIds': ['dataset1']
+        }
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.return_value = {
+            'Dashboard': {'DashboardId': 'dash-001'}
+        }
+        mock_qs_client.list_tags_for_resource.return_value = {'Tags': []}
+        mock_qs_client.describe_dashboard_definition.return_value = {
+            'Definition': {'DataSetIds': ['dataset1'], 'Name': 'Test Dashboard'}
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1', 'definition')
+        status = deployer.deploy(definition, 'dash-001')
+        
+        assert status == DEPLOY_UNCHANGED
+        mock_qs_client.update_dashboard.assert_not_called()
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_create_dashboard_with_hash_tag(self, mock_aws_manager, not_found):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.side_effect = not_found()
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1', 'tag')
+        status = deployer.deploy({'Name': 'Test Dashboard'}, 'dash-001', 'abc123')
+        
+        assert status == DEPLOY_CREATED
+        assert mock_qs_client.create_dashboard.call_args.kwargs['Tags'] == [
+            {'Key': 'DefinitionSha256', 'Value': 'abc123'}
+        ]
+        
+    def test_init_invalid_change_detection(self):
+        with pytest.raises(ValueError, match='Unsupported change detection mode'):
+            DashboardDeployer('123456789012', 'default', 'ap-northeast-1', 'checksum')
+            
+        
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_check_existing_dashboard_other_error(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDeniedException', 'Message': 'ResourceNotFoundException'}},
+            'DescribeDashboard'
+        )
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1')
+        
+        with pytest.raises(ClientError):
+            deployer.check_existing_dashboard('dash-001')
+            
+    @patch('src.dashboard_deploy.dashboard_deployer.AWSClientManager')
+    def test_deploy_uses_dashboard_index(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.return_value = {
+            'DashboardSummaryList': [
+                {
+                    'DashboardId': 'dash-001',
+                    'Arn': 'arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001',
+                    'PublishedVersionNumber': 4
+                }
+            ]
+        }
+        mock_qs_client.create_dashboard.return_value = {
+            'Arn': 'arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-002'
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        deployer = DashboardDeployer('123456789012', 'default', 'ap-northeast-1')
+        deployer.load_dashboard_index()
+        
+        assert deployer.deploy({'Name': 'Dashboard 1'}, 'dash-001') == DEPLOY_UPDATED
+        assert deployer.deploy({'Name': 'Dashboard 2'}, 'dash-002') == DEPLOY_CREATED
+        assert deployer.check_existing_dashboard('dash-002') is True
+        mock_qs_client.describe_dashboard.assert_not_called()
@@ -0,0 +1,48 @@
+import pytest
+from unittest.mock import Mock
+from src.dashboard_deploy.dashboard_index import DashboardIndex
+
+
+class TestDashboardIndex:
+    def test_load_paginated(self):
+        mock_qs_client = Mock()
+        mock_qs_client.list_dashboards.side_effect = [
+            {
+                'DashboardSummaryList': [
+                    {'DashboardId': 'dash-001', 'Arn': 'arn-001', 'PublishedVersionNumber': 2,
+                     'LastUpdatedTime': '2024-01-01T00:00:00'}
+                ],
+                'NextToken': 'token1'
+            },
+            {
+                'DashboardSummaryList': [
+                    {'DashboardId': 'dash-002', 'Arn': 'arn-002', 'PublishedVersionNumber': 7}
+                ]
+            }
+        ]
+        
+        index = DashboardIndex(mock_qs_client, '123456789012').load()
+        
+        assert len(index) == 2
+        assert index.contains('dash-001') is True
+        assert index.contains('dash-003') is False
+        assert index.get('dash-001') == {
+            'Arn': 'arn-001',
+            'VersionNumber': 2,
+            'LastUpdatedTime': '2024-01-01T00:00:00'
+        }
+        assert index.get('dash-002')['VersionNumber'] == 7
+        mock_qs_client.list_dashboards.assert_called_with(
+            AwsAccountId='123456789012',
+            MaxResults=100,
+            NextToken='token1'
+        )
+        
+    def test_put(self):
+        mock_qs_client = Mock()
+        
+        index = DashboardIndex(mock_qs_client, '123456789012')
+        index.put('dash-001', {'Arn': 'arn-001'})
+        
+        assert index.contains('dash-001') is True
+        assert index.get('dash-001')['Arn'] == 'arn-001'
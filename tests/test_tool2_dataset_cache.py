@@ -0,0 +1,68 @@
+import pytest
+from unittest.mock import Mock
+from botocore.exceptions import ClientError
+from src.dashboard_deploy.dataset_cache import DataSetCache
+
+
+class TestDataSetCache:
+    def test_exists_from_paginated_index(self):
+        mock_qs_client = Mock()
+        mock_qs_client.list_data_sets.side_effect = [
+            {'DataSetSummaries': [{'DataSetId': 'dataset1'}], 'NextToken': 'token1'},
+            {'DataSetSummaries': [{'DataSetId': 'dataset2'}]}
+        ]
+        
+        cache = DataSetCache(mock_qs_client, '123456789012')
+        
+        assert cache.exists('dataset1') is True
+        assert cache.exists('dataset2') is True
+        assert mock_qs_client.list_data_sets.call_count == 2
+        mock_qs_client.describe_data_set.assert_not_called()
+        
+    def test_exists_memoizes_describe_on_miss(self, not_found):
+        def describe_data_set(AwsAccountId, DataSetId):
+            if DataSetId != 'shared':
+                raise not_found('DescribeDataSet')
+            return {'DataSet': {'DataSetId': DataSetId}}
+            
+        mock_qs_client = Mock()
+        mock_qs_client.list_data_sets.return_value = {'DataSetSummaries': []}
+        mock_qs_client.describe_data_set.side_effect = describe_data_set
+        
+        cache = DataSetCache(mock_qs_client, '123456789012')
+        
+        assert cache.exists('shared') is True
+        assert cache.exists('shared') is True
+        assert cache.exists('missing') is False
+        assert cache.exists('missing') is False
+        assert mock_qs_client.describe_data_set.call_count == 2
+        
+    def test_exists_raises_unexpected_errors(self):
+        mock_qs_client = Mock()
+        mock_qs_client.list_data_sets.return_value = {'DataSetSummaries': []}
+        mock_qs_client.describe_data_set.side_effect = ClientError(
+            {'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}},
+            'DescribeDataSet'
+        )
+        
+        cache = DataSetCache(mock_qs_client, '123456789012')
+        
+        with pytest.raises(ClientError):
+            cache.exists('dataset1')
+            
+    def test_entries_expire_after_ttl(self, clock, not_found):
+        mock_qs_client = Mock()
+        mock_qs_client.list_data_sets.side_effect = [
+            {'DataSetSummaries': [{'DataSetId': 'dataset1'}]},
+            {'DataSetSummaries': []}
+        ]
+        mock_qs_client.describe_data_set.side_effect = not_found('DescribeDataSet')
+        
+        cache = DataSetCache(mock_qs_client, '123456789012', ttl_seconds=60, clock=clock)
+        
+        assert cache.exists('dataset1') is True
+        clock.now = 30
+        assert cache.exists('dataset1') is True
+        clock.now = 61
+        assert cache.exists('dataset1') is False
+        assert mock_qs_client.list_data_sets.call_count == 2
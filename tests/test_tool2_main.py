@@ -1,13 +1,20 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import gzip
+import io
 import json
+from botocore.exceptions import ClientError
+from src.common.manifest import SnapshotManifest, canonical_json, content_hash
+from src.common.sharding import Shard
 from src.dashboard_deploy.main import DashboardDeployRunner, main
 
 
 class TestDashboardDeployRunner:
     @patch('src.dashboard_deploy.main.AWSClientManager')
     @patch('src.dashboard_deploy.main.Config')
-    def test_init(self, mock_config, mock_aws_manager):
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_init(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
         mock_config_instance = Mock()
         mock_config_instance.get_required.side_effect = lambda key: {
             'TARGET_AWS_ACCOUNT_ID': '123456789012',
@@ -17,6 +24,7 @@ class TestDashboardDeployRunner:
             'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
             'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_config_instance
         
         runner = DashboardDeployRunner()
@@ -27,10 +35,14 @@ class TestDashboardDeployRunner:
         assert runner.s3_bucket == 'test-bucket'
         assert runner.s3_prefix == 'test-prefix/'
         assert runner.role_name == 'TestRole'
+        mock_validator_class.assert_called_once_with('123456789012', 'ap-northeast-1', 900.0, 'TestRole')
+        mock_deployer_class.assert_called_once_with('123456789012', 'default', 'ap-northeast-1', 'tag', 'TestRole')
         
     @patch('src.dashboard_deploy.main.AWSClientManager')
     @patch('src.dashboard_deploy.main.Config')
-    def test_get_latest_s3_folder(self, mock_config, mock_aws_manager):
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_get_latest_s3_folder(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
         mock_config_instance = Mock()
         mock_config_instance.get_required.side_effect = lambda key: {
             'TARGET_AWS_ACCOUNT_ID': '123456789012',
@@ -40,15 +52,54 @@ class TestDashboardDeployRunner:
             'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
             'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_config_instance
         
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            'Contents': [
-                {'Key': 'test-prefix/20240101120000/dashboard.json'},
-                {'Key': 'test-prefix/20240102120000/dashboard.json'},
-                {'Key': 'test-prefix/20240103120000/dashboard.json'}
-            ]
+        mock_s3_client.get_object.side_effect = ClientError(
+            {'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject'
+        )
+        mock_s3_client.list_objects_v2.side_effect = [
+            {
+                'CommonPrefixes': [
+                    {'Prefix': 'test-prefix/20240101120000/'},
+                    {'Prefix': 'test-prefix/20240103120000/'}
+                ],
+                'NextContinuationToken': 'token1'
+            },
+            {
+                'CommonPrefixes': [
+                    {'Prefix': 'test-prefix/20240102120000/'}
+                ]
+            }
+        ]
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        runner = DashboardDeployRunner()
+        folder = runner._get_latest_s3_folder()
+        
+        assert folder == '20240103120000'
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_get_latest_s3_folder_from_pointer(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.return_value = {
+            'Body': Mock(read=Mock(return_value=b'20240103120000'))
         }
         mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
         
@@ -56,10 +107,17 @@ class TestDashboardDeployRunner:
         folder = runner._get_latest_s3_folder()
         
         assert folder == '20240103120000'
+        mock_s3_client.get_object.assert_called_once_with(
+            Bucket='test-bucket',
+            Key='test-prefix/LATEST'
+        )
+        mock_s3_client.list_objects_v2.assert_not_called()
         
     @patch('src.dashboard_deploy.main.AWSClientManager')
     @patch('src.dashboard_deploy.main.Config')
-    def test_load_dashboard_from_s3(self, mock_config, mock_aws_manager):
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_load_dashboard_from_s3(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
         mock_config_instance = Mock()
         mock_config_instance.get_required.side_effect = lambda key: {
             'TARGET_AWS_ACCOUNT_ID': '123456789012',
@@ -69,6 +127,7 @@ class TestDashboardDeployRunner:
             'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
             'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_config_instance
         
         mock_s3_client = Mock()
@@ -83,6 +142,153 @@ class TestDashboardDeployRunner:
         
         assert definition == mock_definition
         
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_load_dashboard_from_s3_gzip(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_s3_client = Mock()
+        mock_definition = {'Name': 'Test Dashboard', 'DataSetIds': ['dataset1']}
+        mock_s3_client.get_object.return_value = {
+            'Body': io.BytesIO(gzip.compress(canonical_json(mock_definition).encode('utf-8'))),
+            'ContentEncoding': 'gzip'
+        }
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        runner = DashboardDeployRunner()
+        definition = runner._load_dashboard_from_s3('dash-001', '20240101120000')
+        
+        assert definition == mock_definition
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_load_dashboard_from_bundle(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_definition = {'Name': 'Test Dashboard'}
+        content = json.dumps(mock_definition).encode('utf-8')
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.return_value = {'Body': io.BytesIO(content)}
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        runner = DashboardDeployRunner()
+        runner.bundle_reader = runner.snapshot_store.open_bundle(SnapshotManifest(
+            '20240101120000',
+            bundle={
+                'Filename': 'bundle.tar',
+                'Members': {'dashboards/dash-001.json': {'Offset': 512, 'Size': len(content)}}
+            }
+        ))
+        definition = runner._load_dashboard_from_s3('dash-001', '20240101120000')
+        
+        assert definition == mock_definition
+        mock_s3_client.get_object.assert_called_once_with(
+            Bucket='test-bucket',
+            Key='test-prefix/20240101120000/bundle.tar',
+            Range=f'bytes=512-{511 + len(content)}'
+        )
+        
+        compressed = gzip.compress(content)
+        mock_s3_client.get_object.return_value = {'Body': io.BytesIO(compressed)}
+        runner.bundle_reader = runner.snapshot_store.open_bundle(SnapshotManifest(
+            '20240101120000',
+            bundle={
+                'Filename': 'bundle.tar',
+                'Members': {
+                    'dashboards/dash-002.json': {'Offset': 512, 'Size': len(compressed), 'ContentEncoding': 'gzip'}
+                }
+            }
+        ))
+        
+        assert runner._load_dashboard_from_s3('dash-002', '20240101120000') == mock_definition
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_get_dashboard_files_from_manifest(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_s3_client = Mock()
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        runner = DashboardDeployRunner()
+        runner.manifest = SnapshotManifest('20240101120000', {
+            'dash-001': {'DashboardId': 'dash-001'},
+            'dash-002': {'DashboardId': 'dash-002'}
+        })
+        files = runner._get_dashboard_files('20240101120000')
+        
+        assert files == ['dash-001.json', 'dash-002.json']
+        mock_s3_client.list_objects_v2.assert_not_called()
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_load_dashboard_from_s3_checksum_mismatch(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_s3_client = Mock()
+        mock_definition = {'Name': 'Test Dashboard', 'DataSetIds': ['dataset1']}
+        mock_s3_client.get_object.return_value = {
+            'Body': Mock(read=Mock(return_value=json.dumps(mock_definition).encode()))
+        }
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        runner = DashboardDeployRunner()
+        runner.manifest = SnapshotManifest('20240101120000', {
+            'dash-001': {'DashboardId': 'dash-001', 'Sha256': content_hash(mock_definition)},
+            'dash-002': {'DashboardId': 'dash-002', 'Sha256': content_hash({'Name': 'Other'})}
+        })
+        
+        assert runner._load_dashboard_from_s3('dash-001', '20240101120000') == mock_definition
+        assert runner._load_dashboard_from_s3('dash-002', '20240101120000') is None
+        
     @patch('src.dashboard_deploy.main.AWSClientManager')
     @patch('src.dashboard_deploy.main.Config')
     @patch('src.dashboard_deploy.main.Validator')
@@ -97,13 +303,17 @@ class TestDashboardDeployRunner:
             'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
             'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENVIRONMENT': 'intg',
+            'DEPLOY_TRACK_STATUS': 'false'
+        }.get(key, default)
         mock_config.return_value = mock_config_instance
         
         mock_s3_client = Mock()
         mock_s3_client.list_objects_v2.side_effect = [
             {
-                'Contents': [
-                    {'Key': 'test-prefix/20240101120000/dashboard.json'}
+                'CommonPrefixes': [
+                    {'Prefix': 'test-prefix/20240101120000/'}
                 ]
             },
             {
@@ -113,9 +323,73 @@ class TestDashboardDeployRunner:
             }
         ]
         mock_definition = {'Name': 'Test Dashboard', 'DataSetIds': ['dataset1']}
-        mock_s3_client.get_object.return_value = {
-            'Body': Mock(read=Mock(return_value=json.dumps(mock_definition).encode()))
+        
+        def get_object(Bucket, Key):
+            if Key.endswith(('manifest.json', 'LATEST')):
+                raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+            return {'Body': Mock(read=Mock(return_value=json.dumps(mock_definition).encode()))}
+            
+        mock_s3_client.get_object.side_effect = get_object
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = True
+        mock_validator.validate_data_sources.return_value = True
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer.deploy.return_value = 'updated'
+        mock_deployer.get_published_version.return_value = 3
+        mock_deployer.submitted_versions = {'dash-001': 4}
+        mock_deployer.publish_version.return_value = True
+        mock_deployer_class.return_value = mock_deployer
+        
+        runner = DashboardDeployRunner()
+        result = runner.deploy_dashboards()
+        
+        assert result is True
+        mock_deployer.load_dashboard_index.assert_called_once()
+        mock_deployer.deploy.assert_called_once_with(mock_definition, 'dash-001', None)
+        # Without status tracking the new version is published right after the update
+        mock_deployer.publish_version.assert_called_once_with('dash-001', 4)
+        assert runner.deploy_report['Succeeded']['dash-001']['Status'] == 'updated'
+        assert runner.deploy_report['Succeeded']['dash-001']['Version'] == 4
+        journal_call, pointer_call = mock_s3_client.put_object.call_args_list
+        assert journal_call.kwargs['Key'] == 'test-prefix/DEPLOY_JOURNAL_intg.json'
+        assert json.loads(journal_call.kwargs['Body'])['Dashboards'] == {
+            'dash-001': {'Status': 'updated', 'PreviousVersion': 3, 'NewVersion': 4}
+        }
+        assert pointer_call.kwargs == {
+            'Bucket': 'test-bucket',
+            'Key': 'test-prefix/DEPLOYED_intg',
+            'Body': '20240101120000'
         }
+        
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_deploy_dashboards_concurrent_continue_and_report(self, mock_deployer_class, mock_validator_class,
+                                                              mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_MAX_WORKERS': '4',
+            'DEPLOY_FAIL_FAST': 'false',
+            'DEPLOY_ENVIRONMENT': 'intg'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_s3_client = Mock()
         mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
         
         mock_validator = Mock()
@@ -125,14 +399,700 @@ class TestDashboardDeployRunner:
         mock_validator_class.return_value = mock_validator
         
         mock_deployer = Mock()
-        mock_deployer.deploy_dashboard.return_value = True
+        mock_deployer.deploy.side_effect = lambda definition, dashboard_id, definition_hash: (
+            'failed' if dashboard_id == 'dash-003' else 'unchanged' if dashboard_id == 'dash-004' else 'updated'
+        )
+        mock_deployer_class.return_value = mock_deployer
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.get_latest_snapshot.return_value = '20240101120000'
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+            f'dash-00{i}': {'DashboardId': f'dash-00{i}'} for i in range(1, 6)
+        })
+        runner.snapshot_store.load_deploy_state.return_value = None
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard', 'DataSetIds': ['dataset1']})
+        
+        result = runner.deploy_dashboards()
+        
+        assert result is False
+        assert runner.max_workers == 4
+        assert mock_deployer.deploy.call_count == 5
+        assert sorted(runner.deploy_report['Succeeded']) == ['dash-001', 'dash-002', 'dash-004', 'dash-005']
+        assert runner.deploy_report['Succeeded']['dash-004']['Status'] == 'unchanged'
+        assert runner.deploy_report['Failed'] == {'dash-003': 'Failed to deploy dashboard dash-003'}
+        assert runner.deploy_report['Skipped'] == []
+        runner.snapshot_store.update_deployed_pointer.assert_not_called()
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_deploy_dashboards_fail_fast(self, mock_deployer_class, mock_validator_class,
+                                         mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_VALIDATE_FIRST': 'false'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = False
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer_class.return_value = mock_deployer
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.get_latest_snapshot.return_value = '20240101120000'
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+            f'dash-00{i}': {'DashboardId': f'dash-00{i}'} for i in range(1, 4)
+        })
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard'})
+        
+        result = runner.deploy_dashboards()
+        
+        assert result is False
+        assert runner.fail_fast is True
+        assert list(runner.deploy_report['Failed']) == ['dash-001']
+        assert runner.deploy_report['Skipped'] == ['dash-002', 'dash-003']
+        mock_deployer.deploy.assert_not_called()
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_deploy_dashboards_validates_all_first(self, mock_deployer_class, mock_validator_class,
+                                                   mock_config, mock_aws_manager):
+        settings = {'DEPLOY_MAX_WORKERS': '4', 'DEPLOY_ENVIRONMENT': 'intg'}
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: settings.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.side_effect = lambda definition: definition['Name'] != 'Broken'
+        mock_validator.validate_data_sources.return_value = True
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer.deploy.return_value = 'updated'
+        mock_deployer_class.return_value = mock_deployer
+        
+        def create_runner():
+            runner = DashboardDeployRunner()
+            runner.snapshot_store = Mock()
+            runner.snapshot_store.get_latest_snapshot.return_value = '20240101120000'
+            runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+                f'dash-00{i}': {'DashboardId': f'dash-00{i}'} for i in range(1, 6)
+            })
+            runner.snapshot_store.load_deploy_state.return_value = None
+            runner._load_dashboard_from_s3 = Mock(side_effect=lambda dashboard_id, folder: {
+                'Name': 'Broken' if dashboard_id in ('dash-002', 'dash-004') else 'Test Dashboard',
+                'DataSetIds': ['dataset1']
+            })
+            return runner
+            
+        runner = create_runner()
+        result = runner.deploy_dashboards()
+        
+        assert result is False
+        mock_deployer.deploy.assert_not_called()
+        mock_deployer.load_dashboard_index.assert_not_called()
+        # Every definition is checked even though fail-fast is on
+        assert runner._load_dashboard_from_s3.call_count == 5
+        assert runner.deploy_report['Validation']['Passed'] == 3
+        assert runner.deploy_report['Validation']['Failed'] == {
+            'dash-002': 'Dashboard dash-002 failed validation',
+            'dash-004': 'Dashboard dash-004 failed validation'
+        }
+        assert list(runner.deploy_report['Failed']) == ['dash-002', 'dash-004']
+        assert runner.deploy_report['Skipped'] == ['dash-001', 'dash-003', 'dash-005']
+        runner.snapshot_store.update_deployed_pointer.assert_not_called()
+        
+        settings['DEPLOY_REQUIRE_ALL_VALID'] = 'false'
+        runner = create_runner()
+        result = runner.deploy_dashboards()
+        
+        assert result is False
+        assert sorted(call.args[1] for call in mock_deployer.deploy.call_args_list) == [
+            'dash-001', 'dash-003', 'dash-005'
+        ]
+        # Only the verdicts are kept, the valid definitions are loaded again but not validated again
+        assert runner._load_dashboard_from_s3.call_count == 8
+        assert mock_validator.validate_required_fields.call_count == 10
+        assert runner.validated_ids == set()
+        assert sorted(runner.deploy_report['Succeeded']) == ['dash-001', 'dash-003', 'dash-005']
+        assert list(runner.deploy_report['Failed']) == ['dash-002', 'dash-004']
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_validate_dashboards(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.return_value = 'value'
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = True
+        mock_validator.validate_data_sources.side_effect = [True, False]
+        mock_validator_class.return_value = mock_validator
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+            f'dash-00{i}': {'DashboardId': f'dash-00{i}'} for i in range(1, 3)
+        })
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard', 'DataSetIds': ['dataset1']})
+        
+        assert runner.validate_dashboards('20240101120000') is False
+        assert runner.validation_summary['Passed'] == 1
+        assert len(runner.validation_summary['Failed']) == 1
+        assert runner.validated_ids == set()
+        mock_deployer_class.return_value.deploy.assert_not_called()
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_deploy_dashboards_tracks_creation_status(self, mock_deployer_class, mock_validator_class,
+                                                      mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_MAX_WORKERS': '2',
+            'DEPLOY_STATUS_POLL_INTERVAL_SECONDS': '0.01'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = True
+        mock_validator.validate_data_sources.return_value = True
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer.submitted_versions = {}
+        
+        def deploy(definition, dashboard_id, definition_hash):
+            mock_deployer.submitted_versions[dashboard_id] = 2
+            mock_deployer.status_tracker.track(dashboard_id, 2)
+            return 'updated'
+            
+        mock_deployer.deploy.side_effect = deploy
+        mock_deployer.publish_version.side_effect = lambda dashboard_id, version: dashboard_id != 'dash-003'
+        mock_deployer.quicksight.describe_dashboard.side_effect = lambda **kwargs: {
+            'Dashboard': {'Version': {
+                'Status': 'UPDATE_FAILED' if kwargs['DashboardId'] == 'dash-002' else 'UPDATE_SUCCESSFUL'
+            }}
+        }
         mock_deployer_class.return_value = mock_deployer
         
         runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.get_latest_snapshot.return_value = '20240101120000'
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+            f'dash-00{i}': {'DashboardId': f'dash-00{i}'} for i in range(1, 4)
+        })
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard', 'DataSetIds': ['dataset1']})
+        
         result = runner.deploy_dashboards()
         
+        assert result is False
+        assert sorted(runner.deploy_report['Succeeded']) == ['dash-001']
+        assert 'SecondsToReady' in runner.deploy_report['Succeeded']['dash-001']
+        assert runner.deploy_report['Succeeded']['dash-001']['Version'] == 2
+        assert runner.deploy_report['Failed'] == {
+            'dash-002': 'Dashboard dash-002 did not become ready: UPDATE_FAILED',
+            'dash-003': 'Failed to publish version 2 of dashboard dash-003'
+        }
+        # Only versions QuickSight finished building are published
+        assert sorted(call.args for call in mock_deployer.publish_version.call_args_list) == [
+            ('dash-001', 2), ('dash-003', 2)
+        ]
+        assert sorted(call.args[0] for call in mock_deployer.clear_definition_hash.call_args_list) == [
+            'dash-002', 'dash-003'
+        ]
+        mock_deployer.quicksight.describe_dashboard.assert_any_call(
+            AwsAccountId='123456789012', DashboardId='dash-002', VersionNumber=2
+        )
+        assert mock_deployer.status_tracker is None
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    @patch('src.dashboard_deploy.main.AssetBundleJobRunner')
+    def test_deploy_dashboards_with_asset_bundle_engine(self, mock_runner_class, mock_deployer_class,
+                                                        mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENGINE': 'asset_bundle',
+            'DEPLOY_MAX_WORKERS': '4',
+            'DEPLOY_FAIL_FAST': 'false'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = True
+        mock_validator.validate_data_sources.return_value = True
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer.plan.side_effect = lambda definition, dashboard_id, definition_hash: (
+            'unchanged' if dashboard_id == 'dash-001' else 'created' if dashboard_id == 'dash-002' else 'updated',
+            definition_hash
+        )
+        mock_deployer_class.return_value = mock_deployer
+        
+        mock_runner = Mock()
+        mock_runner.import_dashboards.return_value = (
+            {'dash-002': 1.5, 'dash-003': 1.5},
+            {'dash-004': RuntimeError('Asset bundle job import-1 ended with FAILED_ROLLBACK_COMPLETED')}
+        )
+        mock_runner_class.from_config.return_value = mock_runner
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.get_latest_snapshot.return_value = '20240101120000'
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+            f'dash-00{i}': {'DashboardId': f'dash-00{i}', 'Sha256': f'hash-{i}'} for i in range(1, 5)
+        })
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard'})
+        
+        result = runner.deploy_dashboards()
+        
+        assert result is False
+        mock_deployer.deploy.assert_not_called()
+        mock_runner_class.from_config.assert_called_once_with(
+            mock_deployer.quicksight, '123456789012', mock_config_instance, runner.logger
+        )
+        mock_runner.import_dashboards.assert_called_once_with(
+            {f'dash-00{i}': {'Name': 'Test Dashboard'} for i in range(2, 5)},
+            {f'dash-00{i}': [{'Key': 'DefinitionSha256', 'Value': f'hash-{i}'}] for i in range(2, 5)},
+            False
+        )
+        assert {
+            dashboard_id: result['Status'] for dashboard_id, result in runner.deploy_report['Succeeded'].items()
+        } == {'dash-001': 'unchanged', 'dash-002': 'created', 'dash-003': 'updated'}
+        assert list(runner.deploy_report['Failed']) == ['dash-004']
+        runner.snapshot_store.update_deployed_pointer.assert_not_called()
+
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_deploy_dashboards_shard(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENVIRONMENT': 'intg'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = True
+        mock_validator.validate_data_sources.return_value = True
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer.deploy.return_value = 'updated'
+        mock_deployer.get_published_version.return_value = 3
+        mock_deployer.submitted_versions = {}
+        mock_deployer_class.return_value = mock_deployer
+        
+        dashboard_ids = [f'dash-{i:03d}' for i in range(20)]
+        shard = Shard(1, 2)
+        runner = DashboardDeployRunner(shard)
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+            dashboard_id: {'DashboardId': dashboard_id} for dashboard_id in dashboard_ids
+        })
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard'})
+        
+        result = runner.deploy_dashboards('20240101120000')
+        
         assert result is True
-        mock_deployer.deploy_dashboard.assert_called_once()
+        runner.snapshot_store.get_latest_snapshot.assert_not_called()
+        expected_ids = [dashboard_id for dashboard_id in dashboard_ids if shard.contains(dashboard_id)]
+        assert sorted(call.args[1] for call in mock_deployer.deploy.call_args_list) == expected_ids
+        report_call, journal_call = runner.snapshot_store.write_file.call_args_list
+        folder, filename, body = report_call.args
+        assert (folder, filename) == ('20240101120000', 'shards/deploy_report_intg-1-of-2.json')
+        assert sorted(json.loads(body)['Succeeded']) == expected_ids
+        folder, filename, body = journal_call.args
+        assert (folder, filename) == ('20240101120000', 'shards/deploy_journal_intg-1-of-2.json')
+        assert sorted(json.loads(body)['Dashboards']) == expected_ids
+        runner.snapshot_store.update_deployed_pointer.assert_not_called()
+        runner.snapshot_store.save_run_journal.assert_not_called()
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_merge_shard_reports(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENVIRONMENT': 'intg'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        reports = {
+            'shards/deploy_report_intg-1-of-2.json': {
+                'Succeeded': {'dash-002': {'Status': 'updated', 'Seconds': 1.0}},
+                'Failed': {}, 'Skipped': [], 'ElapsedSeconds': 12.0
+            },
+            'shards/deploy_report_intg-2-of-2.json': {
+                'Succeeded': {'dash-001': {'Status': 'created', 'Seconds': 2.0}},
+                'Failed': {}, 'Skipped': [], 'ElapsedSeconds': 30.0,
+                'Validation': {'Passed': 1, 'Failed': {}, 'ElapsedSeconds': 3.0}
+            },
+            'shards/deploy_journal_intg-1-of-2.json': {
+                'Snapshot': '20240101120000', 'Environment': 'intg', 'DeployedAt': '20240101130000',
+                'Dashboards': {'dash-002': {'Status': 'updated', 'PreviousVersion': 4}}
+            },
+            'shards/deploy_journal_intg-2-of-2.json': {
+                'Snapshot': '20240101120000', 'Environment': 'intg', 'DeployedAt': '20240101130500',
+                'Dashboards': {'dash-001': {'Status': 'created', 'PreviousVersion': None}}
+            }
+        }
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.get_latest_snapshot.return_value = '20240101120000'
+        runner.snapshot_store.read_file.side_effect = lambda folder, filename: (
+            json.dumps(reports[filename]).encode('utf-8') if filename in reports else None
+        )
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240101120000', {
+            f'dash-00{i}': {'DashboardId': f'dash-00{i}', 'Sha256': f'hash-{i}'} for i in range(1, 4)
+        })
+        runner.snapshot_store.load_deploy_state.return_value = None
+        
+        with pytest.raises(RuntimeError, match='shards not finished: 1/3, 2/3, 3/3'):
+            runner.merge_shard_reports(3)
+            
+        assert runner.merge_shard_reports(2) is True
+        assert list(runner.deploy_report['Succeeded']) == ['dash-001', 'dash-002']
+        assert runner.deploy_report['ElapsedSeconds'] == 30.0
+        assert runner.deploy_report['Validation'] == {'Passed': 1, 'Failed': {}, 'ElapsedSeconds': 3.0}
+        runner.snapshot_store.write_file.assert_called_once_with(
+            '20240101120000', 'deploy_report_intg.json', json.dumps(runner.deploy_report, indent=2)
+        )
+        runner.snapshot_store.update_deployed_pointer.assert_called_once_with('intg', '20240101120000')
+        runner.snapshot_store.save_deploy_state.assert_called_once_with('intg', {
+            'Snapshot': '20240101120000',
+            'Dashboards': {'dash-001': 'hash-1', 'dash-002': 'hash-2'}
+        })
+        runner.snapshot_store.save_run_journal.assert_called_once_with('intg', {
+            'Snapshot': '20240101120000',
+            'Environment': 'intg',
+            'DeployedAt': '20240101130500',
+            'Dashboards': {
+                'dash-001': {'Status': 'created', 'PreviousVersion': None},
+                'dash-002': {'Status': 'updated', 'PreviousVersion': 4}
+            }
+        })
+        
+        reports['shards/deploy_report_intg-2-of-2.json']['Failed'] = {'dash-003': 'Failed to deploy dashboard dash-003'}
+        runner.snapshot_store.update_deployed_pointer.reset_mock()
+        
+        assert runner.merge_shard_reports(2) is False
+        runner.snapshot_store.update_deployed_pointer.assert_not_called()
+
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_deploy_dashboards_delta(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENVIRONMENT': 'intg',
+            'DEPLOY_DELTA': 'true',
+            'DEPLOY_DELETE_REMOVED': 'true',
+            'DEPLOY_FAIL_FAST': 'false'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = True
+        mock_validator.validate_data_sources.return_value = True
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer.deploy.side_effect = lambda definition, dashboard_id, definition_hash: (
+            'failed' if dashboard_id == 'dash-004' else 'created' if dashboard_id == 'dash-003' else 'updated'
+        )
+        mock_deployer.delete_dashboard.return_value = True
+        mock_deployer_class.return_value = mock_deployer
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.get_latest_snapshot.return_value = '20240102120000'
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240102120000', {
+            'dash-001': {'DashboardId': 'dash-001', 'Sha256': 'hash-1'},
+            'dash-002': {'DashboardId': 'dash-002', 'Sha256': 'hash-2-new'},
+            'dash-003': {'DashboardId': 'dash-003', 'Sha256': 'hash-3'}
+        })
+        runner.snapshot_store.load_deploy_state.return_value = {
+            'Snapshot': '20240101120000',
+            'Dashboards': {'dash-001': 'hash-1', 'dash-002': 'hash-2', 'dash-009': 'hash-9'}
+        }
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard'})
+        
+        result = runner.deploy_dashboards()
+        
+        assert result is True
+        assert sorted(call.args[1] for call in mock_deployer.deploy.call_args_list) == ['dash-002', 'dash-003']
+        mock_deployer.delete_dashboard.assert_called_once_with('dash-009')
+        assert runner.deploy_report['Succeeded']['dash-009']['Status'] == 'deleted'
+        assert runner.deploy_report['Delta'] == {
+            'Base': '20240101120000', 'Added': 1, 'Changed': 1, 'Unchanged': 1, 'Removed': 1
+        }
+        runner.snapshot_store.save_deploy_state.assert_called_once_with('intg', {
+            'Snapshot': '20240102120000',
+            'Dashboards': {'dash-001': 'hash-1', 'dash-002': 'hash-2-new', 'dash-003': 'hash-3'}
+        })
+        runner.snapshot_store.update_deployed_pointer.assert_called_once_with('intg', '20240102120000')
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_delete_removed_guards(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENVIRONMENT': 'intg',
+            'DEPLOY_DELETE_REMOVED': 'true',
+            'DEPLOY_DELETE_MAX': '1'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.load_deploy_state.return_value = {
+            'Snapshot': '20240101120000',
+            'Dashboards': {'dash-001': 'hash-1', 'dash-008': 'hash-8', 'dash-009': 'hash-9'}
+        }
+        
+        # A filtered snapshot never deletes, however many dashboards it leaves out
+        runner.manifest = SnapshotManifest('20240102120000', {
+            'dash-001': {'DashboardId': 'dash-001', 'Sha256': 'hash-1'}
+        }, dashboard_filter='1 dashboard IDs')
+        assert runner._select_delta(['dash-001']) == (['dash-001'], [])
+        
+        runner.manifest.dashboard_filter = None
+        with pytest.raises(ValueError, match='would delete 2 dashboards from intg, more than DEPLOY_DELETE_MAX=1'):
+            runner._select_delta(['dash-001'])
+            
+        runner.delete_max = 2
+        assert runner._select_delta(['dash-001']) == (['dash-001'], ['dash-008', 'dash-009'])
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_deploy_dashboards_delta_records_partial_failure(self, mock_deployer_class, mock_validator_class,
+                                                             mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENVIRONMENT': 'intg',
+            'DEPLOY_DELTA': 'true',
+            'DEPLOY_FAIL_FAST': 'false'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_validator = Mock()
+        mock_validator.validate_json_structure.return_value = True
+        mock_validator.validate_required_fields.return_value = True
+        mock_validator.validate_data_sources.return_value = True
+        mock_validator_class.return_value = mock_validator
+        
+        mock_deployer = Mock()
+        mock_deployer.deploy.side_effect = lambda definition, dashboard_id, definition_hash: (
+            'failed' if dashboard_id == 'dash-002' else 'updated'
+        )
+        mock_deployer_class.return_value = mock_deployer
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.get_latest_snapshot.return_value = '20240102120000'
+        runner.snapshot_store.load_manifest.return_value = SnapshotManifest('20240102120000', {
+            f'dash-00{i}': {'DashboardId': f'dash-00{i}', 'Sha256': f'hash-{i}-new'} for i in range(1, 4)
+        })
+        runner.snapshot_store.load_deploy_state.return_value = {
+            'Snapshot': '20240101120000',
+            'Dashboards': {f'dash-00{i}': f'hash-{i}' for i in range(1, 4)}
+        }
+        runner._load_dashboard_from_s3 = Mock(return_value={'Name': 'Test Dashboard'})
+        
+        result = runner.deploy_dashboards()
+        
+        assert result is False
+        mock_deployer.delete_dashboard.assert_not_called()
+        # The rerun only has to retry dash-002
+        runner.snapshot_store.save_deploy_state.assert_called_once_with('intg', {
+            'Snapshot': '20240101120000',
+            'Dashboards': {'dash-001': 'hash-1-new', 'dash-003': 'hash-3-new'}
+        })
+        runner.snapshot_store.update_deployed_pointer.assert_not_called()
+        
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_init_delta_requires_environment(self, mock_deployer_class, mock_validator_class,
+                                             mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.return_value = 'value'
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_DELTA': 'true'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        with pytest.raises(ValueError, match='need DEPLOY_ENVIRONMENT'):
+            DashboardDeployRunner()
+            
+    @patch('src.dashboard_deploy.main.AWSClientManager')
+    @patch('src.dashboard_deploy.main.Config')
+    @patch('src.dashboard_deploy.main.Validator')
+    @patch('src.dashboard_deploy.main.DashboardDeployer')
+    def test_rollback(self, mock_deployer_class, mock_validator_class, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'TARGET_AWS_ACCOUNT_ID': '123456789012',
+            'TARGET_QUICKSIGHT_NAMESPACE': 'default',
+            'AWS_REGION': 'ap-northeast-1',
+            'DEPLOY_SOURCE_S3_BUCKET': 'test-bucket',
+            'DEPLOY_SOURCE_S3_PREFIX': 'test-prefix/',
+            'CROSS_ACCOUNT_ROLE_NAME': 'TestRole'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: {
+            'DEPLOY_ENVIRONMENT': 'intg'
+        }.get(key, default)
+        mock_config.return_value = mock_config_instance
+        
+        mock_deployer = Mock()
+        mock_deployer.publish_version.side_effect = lambda dashboard_id, version: dashboard_id != 'dash-003'
+        mock_deployer_class.return_value = mock_deployer
+        
+        runner = DashboardDeployRunner()
+        runner.snapshot_store = Mock()
+        runner.snapshot_store.load_run_journal.return_value = {
+            'Snapshot': '20240102120000',
+            'Environment': 'intg',
+            'DeployedAt': '20240102130000',
+            'Dashboards': {
+                'dash-001': {'Status': 'updated', 'PreviousVersion': 4},
+                'dash-002': {'Status': 'created', 'PreviousVersion': None},
+                'dash-003': {'Status': 'failed', 'PreviousVersion': 7}
+            }
+        }
+        runner.snapshot_store.load_deploy_state.return_value = {
+            'Snapshot': '20240102120000',
+            'Dashboards': {f'dash-00{i}': f'hash-{i}' for i in range(1, 4)}
+        }
+        
+        result = runner.rollback()
+        
+        assert result is False
+        assert sorted(call.args for call in mock_deployer.publish_version.call_args_list) == [
+            ('dash-001', 4), ('dash-003', 7)
+        ]
+        mock_deployer.deploy.assert_not_called()
+        mock_deployer.clear_definition_hash.assert_called_once_with('dash-001')
+        runner.snapshot_store.load_run_journal.assert_called_once_with('intg')
+        journal = runner.snapshot_store.save_run_journal.call_args.args[1]
+        assert journal['Rollback']['Succeeded']['dash-001']['Status'] == 'rolled_back'
+        assert journal['Rollback']['Failed'] == {'dash-003': 'Failed to roll back dashboard dash-003 to version 7'}
+        assert journal['Rollback']['Created'] == ['dash-002']
+        # The next delta deploy has to write dash-001 again
+        runner.snapshot_store.save_deploy_state.assert_called_once_with('intg', {
+            'Snapshot': '20240102120000',
+            'Dashboards': {'dash-002': 'hash-2', 'dash-003': 'hash-3'}
+        })
+        
+        runner.snapshot_store.load_run_journal.return_value = None
+        assert runner.rollback() is False
 
 
 @patch('src.dashboard_deploy.main.DashboardDeployRunner')
@@ -145,12 +1105,51 @@ def test_main_success(mock_setup_logger, mock_runner_class):
     mock_runner.deploy_dashboards.return_value = True
     mock_runner_class.return_value = mock_runner
     
-    main()
+    main([])
     
-    mock_runner.deploy_dashboards.assert_called_once()
+    mock_runner_class.assert_called_once_with(None)
+    mock_runner.deploy_dashboards.assert_called_once_with(None)
     mock_logger.info.assert_any_call('Dashboard deploy completed successfully')
     
 
+@patch('src.dashboard_deploy.main.DashboardDeployRunner')
+@patch('src.dashboard_deploy.main.setup_logger')
+def test_main_shard_and_merge(mock_setup_logger, mock_runner_class):
+    mock_runner = Mock()
+    mock_runner.deploy_dashboards.return_value = True
+    mock_runner.merge_shard_reports.return_value = False
+    mock_runner_class.return_value = mock_runner
+    
+    main(['--shard', '1/2', '--snapshot', '20240101120000'])
+    
+    shard = mock_runner_class.call_args.args[0]
+    assert (shard.index, shard.count) == (1, 2)
+    mock_runner.deploy_dashboards.assert_called_once_with('20240101120000')
+    
+    with pytest.raises(SystemExit) as exc_info:
+        main(['--merge-shards', '2', '--snapshot', '20240101120000'])
+        
+    assert exc_info.value.code == 1
+    
+    for argv in (['--merge-shards', '2'], ['--shard', '1/2']):
+        with pytest.raises(SystemExit) as exc_info:
+            main(argv)
+            
+        assert exc_info.value.code == 2
+    
+    mock_runner.rollback.return_value = True
+    main(['--rollback'])
+    
+    mock_runner.rollback.assert_called_once_with()
+    
+    mock_runner.validate_dashboards.return_value = True
+    main(['--validate-only', '--snapshot', '20240101120000'])
+    
+    mock_runner.validate_dashboards.assert_called_once_with('20240101120000')
+    mock_runner.merge_shard_reports.assert_called_once_with(2, '20240101120000')
+    assert mock_runner_class.call_count == 4
+    
+
 @patch('src.dashboard_deploy.main.DashboardDeployRunner')
 @patch('src.dashboard_deploy.main.setup_logger')
 def test_main_error(mock_setup_logger, mock_runner_class):
@@ -162,7 +1161,7 @@ def test_main_error(mock_setup_logger, mock_runner_class):
     mock_runner_class.return_value = mock_runner
     
     with pytest.raises(SystemExit) as exc_info:
-        main()
+        main([])
     
     assert exc_info.value.code == 1
     mock_logger.error.assert_called()
\ No newline at end of file
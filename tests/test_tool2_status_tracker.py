@@ -0,0 +1,94 @@
+import threading
+from unittest.mock import Mock
+from src.dashboard_deploy.status_tracker import CreationStatusTracker, version_number
+
+
+def _status(status, errors=None):
+    return {'Dashboard': {'Version': {'Status': status, 'Errors': errors or []}}}
+
+
+class TestCreationStatusTracker:
+    def test_poll_ready_and_failed(self, clock):
+        statuses = {
+            'dash-001': [_status('CREATION_IN_PROGRESS'), _status('CREATION_SUCCESSFUL')],
+            'dash-002': [_status('UPDATE_FAILED', [{'Type': 'PARAMETER_NOT_FOUND', 'Message': 'Bad parameter'}])]
+        }
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.side_effect = lambda **kwargs: statuses[kwargs['DashboardId']].pop(0)
+        tracker = CreationStatusTracker(mock_qs_client, '123456789012', clock=clock)
+        
+        tracker.track('dash-001', 1)
+        tracker.track('dash-002', 3)
+        clock.now = 4.0
+        assert tracker.poll() is True
+        clock.now = 6.5
+        assert tracker.poll() is True
+        assert tracker.poll() is False
+        
+        ready, failed = tracker.wait()
+        assert ready == {'dash-001': 6.5}
+        assert failed == {'dash-002': 'UPDATE_FAILED: PARAMETER_NOT_FOUND: Bad parameter'}
+        mock_qs_client.describe_dashboard.assert_any_call(
+            AwsAccountId='123456789012', DashboardId='dash-002', VersionNumber=3
+        )
+        assert mock_qs_client.describe_dashboard.call_count == 3
+        
+    def test_poll_timeout(self, clock):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.return_value = _status('CREATION_IN_PROGRESS')
+        tracker = CreationStatusTracker(mock_qs_client, '123456789012', timeout=60, clock=clock)
+        
+        tracker.track('dash-001')
+        assert tracker.poll() is False
+        clock.now = 61.0
+        assert tracker.poll() is True
+        
+        ready, failed = tracker.wait()
+        assert ready == {}
+        assert failed == {'dash-001': 'Not ready after 60s, last status CREATION_IN_PROGRESS'}
+        mock_qs_client.describe_dashboard.assert_called_with(AwsAccountId='123456789012', DashboardId='dash-001')
+        
+    def test_describe_error_keeps_dashboard_in_flight(self, clock):
+        mock_qs_client = Mock()
+        mock_qs_client.describe_dashboard.side_effect = [Exception('ThrottlingException'), _status('UPDATE_SUCCESSFUL')]
+        tracker = CreationStatusTracker(mock_qs_client, '123456789012', clock=clock)
+        
+        tracker.track('dash-001', 2)
+        assert tracker.poll() is False
+        assert tracker.poll() is True
+        assert tracker.wait() == ({'dash-001': 0.0}, {})
+        
+    def test_background_polling(self):
+        submitted = threading.Event()
+        mock_qs_client = Mock()
+        
+        def describe_dashboard(**kwargs):
+            return _status('CREATION_SUCCESSFUL' if submitted.is_set() else 'CREATION_IN_PROGRESS')
+            
+        mock_qs_client.describe_dashboard.side_effect = describe_dashboard
+        tracker = CreationStatusTracker(
+            mock_qs_client, '123456789012', poll_interval=0.01, max_poll_interval=0.05, max_workers=2
+        )
+        
+        tracker.start()
+        tracker.track('dash-001', 1)
+        tracker.track('dash-002', 1)
+        submitted.set()
+        ready, failed = tracker.wait()
+        
+        assert sorted(ready) == ['dash-001', 'dash-002']
+        assert failed == {}
+        
+    def test_wait_without_tracked_dashboards(self):
+        mock_qs_client = Mock()
+        tracker = CreationStatusTracker(mock_qs_client, '123456789012', poll_interval=0.01)
+        
+        tracker.start()
+        assert tracker.wait() == ({}, {})
+        mock_qs_client.describe_dashboard.assert_not_called()
+
+
+def test_version_number():
+    assert version_number('arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001/version/7') == 7
+    assert version_number('arn:aws:quicksight:ap-northeast-1:123456789012:dashboard/dash-001') is None
+    assert version_number(None) is None
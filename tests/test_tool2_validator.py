@@ -48,6 +48,7 @@ class TestValidator:
     @patch('src.dashboard_deploy.validator.AWSClientManager')
     def test_validate_data_sources_all_exist(self, mock_aws_manager):
         mock_qs_client = Mock()
+        mock_qs_client.list_data_sets.return_value = {'DataSetSummaries': []}
         mock_qs_client.describe_data_set.return_value = {
             'DataSet': {'DataSetId': 'dataset1'}
         }
@@ -63,6 +64,7 @@ class TestValidator:
     @patch('src.dashboard_deploy.validator.AWSClientManager')
     def test_validate_data_sources_not_exist(self, mock_aws_manager):
         mock_qs_client = Mock()
+        mock_qs_client.list_data_sets.return_value = {'DataSetSummaries': []}
         mock_qs_client.describe_data_set.side_effect = Exception('DataSet not found')
         mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
         
@@ -71,4 +73,20 @@ class TestValidator:
             'DataSetIds': ['dataset1']
         }
         
-        assert validator.validate_data_sources(definition) is False
\ No newline at end of file
+        assert validator.validate_data_sources(definition) is False
+        
+    @patch('src.dashboard_deploy.validator.AWSClientManager')
+    def test_validate_data_sources_uses_dataset_index(self, mock_aws_manager):
+        mock_qs_client = Mock()
+        mock_qs_client.list_data_sets.return_value = {
+            'DataSetSummaries': [{'DataSetId': 'dataset1'}, {'DataSetId': 'dataset2'}]
+        }
+        mock_aws_manager.return_value.get_quicksight_client.return_value = mock_qs_client
+        
+        validator = Validator('123456789012', 'ap-northeast-1')
+        
+        for _ in range(3):
+            assert validator.validate_data_sources({'DataSetIds': ['dataset1', 'dataset2']}) is True
+            
+        mock_qs_client.list_data_sets.assert_called_once()
+        mock_qs_client.describe_data_set.assert_not_called()
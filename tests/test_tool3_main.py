@@ -1,5 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch, mock_open
+from botocore.exceptions import ClientError
+from src.common.manifest import SnapshotManifest
 from src.register_metadata.main import MetadataRegistrar, main
 
 
@@ -14,6 +16,7 @@ class TestMetadataRegistrar:
             'METADATA_SOURCE_S3_PREFIX': 'test-prefix/',
             'DYNAMODB_TABLE_NAME': 'test-table'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_config_instance
         
         registrar = MetadataRegistrar()
@@ -33,16 +36,27 @@ class TestMetadataRegistrar:
             'METADATA_SOURCE_S3_PREFIX': 'test-prefix/',
             'DYNAMODB_TABLE_NAME': 'test-table'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_config_instance
         
         mock_s3_client = Mock()
-        mock_s3_client.list_objects_v2.return_value = {
-            'Contents': [
-                {'Key': 'test-prefix/20240101120000/packages.csv'},
-                {'Key': 'test-prefix/20240102120000/packages.csv'},
-                {'Key': 'test-prefix/20240103120000/packages.csv'}
-            ]
-        }
+        mock_s3_client.get_object.side_effect = ClientError(
+            {'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject'
+        )
+        mock_s3_client.list_objects_v2.side_effect = [
+            {
+                'CommonPrefixes': [
+                    {'Prefix': 'test-prefix/20240101120000/'},
+                    {'Prefix': 'test-prefix/20240103120000/'}
+                ],
+                'NextContinuationToken': 'token1'
+            },
+            {
+                'CommonPrefixes': [
+                    {'Prefix': 'test-prefix/20240102120000/'}
+                ]
+            }
+        ]
         mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
         
         registrar = MetadataRegistrar()
@@ -60,6 +74,7 @@ class TestMetadataRegistrar:
             'METADATA_SOURCE_S3_PREFIX': 'test-prefix/',
             'DYNAMODB_TABLE_NAME': 'test-table'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_config_instance
         
         mock_s3_client = Mock()
@@ -76,6 +91,35 @@ class TestMetadataRegistrar:
             
         mock_file.assert_called_once_with('/tmp/packages.csv', 'w', encoding='utf-8')
         
+    @patch('src.register_metadata.main.AWSClientManager')
+    @patch('src.register_metadata.main.Config')
+    def test_download_csv_from_s3_checksum_mismatch(self, mock_config, mock_aws_manager):
+        mock_config_instance = Mock()
+        mock_config_instance.get_required.side_effect = lambda key: {
+            'AWS_REGION': 'ap-northeast-1',
+            'METADATA_SOURCE_S3_BUCKET': 'test-bucket',
+            'METADATA_SOURCE_S3_PREFIX': 'test-prefix/',
+            'DYNAMODB_TABLE_NAME': 'test-table'
+        }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
+        mock_config.return_value = mock_config_instance
+        
+        mock_s3_client = Mock()
+        mock_s3_client.get_object.return_value = {
+            'Body': Mock(read=Mock(return_value=b'package_id,bizuser_code\nPKG001,BU999'))
+        }
+        mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
+        
+        registrar = MetadataRegistrar()
+        registrar.manifest = SnapshotManifest('20240101120000')
+        registrar.manifest.add_file('packages.csv', b'package_id,bizuser_code\nPKG001,BU001')
+        
+        with patch('builtins.open', mock_open()) as mock_file:
+            with pytest.raises(ValueError, match='does not match the manifest checksum'):
+                registrar._download_csv_from_s3('packages.csv', '20240101120000', '/tmp/packages.csv')
+                
+        mock_file.assert_not_called()
+        
     @patch('src.register_metadata.main.AWSClientManager')
     @patch('src.register_metadata.main.Config')
     @patch('src.register_metadata.main.CSVProcessor')
@@ -90,6 +134,7 @@ class TestMetadataRegistrar:
             'METADATA_SOURCE_S3_PREFIX': 'test-prefix/',
             'DYNAMODB_TABLE_NAME': 'test-table'
         }[key]
+        mock_config_instance.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_config_instance
         
         mock_s3_client = Mock()
@@ -98,9 +143,12 @@ class TestMetadataRegistrar:
                 {'Key': 'test-prefix/20240101120000/packages.csv'}
             ]
         }
-        mock_s3_client.get_object.return_value = {
-            'Body': Mock(read=Mock(return_value=b'test content'))
-        }
+        def get_object(Bucket, Key):
+            if Key.endswith('manifest.json'):
+                raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+            return {'Body': Mock(read=Mock(return_value=b'test content'))}
+            
+        mock_s3_client.get_object.side_effect = get_object
         mock_aws_manager.return_value.get_s3_client.return_value = mock_s3_client
         
         mock_mkdtemp.return_value = '/tmp/test'